@@ -2,9 +2,12 @@ from __future__ import annotations
 
 import datetime
 import re
-from functools import cache, total_ordering
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import cache, lru_cache, total_ordering
 from typing import TYPE_CHECKING, Any
 
+import numpy as np
 from jellyfish import levenshtein_distance
 from unidecode import unidecode
 
@@ -13,7 +16,7 @@ from beets.util import as_string, cached_classproperty
 from beets.util.color import colorize
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator, KeysView
+    from collections.abc import Iterable, Iterator, KeysView, Sequence
 
     from beets.library import Item
     from beets.util import Likelies
@@ -45,6 +48,59 @@ SD_PATTERNS = [
 SD_REPLACE = [(r"&", "and")]
 
 
+# Number of strings the normalization steps of `string_dist` remember.
+NORMALIZE_CACHE_SIZE = 8192
+
+
+class StringDistCache:
+    """Distances between pairs of strings computed by :func:`string_dist`
+    while the cache is active, with counters of the lookups that found a
+    distance (``hits``) and those that computed it (``misses``).
+    """
+
+    def __init__(self) -> None:
+        self.dists: dict[tuple[str, str], float] = {}
+        self.hits = 0
+        self.misses = 0
+
+
+_active_string_dist_cache: ContextVar[StringDistCache | None] = ContextVar(
+    "string_dist_cache", default=None
+)
+
+
+@contextmanager
+def string_dist_cache() -> Iterator[StringDistCache]:
+    """Remember the distances :func:`string_dist` computes in this
+    context, such as the matching of one import task against all its
+    candidates. Nested contexts share the outer cache.
+    """
+    if (cache := _active_string_dist_cache.get()) is not None:
+        yield cache
+        return
+
+    cache = StringDistCache()
+    token = _active_string_dist_cache.set(cache)
+    try:
+        yield cache
+    finally:
+        _active_string_dist_cache.reset(token)
+
+
+def normalize_cache_stats() -> tuple[int, int]:
+    """Return the hits and misses of the caches of normalized strings."""
+    infos = [
+        f.cache_info() for f in (_normalize_string, _strip_pattern, _ascii_key)
+    ]
+    return sum(i.hits for i in infos), sum(i.misses for i in infos)
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _ascii_key(string: str) -> str:
+    """Transliterate the string to lowercase ASCII letters and digits."""
+    return re.sub(r"[^a-z0-9]", "", as_string(unidecode(string)).lower())
+
+
 def _string_dist_basic(str1: str, str2: str) -> float:
     """Basic edit distance between two strings, ignoring
     non-alphanumeric characters and case. Comparisons are based on a
@@ -53,10 +109,8 @@ def _string_dist_basic(str1: str, str2: str) -> float:
     """
     assert isinstance(str1, str)
     assert isinstance(str2, str)
-    str1 = as_string(unidecode(str1))
-    str2 = as_string(unidecode(str2))
-    str1 = re.sub(r"[^a-z0-9]", "", str1.lower())
-    str2 = re.sub(r"[^a-z0-9]", "", str2.lower())
+    str1 = _ascii_key(str1)
+    str2 = _ascii_key(str2)
     if not str1 and not str2:
         return 0.0
     return levenshtein_distance(str1, str2) / float(max(len(str1), len(str2)))
@@ -72,23 +126,46 @@ def string_dist(str1: str | None, str2: str | None) -> float:
     if str1 is None or str2 is None:
         return 1.0
 
-    str1 = str1.lower()
-    str2 = str2.lower()
+    if (cache := _active_string_dist_cache.get()) is None:
+        return _normalized_string_dist(
+            _normalize_string(str1), _normalize_string(str2)
+        )
+
+    if (dist := cache.dists.get((str1, str2))) is not None:
+        cache.hits += 1
+        return dist
+
+    cache.misses += 1
+    dist = _normalized_string_dist(
+        _normalize_string(str1), _normalize_string(str2)
+    )
+    cache.dists[str1, str2] = dist
+    return dist
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _normalize_string(string: str) -> str:
+    """Prepare a string for :func:`string_dist`."""
+    string = string.lower()
 
     # Don't penalize strings that move certain words to the end. For
     # example, "the something" should be considered equal to
     # "something, the".
     for word in SD_END_WORDS:
-        if str1.endswith(f", {word}"):
-            str1 = f"{word} {str1[: -len(word) - 2]}"
-        if str2.endswith(f", {word}"):
-            str2 = f"{word} {str2[: -len(word) - 2]}"
+        if string.endswith(f", {word}"):
+            string = f"{word} {string[: -len(word) - 2]}"
 
     # Perform a couple of basic normalizing substitutions.
     for pat, repl in SD_REPLACE:
-        str1 = re.sub(pat, repl, str1)
-        str2 = re.sub(pat, repl, str2)
+        string = re.sub(pat, repl, string)
+
+    return string
+
 
+def _normalized_string_dist(str1: str, str2: str) -> float:
+    """Compute :func:`string_dist` for strings that went through
+    :func:`_normalize_string`.
+    """
     # Change the weight for certain string portions matched by a set
     # of regular expressions. We gradually change the strings and build
     # up penalties associated with parts of the string that were
@@ -97,8 +174,8 @@ def string_dist(str1: str | None, str2: str | None) -> float:
     penalty = 0.0
     for pat, weight in SD_PATTERNS:
         # Get strings that drop the pattern.
-        case_str1 = re.sub(pat, "", str1)
-        case_str2 = re.sub(pat, "", str2)
+        case_str1 = _strip_pattern(pat, str1)
+        case_str2 = _strip_pattern(pat, str2)
 
         if case_str1 != str1 or case_str2 != str2:
             # If the pattern was present (i.e., it is deleted in the
@@ -120,6 +197,12 @@ def string_dist(str1: str | None, str2: str | None) -> float:
     return base_dist + penalty
 
 
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _strip_pattern(pattern: str, string: str) -> str:
+    """Remove the matches of a pattern of `SD_PATTERNS` from the string."""
+    return re.sub(pattern, "", string)
+
+
 @total_ordering
 class Distance:
     """Keeps track of multiple distance penalties. Provides a single
@@ -427,6 +510,113 @@ def track_distance(
     return dist
 
 
+def track_distance_matrix(
+    items: Sequence[Item], tracks: Sequence[TrackInfo]
+) -> np.ndarray:
+    """Compute the distances between every item and every track at once.
+
+    The result has a row for each item and a column for each track, and
+    each cell holds ``float(track_distance(item, track))``. Each distinct
+    pair of titles is compared once, while the other penalties are
+    computed for the whole matrix.
+    """
+    weights = Distance._weights
+    shape = (len(items), len(tracks))
+
+    def column(values: Iterable[Any]) -> np.ndarray:
+        return np.array(list(values), dtype=float)[:, np.newaxis]
+
+    def row(values: Iterable[Any]) -> np.ndarray:
+        return np.array(list(values), dtype=float)[np.newaxis, :]
+
+    def numbers(values: Iterable[Any]) -> Iterator[float]:
+        return (np.nan if v is None else v for v in values)
+
+    raw = np.zeros(shape)
+    dist_max = np.zeros(shape)
+
+    def add(key: str, present: np.ndarray | bool, penalty: np.ndarray) -> None:
+        """Add the penalty, for the cells where the component is present,
+        to the weighted sums that make up the distances.
+        """
+        raw[...] += np.where(present, penalty * weights[key], 0.0)
+        dist_max[...] += np.where(present, weights[key], 0.0)
+
+    # Length.
+    track_length_max = get_track_length_max()
+    track_lengths = row(t.length or 0 for t in tracks)
+    if track_length_max:
+        diff = (
+            np.abs(column(i.length for i in items) - track_lengths)
+            - get_track_length_grace()
+        )
+        length_penalty = np.clip(diff, 0, track_length_max) / track_length_max
+    else:
+        length_penalty = np.zeros(shape)
+    add("track_length", track_lengths != 0, length_penalty)
+
+    # Title.
+    title_dists: dict[tuple[str | None, str | None], float] = {}
+    title_penalty = np.empty(shape)
+    for i, item in enumerate(items):
+        for j, track in enumerate(tracks):
+            pair = (item.title, track.title)
+            if (dist := title_dists.get(pair)) is None:
+                dist = title_dists[pair] = string_dist(*pair)
+            title_penalty[i, j] = dist
+    add("track_title", True, title_penalty)
+
+    # Track index.
+    item_tracks = column(i.track for i in items)
+    track_indices = row(numbers(t.index for t in tracks))
+    add(
+        "track_index",
+        (item_tracks != 0) & (track_indices > 0),
+        (item_tracks != row(numbers(t.medium_index for t in tracks)))
+        & (item_tracks != track_indices),
+    )
+
+    # Track ID.
+    item_ids = np.array([i.mb_trackid for i in items], dtype=object)
+    track_ids = np.array([t.track_id for t in tracks], dtype=object)
+    add(
+        "track_id",
+        column(bool(i.mb_trackid) for i in items),
+        item_ids[:, np.newaxis] != track_ids[np.newaxis, :],
+    )
+
+    # Penalize mismatching disc numbers.
+    item_discs = column(i.disc for i in items)
+    track_media = row(numbers(t.medium for t in tracks))
+    add(
+        "medium",
+        (item_discs != 0) & (track_media > 0),
+        item_discs != track_media,
+    )
+
+    # Data source.
+    source_dists: dict[tuple[str | None, str | None], Distance] = {}
+    for item_source in {i.get("data_source") for i in items}:
+        for track_source in {t.data_source for t in tracks}:
+            dist = Distance()
+            dist.add_data_source(item_source, track_source)
+            source_dists[item_source, track_source] = dist
+    if any(d._penalties for d in source_dists.values()):
+        source_penalty = np.empty(shape)
+        has_source_penalty = np.empty(shape, dtype=bool)
+        for i, item in enumerate(items):
+            item_source = item.get("data_source")
+            for j, track in enumerate(tracks):
+                penalties = source_dists[
+                    item_source, track.data_source
+                ]._penalties
+                has_source_penalty[i, j] = bool(penalties)
+                source_penalty[i, j] = sum(penalties.get("data_source", []))
+        add("data_source", has_source_penalty, source_penalty)
+
+    return np.divide(raw, dist_max, out=np.zeros(shape), where=dist_max != 0)
+
+
 def distance(
     original: Likelies,
     album_info: AlbumInfo,
@@ -441,6 +631,58 @@ def distance(
     `item_info_pairs` is a list with matched (Item, TrackInfo) pairs.
     `unmatched_count` is the number of unmatched tracks on the release.
     """
+    dist = _album_level_distance(original, album_info)
+
+    # Tracks.
+    dist.tracks = {}
+    for item, track in item_info_pairs:
+        dist.tracks[track] = track_distance(item, track, album_info.va)
+        dist.add("tracks", dist.tracks[track].distance)
+
+    # Missing tracks.
+    for _ in range(len(album_info.tracks) - len(item_info_pairs)):
+        dist.add("missing_tracks", 1.0)
+
+    # Unmatched tracks.
+    for _ in range(unmatched_count):
+        dist.add("unmatched_tracks", 1.0)
+
+    dist.add_data_source(original.data_source, album_info.data_source)
+
+    return dist
+
+
+def distance_lower_bound(
+    original: Likelies, album_info: AlbumInfo, item_count: int
+) -> float:
+    """Return a lower bound of the :func:`distance` of a candidate album
+    that does not need its tracks to be matched to the items.
+
+    The track assignment matches as many items and tracks as it can, so
+    only the distances of the matched pairs are unknown and are taken
+    to be zero.
+    """
+    dist = _album_level_distance(original, album_info)
+
+    matched = min(item_count, len(album_info.tracks))
+    for _ in range(matched):
+        dist.add("tracks", 0.0)
+    for _ in range(len(album_info.tracks) - matched):
+        dist.add("missing_tracks", 1.0)
+    for _ in range(item_count - matched):
+        dist.add("unmatched_tracks", 1.0)
+
+    dist.add_data_source(original.data_source, album_info.data_source)
+
+    return dist.distance
+
+
+def _album_level_distance(
+    original: Likelies, album_info: AlbumInfo
+) -> Distance:
+    """Compute the penalties of :func:`distance` that only depend on the
+    album-level metadata.
+    """
     dist = Distance()
 
     # Artist, if not various.
@@ -521,20 +763,4 @@ def distance(
     if original.mb_albumid:
         dist.add_equality("album_id", original.mb_albumid, album_info.album_id)
 
-    # Tracks.
-    dist.tracks = {}
-    for item, track in item_info_pairs:
-        dist.tracks[track] = track_distance(item, track, album_info.va)
-        dist.add("tracks", dist.tracks[track].distance)
-
-    # Missing tracks.
-    for _ in range(len(album_info.tracks) - len(item_info_pairs)):
-        dist.add("missing_tracks", 1.0)
-
-    # Unmatched tracks.
-    for _ in range(unmatched_count):
-        dist.add("unmatched_tracks", 1.0)
-
-    dist.add_data_source(original.data_source, album_info.data_source)
-
     return dist
@@ -10,11 +10,16 @@ from functools import cached_property
 from typing import TYPE_CHECKING, Any, ClassVar, NamedTuple, TypeVar
 
 import lap
-import numpy as np
 
 from beets import config, logging, metadata_plugins, plugins
 
-from .distance import VA_ARTISTS, distance, track_distance
+from .distance import (
+    VA_ARTISTS,
+    distance,
+    distance_lower_bound,
+    track_distance,
+    track_distance_matrix,
+)
 
 if TYPE_CHECKING:
     from collections.abc import Iterable, Sequence
@@ -61,9 +66,9 @@ def assign_items(
     """
     log.debug("Computing track assignment...")
     # Construct the cost matrix.
-    costs = [[float(track_distance(i, t)) for t in tracks] for i in items]
+    costs = track_distance_matrix(items, tracks)
     # Assign items to tracks
-    _, _, assigned_item_idxs = lap.lapjv(np.array(costs), extend_cost=True)
+    _, _, assigned_item_idxs = lap.lapjv(costs, extend_cost=True)
     log.debug("...done.")
 
     # Each item in `assigned_item_idxs` list corresponds to a track in the
@@ -329,12 +334,18 @@ def _sort_candidates(candidates: Iterable[AnyMatch]) -> Sequence[AnyMatch]:
 
 
 def _add_candidate(
-    source: Source, results: Candidates[AlbumMatch], info: AlbumInfo
+    source: Source,
+    results: Candidates[AlbumMatch],
+    info: AlbumInfo,
+    prune: bool = True,
 ):
     """Given a candidate AlbumInfo object, attempt to add the candidate
     to the output dictionary of AlbumMatch objects. This involves
     checking the track count, ordering the items, checking for
     duplicates, and calculating the distance.
+
+    If `prune` is set, candidates that are too far from the best one to
+    change the recommendation are not added.
     """
     log.debug(
         "Candidate: {0.artist} - {0.album} ({0.album_id}) from {0.data_source}",
@@ -358,6 +369,15 @@ def _add_candidate(
             log.debug("Ignored. Missing required tag: {}", req_tag)
             return
 
+    # Skip matching the tracks of candidates that cannot get close enough
+    # to the best candidate so far to change the recommendation.
+    if prune and results and config["match"]["prune_candidates"]:
+        best = min(match.distance for match in results.values())
+        bound = distance_lower_bound(source.data, info, len(source.items))
+        if bound - best >= config["match"]["rec_gap_thresh"].as_number():
+            log.debug("Ignored. Distance of at least {:.2f}.", bound)
+            return
+
     # Find mapping between the items and the track info.
     item_info_pairs, extra_items, extra_tracks = assign_items(
         source.items, info.tracks
@@ -410,7 +430,7 @@ def tag_album(
     if search_ids:
         log.debug("Searching for album IDs: {}", ", ".join(search_ids))
         for _info in metadata_plugins.albums_for_ids(search_ids):
-            _add_candidate(source, candidates, _info)
+            _add_candidate(source, candidates, _info, prune=False)
 
     # Use existing metadata or text search.
     else:
@@ -2,7 +2,7 @@
 Library.
 """
 
-from .db import Database, Index, Model, Results
+from .db import Cursor, Database, Index, Model, Results
 from .query import (
     AndQuery,
     FieldQuery,
@@ -20,6 +20,7 @@ from .types import Type
 
 __all__ = [
     "AndQuery",
+    "Cursor",
     "Database",
     "FieldQuery",
     "Index",
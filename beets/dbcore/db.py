@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import functools
+import json
 import os
 import re
 import sqlite3
@@ -15,6 +16,7 @@ from collections.abc import Mapping, Sequence
 from contextlib import contextmanager
 from dataclasses import dataclass
 from functools import cached_property
+from itertools import islice
 from pathlib import Path
 from sqlite3 import Connection, sqlite_version_info
 from typing import (
@@ -41,7 +43,7 @@ from beets.util.functemplate import get_template
 from ..util import cached_classproperty
 from . import types
 from .query import MatchQuery, TrueQuery
-from .sort import NullSort
+from .sort import NullSort, order_by_sql
 
 if TYPE_CHECKING:
     from collections.abc import (
@@ -56,7 +58,7 @@ if TYPE_CHECKING:
 
     from ..util import PathLike
     from .query import FieldQueryType, Query, SQLiteType
-    from .sort import FieldSort, Sort
+    from .sort import FieldSort, OrderTerm, Sort
 
 D = TypeVar("D", bound="Database", default=Any)
 
@@ -64,6 +66,36 @@ FlexAttrs = dict[str, str]
 JSONDict = dict[str, Any]
 
 
+FLEX_ATTRS_SQL = """
+    SELECT json_group_object(
+        key,
+        CASE typeof(value)
+            WHEN 'blob' THEN json_array(hex(value))
+            ELSE value
+        END
+    )
+    FROM {flex_table} WHERE entity_id = {table}.id
+"""
+"""A correlated subquery that encodes the flexible attributes of the
+current row of `table` as a JSON object. Attribute values are stored as text,
+except for blobs, which JSON cannot hold: these are wrapped in a
+single-element array of their hex digits.
+"""
+
+
+def sql_literal(text: str) -> str:
+    """Quote a string as an SQL string literal."""
+    return "'{}'".format(text.replace("'", "''"))
+
+
+def decode_flex_attrs(encoded: str) -> FlexAttrs:
+    """Decode flexible attributes encoded by `FLEX_ATTRS_SQL`."""
+    return {
+        key: bytes.fromhex(value[0]) if isinstance(value, list) else value
+        for key, value in json.loads(encoded).items()
+    }
+
+
 class DBAccessError(Exception):
     """The SQLite database became inaccessible.
 
@@ -143,14 +175,23 @@ class FormattedMapping(Mapping[str, str]):
             default = self.model._type(key).format(None)
         return super().get(key, default)
 
+    @cached_property
+    def _sep_replacements(self) -> tuple[str, str]:
+        """The replacements for path and drive separators in values
+        formatted for paths, read once for all the fields.
+        """
+        return (
+            beets.config["path_sep_replace"].as_str(),
+            beets.config["drive_sep_replace"].as_str(),
+        )
+
     def _get_formatted(self, model: Model, key: str) -> str:
         value = model._type(key).format(model.get(key))
         if isinstance(value, bytes):
             value = value.decode("utf-8", "ignore")
 
         if self.for_path:
-            sep_repl = beets.config["path_sep_replace"].as_str()
-            sep_drive = beets.config["drive_sep_replace"].as_str()
+            sep_repl, sep_drive = self._sep_replacements
 
             if re.match(r"^[a-zA-Z]:", value):
                 value = re.sub(r"(?<=[a-zA-Z]):", sep_drive, value)
@@ -280,6 +321,13 @@ class Model(ABC, Generic[D]):
     are subclasses of `Sort`.
     """
 
+    @cached_classproperty
+    def _indexed_flex_fields(cls) -> set[str]:
+        """Flexible attributes whose values are indexed, so that queries
+        on them do not need to look up the attributes of every object.
+        """
+        return set()
+
     @cached_classproperty
     def _queries(cls) -> dict[str, FieldQueryType]:
         """Named queries that use a field-like `name:value` syntax but which
@@ -324,6 +372,56 @@ class Model(ABC, Generic[D]):
         """Fields in the related table."""
         return cls._relation._fields.keys() - cls.shared_db_fields
 
+    @classmethod
+    def flex_value_sql(
+        cls, key: str, entity_id: str | None = None
+    ) -> str | None:
+        """Return an SQL expression for the raw value of flexible attribute
+        `key`, or None if `key` names a fixed or computed field.
+
+        `entity_id` is an SQL expression for the id of the object that has
+        the attribute. By default, this is the row being queried.
+        """
+        if key in cls.all_db_fields or key in cls._getters():
+            return None
+        entity_id = entity_id or f"{cls._table}.id"
+        # Attribute names are matched case-insensitively, like in `_get`.
+        return (
+            f"(SELECT value FROM {cls._flex_table} WHERE entity_id = "
+            f"{entity_id} AND key = {sql_literal(key)} COLLATE NOCASE)"
+        )
+
+    @classmethod
+    def flex_match_sql(
+        cls,
+        key: str,
+        condition: str,
+        subvals: Sequence[SQLiteType],
+        entity_id: str | None = None,
+    ) -> tuple[str, Sequence[SQLiteType]]:
+        """Return an SQL clause and its substitution values selecting the
+        rows whose flexible attribute `key` satisfies `condition`, an SQL
+        expression on the attribute table's `value` column.
+
+        Unlike comparisons on `flex_value_sql`, this looks attributes up
+        by key, so it can use the index of an indexed flexible attribute.
+        """
+        entity_id = entity_id or f"{cls._table}.id"
+        return (
+            f"{entity_id} IN (SELECT entity_id FROM {cls._flex_table} "
+            f"WHERE key = {sql_literal(key)} AND ({condition}))"
+        ), subvals
+
+    @classmethod
+    def flex_index_sql(cls, key: str) -> str:
+        """Return the expression by which the values of the indexed
+        flexible attribute `key` are indexed: numerically for numeric
+        types, so that range queries can use the index.
+        """
+        if cls._type(key).sql in {"INTEGER", "REAL"}:
+            return "CAST(value AS NUMERIC)"
+        return "value"
+
     @cached_property
     def db(self) -> D:
         """Get the database associated with this object.
@@ -591,46 +689,34 @@ class Model(ABC, Generic[D]):
         :param fields: the fields to be stored. If not specified, all fields
         will be.
         """
+        self.db._store_models([self], fields)
+
+    def _changes(
+        self, fields: Iterable[str] | None = None
+    ) -> tuple[dict[str, SQLiteType], dict[str, SQLiteType], list[str]]:
+        """Return the SQL values of the dirty fixed fields among `fields`
+        and of the dirty flexible attributes, and the names of the deleted
+        flexible attributes.
+        """
         if fields is None:
             fields = self._fields
 
-        # Build assignments for query.
-        assignments = []
-        subvars: list[SQLiteType] = []
-        for key in fields:
-            if key != "id" and key in self._fields and key in self._dirty:
-                self._dirty.remove(key)
-                assignments.append(f"{key}=?")
-                value = self._type(key).to_sql(self[key])
-                subvars.append(value)
-
-        with self.db.transaction() as tx:
-            # Main table update.
-            if assignments:
-                query = f"UPDATE {self._table} SET {','.join(assignments)} WHERE id=?"
-                subvars.append(self.id)
-                tx.mutate(query, subvars)
-
-            # Modified/added flexible attributes.
-            for key, value in self._values_flex.items():
-                if key in self._dirty:
-                    self._dirty.remove(key)
-                    value = self._type(key).to_sql(value)
-                    tx.mutate(
-                        f"INSERT INTO {self._flex_table} "
-                        "(entity_id, key, value) "
-                        "VALUES (?, ?, ?);",
-                        (self.id, key, value),
-                    )
-
-            # Deleted flexible attributes.
-            for key in self._dirty:
-                tx.mutate(
-                    f"DELETE FROM {self._flex_table} WHERE entity_id=? AND key=?",
-                    (self.id, key),
-                )
-
-        self.clear_dirty()
+        fixed = {
+            key: self._type(key).to_sql(self[key])
+            for key in fields
+            if key != "id" and key in self._fields and key in self._dirty
+        }
+        flex = {
+            key: self._type(key).to_sql(value)
+            for key, value in self._values_flex.items()
+            if key in self._dirty
+        }
+        deleted = [
+            key
+            for key in self._dirty
+            if key not in self._values_flex and key not in self._fields
+        ]
+        return fixed, flex, deleted
 
     def load(self) -> None:
         """Refresh the object's metadata from the library database.
@@ -727,6 +813,51 @@ class Model(ABC, Generic[D]):
 
 
 AnyModel = TypeVar("AnyModel", bound=Model)
+T = TypeVar("T")
+
+
+class Cursor(NamedTuple):
+    """A position in query results ordered by the database, from which
+    the following objects can be fetched (keyset pagination).
+    """
+
+    keys: tuple[SQLiteType, ...]
+    """The values of the ORDER BY terms for the object before the
+    position, the last of which is its id.
+    """
+
+
+def keyset_clause(
+    terms: Sequence[OrderTerm], keys: Sequence[SQLiteType]
+) -> tuple[str, list[SQLiteType]]:
+    """Return an SQL condition, and its substitution values, selecting
+    the rows that `terms` order after a row with the given `keys`.
+
+    SQLite orders NULL before any other value, so it is handled apart.
+    """
+    alternatives = []
+    subvals: list[SQLiteType] = []
+    equal: list[str] = []
+    equal_subvals: list[SQLiteType] = []
+    for (expr, ascending), key in zip(terms, keys):
+        after: str | None
+        if key is None:
+            after, after_subvals = (
+                f"{expr} IS NOT NULL" if ascending else None,
+                [],
+            )
+        elif ascending:
+            after, after_subvals = f"{expr} > ?", [key]
+        else:
+            after, after_subvals = f"({expr} < ? OR {expr} IS NULL)", [key]
+
+        if after:
+            alternatives.append(" AND ".join([*equal, after]))
+            subvals += [*equal_subvals, *after_subvals]
+        equal.append(f"{expr} IS ?")
+        equal_subvals.append(key)
+
+    return " OR ".join(f"({a})" for a in alternatives) or "0", subvals
 
 
 class Results(Sequence[AnyModel]):
@@ -739,9 +870,12 @@ class Results(Sequence[AnyModel]):
         model_class: type[AnyModel],
         rows: list[sqlite3.Row],
         db: D,
-        flex_rows: list[sqlite3.Row],
+        flex_rows: list[sqlite3.Row] | None,
         query: Query | None = None,
         sort: Sort | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+        order_terms: list[OrderTerm] | None = None,
     ) -> None:
         """Create a result set that will construct objects of type
         `model_class`.
@@ -750,30 +884,65 @@ class Results(Sequence[AnyModel]):
         constructed. `rows` is a query result: a list of mappings. The
         new objects will be associated with the database `db`.
 
+        `flex_rows` holds the flexible attributes of these objects,
+        ordered by entity id. If it is None, each row instead carries its
+        attributes in a `flex_attrs` column, as encoded by `FLEX_ATTRS_SQL`.
+
         If `query` is provided, it is used as a predicate to filter the
         results for a "slow query" that cannot be evaluated by the
         database directly. If `sort` is provided, it is used to sort the
         full list of results before returning. This means it is a "slow
         sort" and all objects must be built before returning the first
         one.
+
+        If `offset` is provided, that many objects are skipped, and if
+        `limit` is provided, at most this many objects are returned.
+        Without a slow sort, no more rows are consumed once the limit is
+        reached.
+
+        `order_terms` are the terms by which the database ordered the
+        rows, ending with the id, if they can be resumed from a `cursor`.
         """
         self.model_class = model_class
         self.rows = rows
         self.db = db
         self.query = query
         self.sort = sort
+        self.limit = limit
+        self.offset = offset or 0
+        self.order_terms = order_terms
         self.flex_rows = flex_rows
 
-        # We keep a queue of rows we haven't yet consumed for
+        # A cursor into the rows we haven't yet consumed for
         # materialization. We preserve the original total number of
         # rows.
-        self._rows = rows
+        self._row_index = 0
         self._row_count = len(rows)
 
+        # A cursor into the flexible attribute rows, which are ordered by
+        # entity id, and the attributes read ahead of the main rows.
+        self._flex_index = 0
+        self._flex_pending: dict[int, FlexAttrs] = {}
+
         # The materialized objects corresponding to rows that have been
         # consumed.
         self._objects: list[AnyModel] = []
 
+    @property
+    def _exhausted(self) -> bool:
+        """Whether every row needed has been consumed for
+        materialization.
+        """
+        if self.limit is not None and not self.sort:
+            if len(self._objects) >= self.offset + self.limit:
+                return True
+        return self._row_index >= self._row_count
+
+    def _window(self, objects: Iterable[T]) -> Iterator[T]:
+        """Apply the offset and the limit to the objects in order."""
+        stop = None if self.limit is None else self.offset + self.limit
+        return islice(objects, self.offset, stop)
+
     def _get_objects(self) -> Iterator[AnyModel]:
         """Construct and generate Model objects for they query. The
         objects are returned in the order emitted from the database; no
@@ -784,12 +953,8 @@ class Results(Sequence[AnyModel]):
         a `Results` object a second time should be much faster than the
         first.
         """
-
-        # Index flexible attributes by the item ID, so we have easier access
-        flex_attrs = self._get_indexed_flex_attrs()
-
         index = 0  # Position in the materialized objects.
-        while index < len(self._objects) or self._rows:
+        while index < len(self._objects) or not self._exhausted:
             # Are there previously-materialized objects to produce?
             if index < len(self._objects):
                 yield self._objects[index]
@@ -798,9 +963,8 @@ class Results(Sequence[AnyModel]):
             # Otherwise, we consume another row, materialize its object
             # and produce it.
             else:
-                while self._rows:
-                    row = self._rows.pop(0)
-                    obj = self._make_model(row, flex_attrs.get(row["id"], {}))
+                while not self._exhausted:
+                    obj = self._make_model(*self._consume_row())
                     # If there is a slow-query predicate, ensurer that the
                     # object passes it.
                     if not self.query or self.query.match(obj):
@@ -816,21 +980,66 @@ class Results(Sequence[AnyModel]):
         if self.sort:
             # Slow sort. Must build the full list first.
             objects = self.sort.sort(list(self._get_objects()))
-            return iter(objects)
+            return self._window(objects)
 
         # Objects are pre-sorted (i.e., by the database).
-        return self._get_objects()
+        return self._window(self._get_objects())
+
+    @property
+    def needs_objects(self) -> bool:
+        """Whether the objects must be constructed to filter or sort the
+        results, because the database could not do it by itself.
+        """
+        return bool(self.query or self.sort)
 
-    def _get_indexed_flex_attrs(self) -> dict[int, FlexAttrs]:
-        """Index flexible attributes by the entity id they belong to"""
-        flex_values: dict[int, FlexAttrs] = {}
-        for row in self.flex_rows:
-            if row["entity_id"] not in flex_values:
-                flex_values[row["entity_id"]] = {}
+    def raw(self) -> Iterator[tuple[sqlite3.Row, FlexAttrs]]:
+        """Generate the database rows of the results, along with the
+        flexible attributes of their objects, without constructing the
+        objects.
 
-            flex_values[row["entity_id"]][row["key"]] = row["value"]
+        Only available for results that do not :attr:`needs_objects`.
+        The values are as stored, use the model's `_convert` to get
+        their Python types.
+        """
+        if self.needs_objects:
+            raise ValueError("results must be filtered or sorted in Python")
+
+        # Read the rows with their own cursors, so that the results can
+        # still be iterated over.
+        fresh = Results(self.model_class, self.rows, self.db, self.flex_rows)
+        rows = (fresh._consume_row() for _ in range(fresh._row_count))
+        return self._window(rows)
+
+    def _consume_row(self) -> tuple[sqlite3.Row, FlexAttrs]:
+        """Consume the next row and return it with the flexible attributes
+        of its object.
+        """
+        row = self.rows[self._row_index]
+        self._row_index += 1
+        if self.flex_rows is None:
+            return row, decode_flex_attrs(row["flex_attrs"])
 
-        return flex_values
+        return row, self._get_flex_attrs(row["id"])
+
+    def _get_flex_attrs(self, entity_id: int) -> FlexAttrs:
+        """Return the flexible attributes of the entity with the given id.
+
+        Flexible attribute rows are sorted by entity id, so they are only
+        read as far as this entity. When the main rows come in id order
+        too, this is a merge join that never holds more than one entity's
+        attributes at a time.
+        """
+        flex_rows = self.flex_rows or []
+        pending = self._flex_pending
+        while (
+            self._flex_index < len(flex_rows)
+            and (row := flex_rows[self._flex_index])["entity_id"] <= entity_id
+        ):
+            pending.setdefault(row["entity_id"], {})[row["key"]] = row["value"]
+            self._flex_index += 1
+
+        # Each row is materialized only once, so the attributes can go.
+        return pending.pop(entity_id, {})
 
     def _make_model(
         self, row: sqlite3.Row, flex_values: FlexAttrs = {}
@@ -846,19 +1055,20 @@ class Results(Sequence[AnyModel]):
 
     def __len__(self) -> int:
         """Get the number of matching objects."""
-        if not self._rows:
+        if self._exhausted:
             # Fully materialized. Just count the objects.
-            return len(self._objects)
-
-        if self.query:
+            count = len(self._objects)
+        elif self.query:
             # A slow query. Fall back to testing every object.
             count = 0
-            for obj in self:
+            for obj in self._get_objects():
                 count += 1
-            return count
+        else:
+            # A fast query. Just count the rows.
+            count = self._row_count
 
-        # A fast query. Just count the rows.
-        return self._row_count
+        count = max(count - self.offset, 0)
+        return count if self.limit is None else min(count, self.limit)
 
     def __nonzero__(self) -> bool:
         """Does this result contain any objects?"""
@@ -879,10 +1089,10 @@ class Results(Sequence[AnyModel]):
         if isinstance(index, slice) or index < 0:
             return list(self)[index]
 
-        if not self._rows and not self.sort:
+        if self._exhausted and not self.sort and self.limit is None:
             # Fully materialized and already in order. Just look up the
             # object.
-            return self._objects[index]
+            return self._objects[self.offset + index]
 
         it = iter(self)
         try:
@@ -902,6 +1112,26 @@ class Results(Sequence[AnyModel]):
         except StopIteration:
             return None
 
+    @property
+    def cursor(self) -> Cursor | None:
+        """A cursor to the position after the last object built so far,
+        which can be passed as `after` to fetch the next page of results.
+
+        It is None if no object has been built yet, or if the results
+        are not paginated in an order the database can resume from.
+        """
+        if self.order_terms is None or not self._objects:
+            return None
+
+        table = self.model_class._table
+        exprs = ", ".join(expr for expr, _ in self.order_terms)
+        with self.db.transaction() as tx:
+            rows = tx.query(
+                f"SELECT {exprs} FROM {table} WHERE {table}.id = ?",
+                (self._objects[-1].id,),
+            )
+        return Cursor(tuple(rows[0])) if rows else None
+
 
 class Transaction:
     """A context manager for safe, concurrent access to the database.
@@ -913,6 +1143,11 @@ class Transaction:
     current transaction.
     """
 
+    _locked = False
+    """A flag storing whether this root transaction holds the database
+    lock.
+    """
+
     def __init__(self, db: Database) -> None:
         self.db = db
 
@@ -923,12 +1158,29 @@ class Transaction:
         with self.db._tx_stack() as stack:
             first = not stack
             stack.append(self)
-        if first:
+        if first and not self.db.concurrent:
             # Beginning a "root" transaction, which corresponds to an
             # SQLite transaction.
             self.db._db_lock.acquire()
+            self._locked = True
         return self
 
+    def _lock_for_write(self) -> None:
+        """Make sure the current root transaction holds the database
+        lock before it writes.
+
+        In concurrent mode, transactions only take the lock once they
+        are about to write, so read-only transactions never wait for
+        each other or for writers.
+        """
+        if not self.db.concurrent:
+            return
+        with self.db._tx_stack() as stack:
+            root = stack[0]
+        if not root._locked:
+            self.db._db_lock.acquire()
+            root._locked = True
+
     def __exit__(
         self,
         exc_type: type[BaseException] | None,
@@ -939,8 +1191,10 @@ class Transaction:
         entered but not yet exited transaction. If it is the last active
         transaction, the database updates are committed.
         """
-        # Beware of races; currently secured by db._db_lock
-        self.db.revision += self._mutated
+        # Beware of races; currently secured by db._db_lock, which is
+        # held by every transaction that mutated.
+        if self._mutated:
+            self.db.revision += 1
         with self.db._tx_stack() as stack:
             assert stack.pop() is self
             empty = not stack
@@ -948,7 +1202,9 @@ class Transaction:
             # Ending a "root" transaction. End the SQLite transaction.
             self.db._connection().commit()
             self._mutated = False
-            self.db._db_lock.release()
+            if self._locked:
+                self._locked = False
+                self.db._db_lock.release()
 
         if (
             isinstance(exc_value, sqlite3.OperationalError)
@@ -974,6 +1230,7 @@ class Transaction:
         Yield control to mutation execution code. If execution succeeds,
         mark this transaction as mutated.
         """
+        self._lock_for_write()
         try:
             yield
         except sqlite3.OperationalError as e:
@@ -1014,6 +1271,7 @@ class Transaction:
     def script(self, statements: str) -> None:
         """Execute a string containing multiple SQL statements."""
         # We don't know whether this mutates, but quite likely it does.
+        self._lock_for_write()
         self._mutated = True
         self.db._connection().executescript(statements)
 
@@ -1088,6 +1346,12 @@ class Database:
     supports_extensions = hasattr(sqlite3.Connection, "enable_load_extension")
     """Whether or not the current version of SQLite supports extensions"""
 
+    join_flex_attributes = sqlite_version_info >= (3, 38, 0)
+    """Whether queries fetch flexible attributes together with the main
+    rows, in a single joined query, rather than in a second query that
+    repeats the filter.
+    """
+
     revision = 0
     """The current revision of the database. To be increased whenever
     data is written in a transaction.
@@ -1095,7 +1359,9 @@ class Database:
 
     path: Path
 
-    def __init__(self, path: PathLike, timeout: float = 5.0) -> None:
+    def __init__(
+        self, path: PathLike, timeout: float = 5.0, concurrent: bool = False
+    ) -> None:
         if sqlite3.threadsafety == 0:
             raise RuntimeError(
                 "sqlite3 must be compiled with multi-threading support"
@@ -1110,6 +1376,7 @@ class Database:
 
         self.path = Path(os.fsdecode(path))
         self.timeout = timeout
+        self.concurrent = concurrent
 
         self._connections: dict[int, sqlite3.Connection] = {}
         self._tx_stacks: defaultdict[int, list[Transaction]] = defaultdict(list)
@@ -1127,14 +1394,24 @@ class Database:
         # whole-second sleeps (!) that would trigger its internal
         # timeout. Using this lock ensures only one SQLite transaction
         # is active at a time.
+        #
+        # In concurrent mode, the database uses a write-ahead log, which
+        # lets readers proceed while a write is in progress, so the lock
+        # is only taken by transactions that write.
         self._db_lock = threading.Lock()
 
+        if concurrent:
+            # The journal mode is stored in the database file, so this
+            # also applies to the connections opened later.
+            self._connection().execute("PRAGMA journal_mode=WAL")
+
         # Set up database schema.
         self._ensure_migration_state_table()
         for model_cls in self._models:
             self._make_table(model_cls._table, model_cls._fields)
             self._make_attribute_table(model_cls._flex_table)
             self._create_indices(model_cls._table, model_cls._indices)
+            self._create_flex_indices(model_cls)
 
         self._migrate()
 
@@ -1249,9 +1526,24 @@ class Database:
                 conn.create_function, deterministic=True
             )
 
+        def flex_number(value: Any) -> int | float | None:
+            """Convert the raw value of a flexible attribute to a number
+            so it can be compared numerically, or to NULL if it is not one.
+            """
+            if not isinstance(value, str):
+                return None
+            try:
+                return int(value)
+            except ValueError:
+                try:
+                    return float(value)
+                except ValueError:
+                    return None
+
         create_function("regexp", 2, regexp)
         create_function("unidecode", 1, unidecode)
         create_function("bytelower", 1, bytelower)
+        create_function("flex_number", 1, flex_number)
 
     def _close(self) -> None:
         """Close the all connections to the underlying SQLite database
@@ -1348,6 +1640,38 @@ class Database:
                     f"ON {table} ({', '.join(index.columns)});"
                 )
 
+    def _create_flex_indices(self, model_cls: type[Model]) -> None:
+        """Create partial indices on the values of the model's indexed
+        flexible attributes, and drop those of attributes that are no
+        longer indexed or whose type changed.
+        """
+        flex_table = model_cls._flex_table
+        prefix = f"{flex_table}_value_"
+        wanted = {
+            (name := prefix + re.sub(r"\W", "_", key)): (
+                f"CREATE INDEX {name} ON {flex_table} "
+                f"({model_cls.flex_index_sql(key)}, entity_id) "
+                f"WHERE key = {sql_literal(key)}"
+            )
+            for key in model_cls._indexed_flex_fields
+        }
+        with self.transaction() as tx:
+            existing = {
+                name: sql
+                for name, sql in tx.query(
+                    "SELECT name, sql FROM sqlite_master "
+                    "WHERE type = 'index' AND tbl_name = ?",
+                    (flex_table,),
+                )
+                if name.startswith(prefix)
+            }
+            for name, sql in existing.items():
+                if wanted.get(name) != sql:
+                    tx.script(f"DROP INDEX {name};")
+            for name, sql in wanted.items():
+                if existing.get(name) != sql:
+                    tx.script(f"{sql};")
+
     # Generic migration state handling.
 
     def _ensure_migration_state_table(self) -> None:
@@ -1397,18 +1721,64 @@ class Database:
         model_cls: type[AnyModel],
         query: Query | None = None,
         sort: Sort | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+        after: Cursor | None = None,
     ) -> Results[AnyModel]:
         """Fetch the objects of type `model_cls` matching the given
         query. The query may be given as a string, string sequence, a
         Query object, or None (to fetch everything). `sort` is an
         `Sort` object.
+
+        The results can be paginated: `offset` objects are skipped and
+        at most `limit` objects are returned. Alternatively, `after` is
+        the `Results.cursor` of the previous page, which resumes the
+        results without counting the objects before it. Both are done
+        by the database whenever it can evaluate the query and the sort.
         """
         query = query or TrueQuery()  # A null query.
         sort = sort or NullSort()  # Unsorted.
-        where, subvals = query.clause()
-        order_by = sort.order_clause()
+        # Let SQLite evaluate as much of the query as it can, so only the
+        # remainder needs to be matched against each object.
+        where, subvals, slow_query = query.split(model_cls)
 
         table = model_cls._table
+        order_terms = sort.order_terms()
+        resumable = None
+        if limit is not None or offset is not None or after is not None:
+            if order_terms is not None and not sort.is_slow():
+                # Break ties by id, so that pages neither overlap nor
+                # skip objects.
+                resumable = order_terms = [*order_terms, (f"{table}.id", True)]
+            elif after is not None:
+                raise ValueError("cannot resume results with a slow sort")
+        order_by = (
+            sort.order_clause()
+            if order_terms is None
+            else order_by_sql(order_terms)
+        )
+
+        # Resuming from a cursor compares the same terms we order by.
+        where_after = ""
+        if after is not None:
+            assert resumable is not None
+            clause, after_subvals = keyset_clause(resumable, after.keys)
+            where_after = f" WHERE {clause}"
+            subvals = [*subvals, *after_subvals]
+
+        # The database can only paginate when it both filters and orders
+        # the objects by itself.
+        limit_sql = ""
+        if (
+            (limit is not None or offset)
+            and not slow_query
+            and not sort.is_slow()
+        ):
+            limit_sql = f" LIMIT {-1 if limit is None else int(limit)}"
+            if offset:
+                limit_sql += f" OFFSET {int(offset)}"
+            limit = offset = None
+
         _from = table
         if query.field_names & model_cls.other_db_fields:
             _from += f" {model_cls.relation_join}"
@@ -1420,36 +1790,120 @@ class Database:
             f"WHERE {where or 1} "
             f"GROUP BY {table}.id"
         )
-        # Fetch flexible attributes for items matching the main query.
-        # Doing the per-item filtering in python is faster than issuing
-        # one query per item to sqlite.
-        flex_sql = (
-            "SELECT * "
-            f"FROM {model_cls._flex_table} "
-            f"WHERE entity_id IN (SELECT id FROM ({sql}))"
-        )
 
-        if order_by:
-            # the sort field may exist in both 'items' and 'albums' tables
-            # (when they are joined), causing ambiguous column OperationalError
-            # if we try to order directly.
-            # Since the join is required only for filtering, we can filter in
-            # a subquery and order the result, which returns unique fields.
-            sql = f"SELECT * FROM ({sql}) ORDER BY {order_by}"
+        if self.join_flex_attributes:
+            # Aggregate the flexible attributes of each matching row in
+            # the same query, so the filter is only evaluated once.
+            flex_sql = FLEX_ATTRS_SQL.format(
+                flex_table=model_cls._flex_table, table=table
+            )
+            # Name the filtered rows after the table, so that correlated
+            # subqueries in the attribute and sort expressions resolve.
+            sql = (
+                f"SELECT {table}.*, ({flex_sql}) AS flex_attrs "
+                f"FROM ({sql}) AS {table}{where_after}"
+            )
+            if order_by:
+                sql += f" ORDER BY {order_by}"
+            sql += limit_sql
 
-        with self.transaction() as tx:
-            rows = tx.query(sql, subvals)
-            flex_rows = tx.query(flex_sql, subvals)
+            with self.transaction() as tx:
+                rows = tx.query(sql, subvals)
+            flex_rows = None
+        else:
+            if order_by or limit_sql or where_after:
+                # the sort field may exist in both 'items' and 'albums'
+                # tables (when they are joined), causing ambiguous column
+                # OperationalError if we try to order directly.
+                # Since the join is required only for filtering, we can
+                # filter in a subquery and order the result, which returns
+                # unique fields.
+                sql = f"SELECT * FROM ({sql}) AS {table}{where_after}"
+                if order_by:
+                    sql += f" ORDER BY {order_by}"
+                sql += limit_sql
+
+            # Fetch flexible attributes for items matching the main query.
+            # Doing the per-item filtering in python is faster than issuing
+            # one query per item to sqlite.
+            flex_sql = (
+                "SELECT * "
+                f"FROM {model_cls._flex_table} "
+                f"WHERE entity_id IN (SELECT id FROM ({sql})) "
+                "ORDER BY entity_id"
+            )
+
+            with self.transaction() as tx:
+                rows = tx.query(sql, subvals)
+                flex_rows = tx.query(flex_sql, subvals)
 
         return Results(
             model_cls,
             rows,
             self,
             flex_rows,
-            None if where else query,  # Slow query component.
+            slow_query,  # Slow query component.
             sort if sort.is_slow() else None,  # Slow sort component.
+            limit,  # Pagination the database could not apply.
+            offset,
+            resumable,
         )
 
+    def _store_models(
+        self, models: Iterable[Model], fields: Iterable[str] | None = None
+    ) -> None:
+        """Save the dirty fields of several objects in one transaction.
+
+        Writes to the same table and columns are batched into a single
+        statement run with `executemany`, so storing many objects with
+        similar changes costs little more than storing one.
+        """
+        models = list(models)
+        if fields is not None:
+            fields = list(fields)
+
+        updates: defaultdict[str, list[tuple[SQLiteType, ...]]]
+        updates = defaultdict(list)
+        inserts: defaultdict[str, list[tuple[SQLiteType, ...]]]
+        inserts = defaultdict(list)
+        deletes: defaultdict[str, list[tuple[SQLiteType, ...]]]
+        deletes = defaultdict(list)
+        for model in models:
+            fixed, flex, deleted = model._changes(fields)
+            if fixed:
+                assignments = ",".join(f"{key}=?" for key in fixed)
+                statement = (
+                    f"UPDATE {model._table} SET {assignments} WHERE id=?"
+                )
+                updates[statement].append((*fixed.values(), model.id))
+            for key, value in flex.items():
+                inserts[model._flex_table].append((model.id, key, value))
+            for key in deleted:
+                deletes[model._flex_table].append((model.id, key))
+
+        with self.transaction() as tx:
+            # Main table updates.
+            for statement, subvals in updates.items():
+                tx.mutate_many(statement, subvals)
+
+            # Modified/added flexible attributes.
+            for flex_table, subvals in inserts.items():
+                tx.mutate_many(
+                    f"INSERT INTO {flex_table} (entity_id, key, value) "
+                    "VALUES (?, ?, ?);",
+                    subvals,
+                )
+
+            # Deleted flexible attributes.
+            for flex_table, subvals in deletes.items():
+                tx.mutate_many(
+                    f"DELETE FROM {flex_table} WHERE entity_id=? AND key=?",
+                    subvals,
+                )
+
+        for model in models:
+            model.clear_dirty()
+
     def _get(self, model_cls: type[AnyModel], id_: int) -> AnyModel | None:
         """Get a Model object by its id or None if the id does not exist."""
         return self._get_results(model_cls, MatchQuery("id", id_)).get()
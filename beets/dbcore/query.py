@@ -19,7 +19,7 @@ from beets.util.units import raw_seconds_short
 from . import pathutils
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator, MutableSequence
+    from collections.abc import Callable, Iterator, MutableSequence
 
     from beets.dbcore.db import Model
 
@@ -98,6 +98,20 @@ class Query(ABC):
         perform queries on arbitrary sets of Model.
         """
 
+    def split(
+        self, model_cls: type[Model]
+    ) -> tuple[str | None, Sequence[SQLiteType], Query | None]:
+        """Split the query into the parts SQLite and Python evaluate.
+
+        Return (clause, subvals, residual) where clause and subvals are as
+        for `clause()`, and residual is a query that objects of
+        `model_cls` selected by the clause must still `match()`, or None.
+        """
+        clause, subvals = self.clause()
+        if clause:
+            return clause, subvals, None
+        return None, (), self
+
     def __and__(self, other: Query) -> AndQuery:
         return AndQuery([self, other])
 
@@ -155,6 +169,23 @@ class FieldQuery(Query, Generic[P]):
         # Matching a flexattr. This is a slow query.
         return None, ()
 
+    def flex_clause(
+        self, model_cls: type[Model]
+    ) -> tuple[str, Sequence[SQLiteType]] | None:
+        """Generate an SQLite expression implementing the query on a
+        flexible attribute of `model_cls`, or None if the query can only
+        be evaluated in Python.
+        """
+        return None
+
+    def split(
+        self, model_cls: type[Model]
+    ) -> tuple[str | None, Sequence[SQLiteType], Query | None]:
+        if not self.fast and model_cls.flex_value_sql(self.field_name):
+            if flex_clause := self.flex_clause(model_cls):
+                return *flex_clause, None
+        return super().split(model_cls)
+
     @classmethod
     def value_match(cls, pattern: P, value: Any) -> bool:
         """Determine whether the value matches the pattern."""
@@ -480,17 +511,28 @@ class NumericQuery(FieldQuery[str]):
         return True
 
     def col_clause(self) -> tuple[str, Sequence[SQLiteType]]:
+        return self._value_clause(self.field)
+
+    def flex_clause(
+        self, model_cls: type[Model]
+    ) -> tuple[str, Sequence[SQLiteType]]:
+        return numeric_flex_clause(
+            model_cls, self.field_name, self._value_clause
+        )
+
+    def _value_clause(self, value: str) -> tuple[str, Sequence[SQLiteType]]:
+        """Generate the comparisons of the SQL expression `value`."""
         if self.point is not None:
-            return f"{self.field}=?", (self.point,)
+            return f"{value}=?", (self.point,)
         if self.rangemin is not None and self.rangemax is not None:
-            return (
-                f"{self.field} >= ? AND {self.field} <= ?",
-                (self.rangemin, self.rangemax),
+            return f"{value} >= ? AND {value} <= ?", (
+                self.rangemin,
+                self.rangemax,
             )
         if self.rangemin is not None:
-            return f"{self.field} >= ?", (self.rangemin,)
+            return f"{value} >= ?", (self.rangemin,)
         if self.rangemax is not None:
-            return f"{self.field} <= ?", (self.rangemax,)
+            return f"{value} <= ?", (self.rangemax,)
         return "1", ()
 
 
@@ -521,6 +563,28 @@ class InQuery(Generic[AnySQLiteType], FieldQuery[Sequence[AnySQLiteType]]):
         return hash((self.field_name, tuple(self.pattern)))
 
 
+def numeric_flex_clause(
+    model_cls: type[Model],
+    key: str,
+    value_clause: Callable[[str], tuple[str, Sequence[SQLiteType]]],
+) -> tuple[str, Sequence[SQLiteType]]:
+    """Implement a numeric comparison on flexible attribute `key` in SQL.
+
+    `value_clause` generates the comparison for a numeric SQL expression.
+    Only objects that have the attribute, with a numeric value, match.
+    """
+    if key in model_cls._indexed_flex_fields:
+        # Compare the indexed expression so that SQLite can use the index.
+        clause, subvals = value_clause("CAST(value AS NUMERIC)")
+        return model_cls.flex_match_sql(
+            key, f"flex_number(value) IS NOT NULL AND {clause}", subvals
+        )
+
+    value_sql = f"flex_number({model_cls.flex_value_sql(key)})"
+    clause, subvals = value_clause(value_sql)
+    return f"{value_sql} IS NOT NULL AND {clause}", subvals
+
+
 class CollectionQuery(Query):
     """An abstract query class that aggregates other queries. Can be
     indexed like a list to access the sub-queries.
@@ -566,6 +630,23 @@ class CollectionQuery(Query):
         clause = f" {joiner} ".join(clause_parts)
         return clause, subvals
 
+    def split_with_joiner(
+        self, joiner: str, model_cls: type[Model]
+    ) -> tuple[str | None, Sequence[SQLiteType], Query | None]:
+        """Split the query, joining the clauses of all subqueries with the
+        string joiner, if none of them leaves a residual.
+        """
+        clause_parts = []
+        subvals: list[SQLiteType] = []
+        for subq in self.subqueries:
+            subq_clause, subq_subvals, residual = subq.split(model_cls)
+            if residual:
+                # Fall back to slow query.
+                return None, (), self
+            clause_parts.append(f"({subq_clause})")
+            subvals += subq_subvals
+        return f" {joiner} ".join(clause_parts), subvals, None
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}({self.subqueries!r})"
 
@@ -599,6 +680,30 @@ class AndQuery(MutableCollectionQuery):
     def clause(self) -> tuple[str | None, Sequence[SQLiteType]]:
         return self.clause_with_joiner("and")
 
+    def split(
+        self, model_cls: type[Model]
+    ) -> tuple[str | None, Sequence[SQLiteType], Query | None]:
+        """Push every conjunct that SQLite can evaluate into the clause,
+        leaving only the others to be matched in Python.
+        """
+        clause_parts = []
+        subvals: list[SQLiteType] = []
+        residuals = []
+        for subq in self.subqueries:
+            subq_clause, subq_subvals, residual = subq.split(model_cls)
+            if subq_clause:
+                clause_parts.append(f"({subq_clause})")
+                subvals += subq_subvals
+            if residual:
+                residuals.append(residual)
+
+        clause = " and ".join(clause_parts) or None
+        if not residuals:
+            return clause, subvals, None
+        if len(residuals) == 1:
+            return clause, subvals, residuals[0]
+        return clause, subvals, AndQuery(residuals)
+
     def match(self, obj: Model) -> bool:
         return all(q.match(obj) for q in self.subqueries)
 
@@ -609,6 +714,11 @@ class OrQuery(MutableCollectionQuery):
     def clause(self) -> tuple[str | None, Sequence[SQLiteType]]:
         return self.clause_with_joiner("or")
 
+    def split(
+        self, model_cls: type[Model]
+    ) -> tuple[str | None, Sequence[SQLiteType], Query | None]:
+        return self.split_with_joiner("or", model_cls)
+
     def match(self, obj: Model) -> bool:
         return any(q.match(obj) for q in self.subqueries)
 
@@ -634,6 +744,15 @@ class NotQuery(Query):
         # is handled by match() for slow queries.
         return clause, subvals
 
+    def split(
+        self, model_cls: type[Model]
+    ) -> tuple[str | None, Sequence[SQLiteType], Query | None]:
+        clause, subvals, residual = self.subquery.split(model_cls)
+        if residual:
+            # A partial clause cannot be negated on its own.
+            return None, (), self
+        return f"not ({clause})", subvals, None
+
     def match(self, obj: Model) -> bool:
         return not self.subquery.match(obj)
 
@@ -872,17 +991,28 @@ class DateQuery(FieldQuery[str]):
         return self.interval.contains(date)
 
     def col_clause(self) -> tuple[str, Sequence[SQLiteType]]:
+        return self._value_clause(self.field)
+
+    def flex_clause(
+        self, model_cls: type[Model]
+    ) -> tuple[str, Sequence[SQLiteType]]:
+        return numeric_flex_clause(
+            model_cls, self.field_name, self._value_clause
+        )
+
+    def _value_clause(self, value: str) -> tuple[str, Sequence[SQLiteType]]:
+        """Generate the comparisons of the SQL expression `value`."""
         clause_parts = []
         subvals = []
 
         # Convert the `datetime` objects to an integer number of seconds since
         # the (local) Unix epoch using `datetime.timestamp()`.
         if self.interval.start:
-            clause_parts.append(f"{self.field} >= ?")
+            clause_parts.append(f"{value} >= ?")
             subvals.append(int(self.interval.start.timestamp()))
 
         if self.interval.end:
-            clause_parts.append(f"{self.field} < ?")
+            clause_parts.append(f"{value} < ?")
             subvals.append(int(self.interval.end.timestamp()))
 
         if clause_parts:
@@ -188,8 +188,12 @@ def construct_sort_part(
             field = "albumartist" if model_cls.__name__ == "Album" else "artist"
     elif field in model_cls._fields:
         sort_cls = sort.FixedFieldSort
+    elif model_cls.flex_value_sql(field):
+        return sort.FlexFieldSort(
+            model_cls, field, is_ascending, case_insensitive
+        )
     else:
-        # Flexible or computed.
+        # Computed.
         sort_cls = sort.SlowFieldSort
 
     return sort_cls(field, is_ascending, case_insensitive)
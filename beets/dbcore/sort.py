@@ -9,17 +9,35 @@ if TYPE_CHECKING:
 
     from beets.dbcore.db import AnyModel, Model
 
+OrderTerm = tuple[str, bool]
+"""An SQL expression to order by, and whether the order is ascending."""
+
+
+def order_by_sql(terms: Sequence[OrderTerm]) -> str:
+    """Join order terms into the body of an SQL ORDER BY clause."""
+    return ", ".join(
+        f"{expr} {'ASC' if ascending else 'DESC'}" for expr, ascending in terms
+    )
+
 
 class Sort:
     """An abstract class representing a sort operation for a query into
     the database.
     """
 
+    def order_terms(self) -> list[OrderTerm] | None:
+        """Return the terms of the SQL ORDER BY clause for this sort, or
+        None if it cannot be done in SQL (i.e., this is a slow sort).
+        """
+        return None
+
     def order_clause(self) -> str | None:
         """Generates a SQL fragment to be used in a ORDER BY clause, or
         None if no fragment is used (i.e., this is a slow sort).
         """
-        return None
+        if (terms := self.order_terms()) is None:
+            return None
+        return order_by_sql(terms)
 
     def sort(self, items: Sequence[AnyModel]) -> Sequence[AnyModel]:
         """Sort the given sequence of model objects."""
@@ -50,23 +68,22 @@ class MultipleSort(Sort):
     def add_sort(self, sort: Sort) -> None:
         self.sorts.append(sort)
 
-    def order_clause(self) -> str:
-        """Return the list SQL clauses for those sub-sorts for which we can be
+    def order_terms(self) -> list[OrderTerm]:
+        """Return the SQL terms for those sub-sorts for which we can be
         (at least partially) fast.
 
         A contiguous suffix of fast (SQL-capable) sub-sorts are
         executable in SQL. The remaining, even if they are fast
         independently, must be executed slowly.
         """
-        order_strings = []
+        order_terms = []
         for sort in reversed(self.sorts):
-            clause = sort.order_clause()
-            if clause is None:
+            terms = sort.order_terms()
+            if terms is None:
                 break
-            order_strings.append(clause)
-        order_strings.reverse()
+            order_terms[:0] = terms
 
-        return ", ".join(order_strings)
+        return order_terms
 
     def is_slow(self) -> bool:
         for sort in self.sorts:
@@ -80,7 +97,7 @@ class MultipleSort(Sort):
         for sort in reversed(self.sorts):
             if switch_slow:
                 slow_sorts.append(sort)
-            elif sort.order_clause() is None:
+            elif sort.order_terms() is None:
                 switch_slow = True
                 slow_sorts.append(sort)
             else:
@@ -116,6 +133,17 @@ class FieldSort(Sort):
         self.ascending = ascending
         self.case_insensitive = case_insensitive
 
+    def order_expression(self) -> str | None:
+        """Return the SQL expression to order by, or None if this is a
+        slow sort.
+        """
+        return None
+
+    def order_terms(self) -> list[OrderTerm] | None:
+        if (expr := self.order_expression()) is None:
+            return None
+        return [(expr, self.ascending)]
+
     def sort(self, objs: Sequence[AnyModel]) -> Sequence[AnyModel]:
         # TODO: Support flexible attributes with different types (e.g. a mix
         # of strings and numbers) without falling over.
@@ -162,23 +190,52 @@ class FieldSort(Sort):
 class FixedFieldSort(FieldSort):
     """Sort object to sort on a fixed field."""
 
-    def order_clause(self) -> str:
-        order = "ASC" if self.ascending else "DESC"
+    def order_expression(self) -> str:
         if self.case_insensitive:
-            field = (
+            return (
                 "(CASE "
                 f"WHEN TYPEOF({self.field})='text' THEN LOWER({self.field}) "
                 f"WHEN TYPEOF({self.field})='blob' THEN LOWER({self.field}) "
                 f"ELSE {self.field} END)"
             )
-        else:
-            field = self.field
-        return f"{field} {order}"
+        return self.field
+
+
+class FlexFieldSort(FieldSort):
+    """Sort object to sort on a flexible attribute in SQL."""
+
+    def __init__(
+        self,
+        model_cls: type[Model],
+        field: str,
+        ascending: bool = True,
+        case_insensitive: bool = True,
+    ) -> None:
+        super().__init__(field, ascending, case_insensitive)
+        self.model_cls = model_cls
+
+    def order_expression(self) -> str:
+        field = self.model_cls.flex_value_sql(self.field)
+        typ = self.model_cls._types.get(self.field)
+        if typ and typ.sql in {"INTEGER", "REAL"}:
+            field = f"CAST({field} AS NUMERIC)"
+        elif self.case_insensitive:
+            field = f"LOWER({field})"
+
+        # Order missing attributes like the null value `sort` uses.
+        null = typ.null if typ else ""
+        if isinstance(null, bool):
+            null = int(null)
+        if isinstance(null, (int, float)):
+            field = f"COALESCE({field}, {null!r})"
+        elif isinstance(null, str):
+            field = f"COALESCE({field}, '{null}')"
+        return field
 
 
 class SlowFieldSort(FieldSort):
-    """A sort criterion by some model field other than a fixed field:
-    i.e., a computed or flexible field.
+    """A sort criterion by some model field that the database cannot
+    order by: i.e., a computed field.
     """
 
     def is_slow(self) -> bool:
@@ -188,6 +245,9 @@ class SlowFieldSort(FieldSort):
 class NullSort(Sort):
     """No sorting. Leave results unsorted."""
 
+    def order_terms(self) -> list[OrderTerm]:
+        return []
+
     def sort(self, items: Sequence[AnyModel]) -> Sequence[AnyModel]:
         return items
 
@@ -209,12 +269,11 @@ class SmartArtistSort(FieldSort):
     prioritizing the sort field over the raw field.
     """
 
-    def order_clause(self) -> str:
-        order = "ASC" if self.ascending else "DESC"
-        collate = "COLLATE NOCASE" if self.case_insensitive else ""
+    def order_expression(self) -> str:
+        collate = " COLLATE NOCASE" if self.case_insensitive else ""
         field = self.field
 
-        return f"COALESCE(NULLIF({field}_sort, ''), {field}) {collate} {order}"
+        return f"COALESCE(NULLIF({field}_sort, ''), {field}){collate}"
 
     def sort(self, objs: Sequence[AnyModel]) -> Sequence[AnyModel]:
         def key(obj: Model) -> str | bytes:
@@ -3,7 +3,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any, Literal, TypedDict
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import Mapping, Sequence
 
     from beets.autotag import AlbumInfo, TrackInfo
     from beets.autotag.match import AlbumMatch
@@ -119,6 +119,7 @@ class LibraryEventArgs(TypedDict):
 class DatabaseChangeEventArgs(TypedDict):
     lib: Library
     model: LibModel
+    models: Sequence[LibModel]
 
 
 class ImportBeginEventArgs(TypedDict):
@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import os
 import time
-from typing import TYPE_CHECKING
+from functools import cached_property
+from typing import TYPE_CHECKING, Any
 
-from beets import config, logging, plugins, util
+from beets import config, logging, metadata_plugins, plugins, util
 from beets.util import displayable_path, normpath, pipeline, syspath
 
 from . import stages as stagefuncs
@@ -12,7 +13,7 @@ from .actions import Action, DuplicateAction
 from .state import ImportState
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator, Sequence
+    from collections.abc import Callable, Iterator, Sequence
 
     import confuse
 
@@ -75,6 +76,10 @@ class ImportSession:
         self._merged_items = set()
         self._merged_dirs = set()
 
+        # Files read on the worker pool, and the time spent reading.
+        self.prefetched = 0
+        self.read_time = 0.0
+
         # Normalize the paths.
         self.paths = list(map(normpath, paths or []))
 
@@ -190,7 +195,9 @@ class ImportSession:
         self.logger.info("import started {}", time.asctime())
         self.set_config(config["import"])
 
-        stages: list[Iterator[stagefuncs.StageMessage]]
+        stages: list[
+            Iterator[stagefuncs.StageMessage] | list[stagefuncs.StageCoro]
+        ]
         # Set up the pipeline.
         if self.query is None:
             stages = [stagefuncs.read_tasks(self)]
@@ -212,7 +219,7 @@ class ImportSession:
             # stages need to read and write data from there.
             if self.config["autotag"]:
                 stages += [
-                    stagefuncs.lookup_candidates(self),
+                    self._workers(stagefuncs.lookup_candidates, "lookup"),
                     stagefuncs.user_query(self),
                 ]
             else:
@@ -220,17 +227,32 @@ class ImportSession:
 
             # Plugin stages.
             for stage_func in plugins.early_import_stages():
-                stages.append(stagefuncs.plugin_stage(self, stage_func))
+                stages.append(
+                    self._workers(
+                        stagefuncs.plugin_stage, "plugins", stage_func
+                    )
+                )
             for stage_func in plugins.import_stages():
-                stages.append(stagefuncs.plugin_stage(self, stage_func))
+                stages.append(
+                    self._workers(
+                        stagefuncs.plugin_stage, "plugins", stage_func
+                    )
+                )
 
-            stages += [stagefuncs.manipulate_files(self)]
+            stages += [
+                self._workers(stagefuncs.manipulate_files, "files"),
+                stagefuncs.finalize(self),
+            ]
 
+        # Stages with several workers must still hand the tasks on in
+        # order: the user is asked about them as they were found, and
+        # sentinel tasks must come after the tasks of their directory.
         pl: pipeline.Pipeline[stagefuncs.StageMessage, stagefuncs.StageCoro] = (
-            pipeline.Pipeline(stages)
+            pipeline.Pipeline(stages, ordered=True)
         )
 
         # Run the pipeline.
+        metadata_plugins.reset_lookup_stats()
         plugins.send("import_begin", session=self)
         try:
             if config["threaded"]:
@@ -241,6 +263,37 @@ class ImportSession:
             # User aborted operation. Silently stop.
             pass
 
+        for source, stats in metadata_plugins.lookup_stats().items():
+            log.debug(
+                "{} lookups: {}, {:.2f} s on average, {:.2f} s at most, "
+                "{} timed out.",
+                source,
+                stats.count,
+                stats.average,
+                stats.longest,
+                stats.timeouts,
+            )
+        if self.prefetched:
+            log.debug(
+                "Read {} files on worker threads in {:.2f} seconds "
+                "({:.1f} files/s).",
+                self.prefetched,
+                self.read_time,
+                self.prefetched / self.read_time if self.read_time else 0.0,
+            )
+
+    def _workers(
+        self,
+        stage: Callable[..., stagefuncs.StageCoro],
+        option: str,
+        *args: Any,
+    ) -> list[stagefuncs.StageCoro]:
+        """Create the coroutines of a pipeline stage, one per worker
+        thread as set by the `option` of ``import.threads``.
+        """
+        count = max(self.config["threads"][option].get(int), 1)
+        return [stage(self, *args) for _ in range(count)]
+
     # Incremental and resumed imports
 
     def already_imported(
@@ -250,22 +303,25 @@ class ImportSession:
         been imported in a previous session.
         """
         if self.is_resuming(toppath) and all(
-            [ImportState().progress_has_element(toppath, p) for p in paths]
+            self.state.progress_has_element(toppath, p) for p in paths
         ):
             return True
-        if self.config["incremental"] and tuple(paths) in self.history_dirs:
+        if self.config["incremental"] and self.state.history_has(
+            paths, self._history_mark
+        ):
             return True
 
         return False
 
-    _history_dirs = None
+    @cached_property
+    def state(self) -> ImportState:
+        """The persistent import state shared by the session's tasks."""
+        return ImportState()
 
-    @property
-    def history_dirs(self) -> set[tuple[PathBytes, ...]]:
-        # FIXME: This could be simplified to a cached property
-        if self._history_dirs is None:
-            self._history_dirs = ImportState().taghistory
-        return self._history_dirs
+    @cached_property
+    def _history_mark(self) -> int:
+        # Only directories imported before this session count.
+        return self.state.history_mark()
 
     def already_merged(self, paths: Sequence[PathBytes]) -> bool:
         """Returns true if all the paths being imported were part of a merge
@@ -298,7 +354,7 @@ class ImportSession:
 
         Determines the return value of `is_resuming(toppath)`.
         """
-        if self.want_resume and ImportState().progress_has(toppath):
+        if self.want_resume and self.state.progress_has(toppath):
             # Either accept immediately or prompt for input to decide.
             if self.want_resume is True or self.should_resume(toppath):
                 log.warning(
@@ -308,4 +364,4 @@ class ImportSession:
                 self._is_resuming[toppath] = True
             else:
                 # Clear progress; we're starting from the top.
-                ImportState().progress_reset(toppath)
+                self.state.progress_reset(toppath)
@@ -3,6 +3,7 @@ from __future__ import annotations
 import contextvars
 import itertools
 import logging
+import time
 from typing import TYPE_CHECKING, TypeAlias
 
 from beets import config, plugins
@@ -49,7 +50,14 @@ def read_tasks(session: ImportSession) -> Iterator[BaseImportTask]:
 
         # Generate tasks.
         task_factory = ImportTaskFactory(toppath, session)
-        yield from task_factory.tasks()
+        # Time the reading of the tasks, not their later stages.
+        start = time.perf_counter()
+        for task in task_factory.tasks():
+            session.read_time += time.perf_counter() - start
+            yield task
+            start = time.perf_counter()
+        session.read_time += time.perf_counter() - start
+        session.prefetched += task_factory.prefetched
         skipped += task_factory.skipped
 
         if not task_factory.imported:
@@ -266,41 +274,51 @@ def log_files(session: ImportSession, task: ImportTask) -> None:
 # functions which are typically placed last in the pipeline
 
 
-@pipeline.stage
+@pipeline.mutator_stage
 def manipulate_files(session: ImportSession, task: ImportTask) -> None:
     """A coroutine (pipeline stage) that performs necessary file
-    manipulations *after* items have been added to the library and
-    finalizes each task.
+    manipulations *after* items have been added to the library.
     """
-    if not task.skip:
-        if task.duplicate_action in (
-            DuplicateAction.REMOVE,
-            DuplicateAction.UPGRADE,
-        ):
-            task.remove_duplicates(session.lib)
-
-        if session.config["move"]:
-            operation = MoveOperation.MOVE
-        elif session.config["copy"]:
-            operation = MoveOperation.COPY
-        elif session.config["link"]:
-            operation = MoveOperation.LINK
-        elif session.config["hardlink"]:
-            operation = MoveOperation.HARDLINK
-        elif session.config["reflink"].get() == "auto":
-            operation = MoveOperation.REFLINK_AUTO
-        elif session.config["reflink"]:
-            operation = MoveOperation.REFLINK
-        else:
-            operation = None
-
-        task.manipulate_files(
-            session=session,
-            operation=operation,
-            write=session.config["write"].get(bool),
-        )
+    if task.skip:
+        return
+
+    if task.duplicate_action in (
+        DuplicateAction.REMOVE,
+        DuplicateAction.UPGRADE,
+    ):
+        task.remove_duplicates(session.lib)
+
+    if session.config["move"]:
+        operation = MoveOperation.MOVE
+    elif session.config["copy"]:
+        operation = MoveOperation.COPY
+    elif session.config["link"]:
+        operation = MoveOperation.LINK
+    elif session.config["hardlink"]:
+        operation = MoveOperation.HARDLINK
+    elif session.config["reflink"].get() == "auto":
+        operation = MoveOperation.REFLINK_AUTO
+    elif session.config["reflink"]:
+        operation = MoveOperation.REFLINK
+    else:
+        operation = None
 
-    # Progress, cleanup, and event.
+    task.manipulate_files(
+        session=session,
+        operation=operation,
+        write=session.config["write"].get(bool),
+    )
+
+
+@pipeline.stage
+def finalize(session: ImportSession, task: ImportTask) -> None:
+    """A coroutine (pipeline stage) that finalizes each task once its
+    files are in place: it saves the progress, cleans up the imported
+    paths and emits the plugin events.
+
+    Tasks arrive here in the order they were created, so sentinel tasks
+    are only finalized after all the tasks of their directory.
+    """
     task.finalize(session)
 
 
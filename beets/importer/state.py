@@ -3,15 +3,16 @@ from __future__ import annotations
 import logging
 import os
 import pickle
-from bisect import bisect_left, insort
-from dataclasses import dataclass
-from typing import TYPE_CHECKING
+import sqlite3
+import threading
+from typing import TYPE_CHECKING, Any
 
 from typing_extensions import Self
 
 from beets import config
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
     from types import TracebackType
 
     from beets.util import PathBytes
@@ -20,14 +21,39 @@ if TYPE_CHECKING:
 # Global logger.
 log = logging.getLogger("beets")
 
+SQLITE_HEADER = b"SQLite format 3\x00"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS progress (
+    toppath BLOB NOT NULL,
+    path BLOB NOT NULL,
+    PRIMARY KEY (toppath, path)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY,
+    paths BLOB NOT NULL UNIQUE
+);
+"""
+
+
+def _history_key(paths: Sequence[PathBytes]) -> bytes:
+    """Encode a directory's paths as a single key. Paths never contain
+    NUL bytes, so it makes for an unambiguous separator.
+    """
+    return b"\0".join(paths)
+
 
-@dataclass
 class ImportState:
     """Representing the progress of an import task.
 
-    Opens the state file on creation of the class. If you want
-    to ensure the state is written to disk, you should use the
-    context manager protocol.
+    The state lives in a small SQLite database at the state file path,
+    so lookups are indexed and updates only write the rows that change.
+    A legacy pickled state file found at the same path is migrated on
+    first use and kept next to it with a ``.bak`` suffix.
+
+    Each update is committed on its own. Use the context manager
+    protocol to batch several updates in a single transaction. One
+    instance may be shared between threads.
 
     Tagprogress allows long tagging tasks to be resumed when they pause.
 
@@ -39,27 +65,31 @@ class ImportState:
     -----
     ```
     # Readonly
-    progress = ImportState().tagprogress
+    has_progress = ImportState().progress_has(toppath)
 
-    # Read and write
+    # Batched writes
     with ImportState() as state:
-        state["key"] = "value"
+        state.history_add(paths)
+        state.progress_add(toppath, *paths)
     ```
     """
 
-    tagprogress: dict[PathBytes, list[PathBytes]]
-    taghistory: set[tuple[PathBytes, ...]]
     path: PathBytes
 
     def __init__(
         self, readonly: bool = False, path: PathBytes | None = None
     ) -> None:
         self.path = path or os.fsencode(config["statefile"].as_filename())
-        self.tagprogress = {}
-        self.taghistory = set()
-        self._open()
+        self._lock = threading.RLock()
+        self._depth = 0
+        legacy = self._read_legacy()
+        self._conn = self._connect()
+        if legacy:
+            self._migrate(legacy)
 
     def __enter__(self) -> Self:
+        self._lock.acquire()
+        self._depth += 1
         return self
 
     def __exit__(
@@ -68,35 +98,88 @@ class ImportState:
         exc_val: BaseException | None,
         exc_tb: TracebackType | None,
     ) -> None:
-        self._save()
+        try:
+            self._depth -= 1
+            if not self._depth:
+                self._save()
+        finally:
+            self._lock.release()
 
-    def _open(self) -> None:
+    def _connect(self) -> sqlite3.Connection:
+        try:
+            conn = sqlite3.connect(
+                os.fsdecode(self.path), timeout=30, check_same_thread=False
+            )
+            conn.executescript(SCHEMA)
+        except sqlite3.Error as exc:
+            log.error("state file could not be opened: {}", exc)
+            conn = sqlite3.connect(":memory:", check_same_thread=False)
+            conn.executescript(SCHEMA)
+        return conn
+
+    def _migrate(self, legacy: dict[str, Any]) -> None:
+        """Copy the contents of a pickled state into the database."""
+        with self:
+            for toppath, paths in legacy.get("tagprogress", {}).items():
+                self.progress_add(toppath, *paths)
+            for paths in legacy.get("taghistory", set()):
+                self.history_add(paths)
+
+    def _read_legacy(self) -> dict[str, Any] | None:
+        """Read a pickled state file and move it out of the way of the
+        database, or return None if there is none.
+        """
         try:
             with open(self.path, "rb") as f:
+                if f.read(len(SQLITE_HEADER)) in (SQLITE_HEADER, b""):
+                    return None
+                f.seek(0)
                 state = pickle.load(f)
-                # Read the states
-                self.tagprogress = state.get("tagprogress", {})
-                self.taghistory = state.get("taghistory", set())
+        except FileNotFoundError:
+            return None
         except Exception as exc:
             # The `pickle` module can emit all sorts of exceptions during
             # unpickling, including ImportError. We use a catch-all
             # exception to avoid enumerating them all (the docs don't even have a
             # full list!).
             log.debug("state file could not be read: {}", exc)
+            state = None
 
-    def _save(self) -> None:
         try:
-            with open(self.path, "wb") as f:
-                pickle.dump(
-                    {
-                        "tagprogress": self.tagprogress,
-                        "taghistory": self.taghistory,
-                    },
-                    f,
-                )
+            os.replace(self.path, self.path + b".bak")
         except OSError as exc:
+            log.error("state file could not be moved: {}", exc)
+        return state if isinstance(state, dict) else None
+
+    def _save(self) -> None:
+        try:
+            self._conn.commit()
+        except sqlite3.Error as exc:
             log.error("state file could not be written: {}", exc)
 
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    @property
+    def tagprogress(self) -> dict[PathBytes, list[PathBytes]]:
+        """A snapshot of all the recorded progress."""
+        progress: dict[PathBytes, list[PathBytes]] = {}
+        with self:
+            for toppath, path in self._conn.execute(
+                "SELECT toppath, path FROM progress ORDER BY toppath, path"
+            ):
+                progress.setdefault(toppath, []).append(path)
+        return progress
+
+    @property
+    def taghistory(self) -> set[tuple[PathBytes, ...]]:
+        """A snapshot of all the recorded history."""
+        with self:
+            rows = self._conn.execute("SELECT paths FROM history").fetchall()
+        return {tuple(key.split(b"\0")) if key else () for (key,) in rows}
+
     # -------------------------------- Tagprogress ------------------------------- #
 
     def progress_add(self, toppath: PathBytes, *paths: PathBytes) -> None:
@@ -104,34 +187,65 @@ class ImportState:
         under `toppath`.
         """
         with self as state:
-            imported = state.tagprogress.setdefault(toppath, [])
-            for path in paths:
-                if imported and imported[-1] <= path:
-                    imported.append(path)
-                else:
-                    insort(imported, path)
+            state._conn.executemany(
+                "INSERT OR IGNORE INTO progress (toppath, path) VALUES (?, ?)",
+                [(toppath, path) for path in paths],
+            )
 
     def progress_has_element(self, toppath: PathBytes, path: PathBytes) -> bool:
         """Return whether `path` has been imported in `toppath`."""
-        imported = self.tagprogress.get(toppath, [])
-        i = bisect_left(imported, path)
-        return i != len(imported) and imported[i] == path
+        with self as state:
+            row = state._conn.execute(
+                "SELECT 1 FROM progress WHERE toppath = ? AND path = ?",
+                (toppath, path),
+            ).fetchone()
+        return row is not None
 
     def progress_has(self, toppath: PathBytes) -> bool:
         """Return `True` if there exist paths that have already been
         imported under `toppath`.
         """
-        return toppath in self.tagprogress
+        with self as state:
+            row = state._conn.execute(
+                "SELECT 1 FROM progress WHERE toppath = ? LIMIT 1", (toppath,)
+            ).fetchone()
+        return row is not None
 
     def progress_reset(self, toppath: PathBytes | None) -> None:
         """Reset the progress for `toppath`."""
         with self as state:
-            if toppath in state.tagprogress:
-                del state.tagprogress[toppath]
+            state._conn.execute(
+                "DELETE FROM progress WHERE toppath = ?", (toppath,)
+            )
 
     # -------------------------------- Taghistory -------------------------------- #
 
-    def history_add(self, paths: list[PathBytes]) -> None:
+    def history_add(self, paths: Sequence[PathBytes]) -> None:
         """Add the paths to the history."""
         with self as state:
-            state.taghistory.add(tuple(paths))
+            state._conn.execute(
+                "INSERT OR IGNORE INTO history (paths) VALUES (?)",
+                (_history_key(paths),),
+            )
+
+    def history_mark(self) -> int:
+        """Return a marker for the current end of the history."""
+        with self as state:
+            (mark,) = state._conn.execute(
+                "SELECT COALESCE(MAX(id), 0) FROM history"
+            ).fetchone()
+        return mark
+
+    def history_has(
+        self, paths: Sequence[PathBytes], mark: int | None = None
+    ) -> bool:
+        """Return whether the paths have been recorded in the history.
+
+        If `mark` is given, ignore the paths added after
+        :meth:`history_mark` returned it.
+        """
+        with self as state:
+            row = state._conn.execute(
+                "SELECT id FROM history WHERE paths = ?", (_history_key(paths),)
+            ).fetchone()
+        return row is not None and (mark is None or row[0] <= mark)
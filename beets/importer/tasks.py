@@ -5,8 +5,9 @@ import os
 import re
 import shutil
 import time
-from collections import defaultdict
+from collections import defaultdict, deque
 from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 from functools import cached_property
 from tempfile import mkdtemp
 from typing import TYPE_CHECKING, Any, AnyStr
@@ -15,19 +16,21 @@ import mediafile
 
 from beets import config, library, plugins, util
 from beets.autotag import AlbumMatch, Source, tag_album, tag_item
+from beets.autotag.distance import string_dist_cache
 from beets.dbcore.query import PathQuery
 from beets.util import extension
 from beets.util.extension import remux_mpeglayer3_wav
+from beets.util.manifest import DirectoryManifest
 
 from .actions import Action, DuplicateAction
-from .state import ImportState
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable, Mapping, Sequence
+    from collections.abc import Iterable, Iterator, Mapping, Sequence
 
     from beets.autotag import Recommendation, TrackMatch
 
     from .session import ImportSession
+    from .state import ImportState
 
 # Global logger.
 log = logging.getLogger("beets")
@@ -287,16 +290,16 @@ class ImportTask(BaseImportTask):
             self.choice_flag = Action.APPLY  # Implicit choice.
             self.match = choice  # type: ignore[assignment]
 
-    def save_progress(self) -> None:
+    def save_progress(self, state: ImportState) -> None:
         """Updates the progress state to indicate that this album has
         finished.
         """
         if self.toppath:
-            ImportState().progress_add(self.toppath, *self.paths)
+            state.progress_add(self.toppath, *self.paths)
 
-    def save_history(self) -> None:
+    def save_history(self, state: ImportState) -> None:
         """Save the directory in the history for incremental imports."""
-        ImportState().history_add(self.paths)
+        state.history_add(self.paths)
 
     # Logical decisions.
 
@@ -456,9 +459,10 @@ class ImportTask(BaseImportTask):
                 # Partial overlap: keep the album together by moving the
                 # kept new items onto the surviving old album, rather than
                 # leaving them split across two Album rows.
-                for item in self.imported_items():
+                items = self.imported_items()
+                for item in items:
                     item.album_id = old_album.id
-                    item.store()
+                lib.store_many(items)
                 self.album.remove(with_items=False)
                 self.album = old_album
                 grafted = True
@@ -482,21 +486,18 @@ class ImportTask(BaseImportTask):
             self.album.set_parse(field, format(self.album, value))
             for item in items:
                 item.set_parse(field, format(item, value))
-        with lib.transaction():
-            for item in items:
-                item.store()
-            self.album.store()
+        lib.store_many([*items, self.album])
 
     def finalize(self, session: ImportSession) -> None:
         """Save progress, clean up files, and emit plugin event."""
         # Update progress.
         if session.want_resume:
-            self.save_progress()
+            self.save_progress(session.state)
         if session.config["incremental"] and not (
             # Should we skip recording to incremental list?
             self.skip and session.config["incremental_skip_later"]
         ):
-            self.save_history()
+            self.save_history(session.state)
 
         self.cleanup(
             copy=session.config["copy"].get(bool),
@@ -555,9 +556,11 @@ class ImportTask(BaseImportTask):
         If User-specified ``search_ids`` list is not empty, the lookup is
         restricted to only those IDs.
         """
-        self.candidates, self.rec = tag_album(
-            self.source, search_ids=search_ids
-        )
+        # The task's strings are compared to those of every candidate.
+        with string_dist_cache():
+            self.candidates, self.rec = tag_album(
+                self.source, search_ids=search_ids
+            )
 
     def find_duplicates(self, lib: library.Library) -> list[library.Album]:
         """Return a list of albums from `lib` with the same artist and
@@ -678,9 +681,7 @@ class ImportTask(BaseImportTask):
             if write and (self.apply or self.choice_flag == Action.RETAG):
                 item.try_write()
 
-        with session.lib.transaction():
-            for item in self.imported_items():
-                item.store()
+        session.lib.store_many(self.imported_items())
 
         plugins.send("import_task_files", session=session, task=self)
 
@@ -893,7 +894,10 @@ class SingletonImportTask(ImportTask):
             plugins.send("item_imported", lib=lib, item=item)
 
     def lookup_candidates(self, search_ids: list[str]) -> None:
-        self.candidates, self.rec = tag_item(self.source, search_ids=search_ids)
+        with string_dist_cache():
+            self.candidates, self.rec = tag_item(
+                self.source, search_ids=search_ids
+            )
 
     def find_duplicates(self, lib: library.Library) -> list[library.Item]:  # type: ignore[override] # Need splitting Singleton and Album tasks into separate classes
         """Return a list of items from `lib` that have the same artist
@@ -1013,16 +1017,16 @@ class SentinelImportTask(ImportTask):
         self.is_album = True
         self.choice_flag = None
 
-    def save_history(self) -> None:
+    def save_history(self, state: ImportState) -> None:
         pass
 
-    def save_progress(self) -> None:
+    def save_progress(self, state: ImportState) -> None:
         if not self.paths:
             # "Done" sentinel.
-            ImportState().progress_reset(self.toppath)
+            state.progress_reset(self.toppath)
         elif self.toppath:
             # "Directory progress" sentinel for singletons
-            super().save_progress()
+            super().save_progress(state)
 
     @property
     def skip(self) -> bool:
@@ -1201,7 +1205,10 @@ class ImportTaskFactory:
         self.session = session
         self.skipped = 0  # Skipped due to incremental/resume.
         self.imported = 0  # "Real" tasks created.
+        self.read = 0  # Files whose tags were read.
+        self.prefetched = 0  # Files read on the worker pool.
         self.is_archive = ArchiveImportTask.is_archive(util.syspath(toppath))
+        self._pending: dict[util.PathBytes, Future[library.Item | None]] = {}
 
     def tasks(self) -> Iterable[ImportTask]:
         """Yield all import tasks for music found in the user-specified
@@ -1224,7 +1231,7 @@ class ImportTaskFactory:
                 return
 
         # Search for music in the directory.
-        for dirs, paths in self.paths():
+        for dirs, paths in self._prefetch(self.paths()):
             if self.session.config["singletons"]:
                 for path in paths:
                     tasks = self._create(self.singleton(path))
@@ -1276,6 +1283,69 @@ class ImportTaskFactory:
             for dirs, paths in albums_in_dir(self.toppath):
                 yield dirs, paths
 
+    def _prefetch(
+        self,
+        albums: Iterable[tuple[list[util.PathBytes], list[util.PathBytes]]],
+    ) -> Iterator[tuple[list[util.PathBytes], list[util.PathBytes]]]:
+        """Yield the `(dirs, files)` pairs from `albums` in order, while
+        reading the tags of the files of the next few pairs on a pool of
+        worker threads.
+
+        The number of workers is set by the ``import.threads.read``
+        option. With a single worker, or when threading is disabled,
+        files are read lazily on the calling thread instead.
+        """
+        workers = self.session.config["threads"]["read"].get(int)
+        if workers <= 1 or not config["threaded"]:
+            yield from albums
+            return
+
+        singletons = self.session.config["singletons"]
+        ahead: deque[tuple[list[util.PathBytes], list[util.PathBytes]]]
+        ahead = deque()
+        albums = iter(albums)
+        pool = ThreadPoolExecutor(workers, thread_name_prefix="import-read")
+        try:
+            while True:
+                # Keep enough albums in flight to let every worker
+                # read ahead of the consumer.
+                while len(ahead) < workers * 2:
+                    if (album := next(albums, None)) is None:
+                        break
+                    dirs, paths = album
+                    if not singletons and self.session.already_imported(
+                        self.toppath, dirs
+                    ):
+                        paths = []
+                    for path in paths:
+                        if not (
+                            singletons
+                            and self.session.already_imported(
+                                self.toppath, [path]
+                            )
+                        ):
+                            self._pending[path] = pool.submit(
+                                self.read_item, path
+                            )
+                    ahead.append(album)
+
+                if not ahead:
+                    break
+                yield ahead.popleft()
+        finally:
+            pool.shutdown(cancel_futures=True)
+            self._pending.clear()
+
+    def _read(self, path: util.PathBytes) -> library.Item | None:
+        """Return the item read from the path, using the result of a
+        prefetch if there is one.
+        """
+        self.read += 1
+        if future := self._pending.pop(path, None):
+            self.prefetched += 1
+            return future.result()
+        return self.read_item(path)
+
     def singleton(self, path: util.PathBytes) -> SingletonImportTask | None:
         """Return a `SingletonImportTask` for the music file."""
         if self.session.already_imported(self.toppath, [path]):
@@ -1286,7 +1356,7 @@ class ImportTaskFactory:
             self.skipped += 1
             return None
 
-        item = self.read_item(path)
+        item = self._read(path)
         if item:
             return SingletonImportTask(self.toppath, item)
         return None
@@ -1308,7 +1378,7 @@ class ImportTaskFactory:
             return None
 
         items: list[library.Item] = [
-            item for item in map(self.read_item, paths) if item
+            item for item in map(self._read, paths) if item
         ]
 
         if len(items) > 0:
@@ -1425,6 +1495,11 @@ def albums_in_dir(path: AnyStr) -> Iterable[tuple[list[AnyStr], list[AnyStr]]]:
     else:
         ignore = list(map(os.fsencode, _ignore))
     ignore_hidden: bool = config["ignore_hidden"].get(bool)
+    manifest = (
+        DirectoryManifest.shared()
+        if config["dir_manifest"]["enabled"].get(bool)
+        else None
+    )
 
     patterns = (
         MULTIDISC_PATTERNS
@@ -1439,7 +1514,11 @@ def albums_in_dir(path: AnyStr) -> Iterable[tuple[list[AnyStr], list[AnyStr]]]:
         )
 
     for root, dirs, files in util.sorted_walk(
-        path, ignore=ignore, ignore_hidden=ignore_hidden, logger=log
+        path,
+        ignore=ignore,
+        ignore_hidden=ignore_hidden,
+        logger=log,
+        manifest=manifest,
     ):
         items = [os.path.join(root, f) for f in files]
         # If we're currently collapsing the constituent directories in a
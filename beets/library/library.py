@@ -9,7 +9,7 @@ from typing import TYPE_CHECKING, TypeVar
 import platformdirs
 
 import beets
-from beets import config, context, dbcore
+from beets import config, context, dbcore, plugins
 from beets.dbcore.query import Query
 from beets.dbcore.sort import NullSort
 from beets.exceptions import UserError
@@ -17,11 +17,11 @@ from beets.util import normpath
 from beets.util.pathformats import get_path_formats
 
 from . import migrations
-from .models import Album, Item
+from .models import Album, CompiledPathFormats, Item, UniqueDisambiguators
 from .queries import parse_query_parts, parse_query_string
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator, Sequence
+    from collections.abc import Iterable, Iterator, Sequence
 
     from beets.dbcore.sort import Sort
     from beets.util import PathLike, Replacements
@@ -56,6 +56,56 @@ class Library(dbcore.Database):
     def path_formats(self) -> list[PathFormat]:
         return get_path_formats(config["paths"])
 
+    def compiled_path_formats(
+        self, path_formats: Sequence[PathFormat] | None = None
+    ) -> CompiledPathFormats:
+        """Return the given path formats, or the library's, compiled for
+        computing destinations.
+
+        Each distinct list of path formats is only compiled once.
+        """
+        key = tuple(path_formats or self.path_formats)
+        if (compiled := self._compiled_path_formats.get(key)) is None:
+            compiled = CompiledPathFormats(self, key)
+            self._compiled_path_formats[key] = compiled
+        return compiled
+
+    def unique_disambiguators(
+        self,
+        model_cls: type[LibModel],
+        keys: Sequence[str],
+        disam: Sequence[str],
+    ) -> UniqueDisambiguators | None:
+        """Return the ``%aunique`` or ``%sunique`` disambiguation strings
+        of all the albums or items, computed on first use.
+
+        They are kept until an object is added, removed, or stored with
+        different keys. Return None if they cannot be computed for these
+        keys.
+        """
+        key = (model_cls, tuple(keys), tuple(disam))
+        if key not in self._unique_disambiguators:
+            self._unique_disambiguators[key] = UniqueDisambiguators.compute(
+                self, model_cls, keys, disam
+            )
+        return self._unique_disambiguators[key]
+
+    def _expire_disambiguators(
+        self, objs: Sequence[LibModel], removed: bool = False
+    ) -> None:
+        """Drop the disambiguation strings that the changes to the
+        objects may have made out of date, along with the memoized
+        template values that used them.
+        """
+        for key, table in list(self._unique_disambiguators.items()):
+            model_cls = key[0]
+            if table is not None and any(
+                isinstance(obj, model_cls) and (removed or table.is_stale(obj))
+                for obj in objs
+            ):
+                self._unique_disambiguators.pop(key, None)
+                self._memotable = {}
+
     @staticmethod
     def get_replacements() -> Replacements:
         """Build regex/string replacement pairs from config."""
@@ -80,10 +130,21 @@ class Library(dbcore.Database):
         if set_music_dir:
             context.set_music_dir(self.directory)
 
-        super().__init__(path, timeout=beets.config["timeout"].as_number())
+        super().__init__(
+            path,
+            timeout=beets.config["timeout"].as_number(),
+            concurrent=beets.config["wal"].get(bool),
+        )
 
         self.replacements = self.get_replacements()
         self._memotable = {}
+        self._compiled_path_formats: dict[
+            tuple[PathFormat, ...], CompiledPathFormats
+        ] = {}
+        self._unique_disambiguators: dict[
+            tuple[type[LibModel], tuple[str, ...], tuple[str, ...]],
+            UniqueDisambiguators | None,
+        ] = {}
 
     @contextmanager
     def music_dir_context(self) -> Iterator[Library]:
@@ -130,6 +191,34 @@ class Library(dbcore.Database):
 
         return album
 
+    def store_many(
+        self, objs: Iterable[LibModel], fields: Iterable[str] | None = None
+    ) -> None:
+        """Save several :class:`Item` and :class:`Album` objects to the
+        library database.
+
+        This has the effect of calling ``store(fields)`` on each object,
+        including albums passing their changes on to their items, but
+        writes them in a single transaction, with batched statements,
+        and sends a single ``database_change`` event for all of them.
+        """
+        objs = list(objs)
+        items = [
+            item
+            for obj in objs
+            if isinstance(obj, Album)
+            for item in obj._inherit_to_items()
+        ]
+        with self.transaction():
+            self._store_models(objs, fields)
+            self._store_models(items)
+
+        if changed := [*objs, *items]:
+            self._expire_disambiguators(changed)
+            plugins.send(
+                "database_change", lib=self, model=changed[0], models=changed
+            )
+
     # Querying.
 
     def _fetch(
@@ -137,11 +226,15 @@ class Library(dbcore.Database):
         model_cls: type[LM],
         query: str | Sequence[str] | Query | None = None,
         sort: Sort | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+        after: dbcore.Cursor | None = None,
     ) -> dbcore.Results[LM]:
         """Parse a query and fetch.
 
         If an order specification is present in the query string
-        the `sort` argument is ignored.
+        the `sort` argument is ignored. `limit`, `offset` and `after`
+        paginate the results, see `Database._get_results`.
         """
         # Parse the query, if necessary.
         parsed_sort = None
@@ -168,7 +261,9 @@ class Library(dbcore.Database):
         if parsed_sort and not isinstance(parsed_sort, NullSort):
             sort = parsed_sort
 
-        return super()._get_results(model_cls, parsed_query, sort)
+        return super()._get_results(
+            model_cls, parsed_query, sort, limit, offset, after
+        )
 
     @staticmethod
     def get_default_album_sort() -> Sort:
@@ -188,17 +283,45 @@ class Library(dbcore.Database):
         self,
         query: str | Sequence[str] | Query | None = None,
         sort: Sort | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+        after: dbcore.Cursor | None = None,
     ) -> dbcore.Results[Album]:
-        """Get :class:`Album` objects matching the query."""
-        return self._fetch(Album, query, sort or self.get_default_album_sort())
+        """Get :class:`Album` objects matching the query.
+
+        Pass `limit` and `offset`, or the :attr:`~dbcore.Results.cursor`
+        of the previous page as `after`, to fetch a page of the results.
+        """
+        return self._fetch(
+            Album,
+            query,
+            sort or self.get_default_album_sort(),
+            limit,
+            offset,
+            after,
+        )
 
     def items(
         self,
         query: str | Sequence[str] | Query | None = None,
         sort: Sort | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+        after: dbcore.Cursor | None = None,
     ) -> dbcore.Results[Item]:
-        """Get :class:`Item` objects matching the query."""
-        return self._fetch(Item, query, sort or self.get_default_item_sort())
+        """Get :class:`Item` objects matching the query.
+
+        Pass `limit` and `offset`, or the :attr:`~dbcore.Results.cursor`
+        of the previous page as `after`, to fetch a page of the results.
+        """
+        return self._fetch(
+            Item,
+            query,
+            sort or self.get_default_item_sort(),
+            limit,
+            offset,
+            after,
+        )
 
     # Convenience accessors.
     def get_item(self, id_: int) -> Item | None:
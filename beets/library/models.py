@@ -26,6 +26,7 @@ from beets.util import (
     syspath,
 )
 from beets.util.deprecation import maybe_replace_legacy_field
+from beets.util.functemplate import get_template
 from beets.util.pathformats import PF_KEY_DEFAULT
 
 from .exceptions import FileOperationError, ReadError, WriteError
@@ -33,11 +34,19 @@ from .fields import TYPE_BY_FIELD
 from .queries import parse_query_string
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Iterable, Iterator, KeysView, Mapping
+    from collections.abc import (
+        Callable,
+        Iterable,
+        Iterator,
+        KeysView,
+        Mapping,
+        Sequence,
+    )
 
     from beets.dbcore import Results
-    from beets.dbcore.query import FieldQuery, FieldQueryType
+    from beets.dbcore.query import FieldQuery, FieldQueryType, SQLiteType
     from beets.dbcore.sort import FieldSort
+    from beets.util.functemplate import Template
     from beets.util.pathformats import PathFormat
 
     from .library import Library
@@ -89,11 +98,19 @@ class LibModel(dbcore.Model["Library"]):
 
     def store(self, fields: Iterable[str] | None = None) -> None:
         super().store(fields)
-        plugins.send("database_change", lib=self.db, model=self)
+        self._database_changed()
 
     def remove(self) -> None:
         super().remove()
-        plugins.send("database_change", lib=self.db, model=self)
+        self._database_changed(removed=True)
+
+    def _database_changed(self, removed: bool = False) -> None:
+        """Drop the library's values computed from the stored model and
+        send the `database_change` event.
+        """
+        if isinstance(self.db, beets.library.Library):
+            self.db._expire_disambiguators([self], removed)
+        plugins.send("database_change", lib=self.db, model=self, models=[self])
 
     def add(self, lib: Library | None = None) -> None:
         # super().add() calls self.store(), which sends `database_change`,
@@ -331,6 +348,10 @@ class Album(LibModel):
 
     _format_config_key = "format_album"
 
+    @cached_classproperty
+    def _indexed_flex_fields(cls) -> set[str]:
+        return set(beets.config["indexed_fields"]["album"].as_str_seq())
+
     @cached_classproperty
     def _relation(cls) -> type[Item]:
         return Item
@@ -600,33 +621,40 @@ class Album(LibModel):
         This applies to fixed attributes as well as flexible ones. The `id`
         attribute of the album will never be inherited.
         """
+        items = self._inherit_to_items() if inherit else []
+        with self.db.transaction():
+            super().store(fields)
+            if items:
+                self.db.store_many(items)
+
+    def _inherit_to_items(self) -> list[Item]:
+        """Apply the album's modified attributes to its tracks and return
+        the tracks that need to be stored.
+        """
         # Get modified track fields.
         track_updates = {}
         track_deletes = set()
         for key in self._dirty:
-            if inherit:
-                if key in self.item_keys:  # is an inheritable fixed attribute
-                    track_updates[key] = self[key]
-                elif key in self._fields:  # excluded fixed attr (artpath, id)
-                    continue
-                elif key not in self:  # is a removed flexible attribute
-                    track_deletes.add(key)
-                else:  # is a flexible attribute
-                    track_updates[key] = self[key]
+            if key in self.item_keys:  # is an inheritable fixed attribute
+                track_updates[key] = self[key]
+            elif key in self._fields:  # excluded fixed attr (artpath, id)
+                continue
+            elif key not in self:  # is a removed flexible attribute
+                track_deletes.add(key)
+            else:  # is a flexible attribute
+                track_updates[key] = self[key]
 
-        with self.db.transaction():
-            super().store(fields)
-            if track_updates:
-                for item in self.items():
-                    for key, value in track_updates.items():
-                        item[key] = value
-                    item.store()
-            if track_deletes:
-                for item in self.items():
-                    for key in track_deletes:
-                        if key in item:
-                            del item[key]
-                    item.store()
+        if not track_updates and not track_deletes:
+            return []
+
+        items = list(self.items())
+        for item in items:
+            for key, value in track_updates.items():
+                item[key] = value
+            for key in track_deletes:
+                if key in item:
+                    del item[key]
+        return items
 
     def try_sync(self, write: bool, move: bool, inherit: bool = True) -> None:
         """Synchronize the album and its items with the database.
@@ -744,6 +772,10 @@ class Item(LibModel):
 
     _format_config_key = "format_item"
 
+    @cached_classproperty
+    def _indexed_flex_fields(cls) -> set[str]:
+        return set(beets.config["indexed_fields"]["item"].as_str_seq())
+
     # Cached album object. Read-only.
     __album: Album | None = None
 
@@ -783,6 +815,43 @@ class Item(LibModel):
     def _cached_album(self, album: Album | None) -> None:
         self.__album = album
 
+    @classmethod
+    def flex_value_sql(
+        cls, key: str, entity_id: str | None = None
+    ) -> str | None:
+        """Return an SQL expression for the raw value of flexible attribute
+        `key`, falling back to the album's attribute like `get` does.
+        """
+        item_sql = super().flex_value_sql(key, entity_id)
+        if item_sql is None or key in Album._getters():
+            return None
+        album_sql = Album.flex_value_sql(key, f"{cls._table}.album_id")
+        return f"COALESCE({item_sql}, {album_sql})"
+
+    @classmethod
+    def flex_match_sql(
+        cls,
+        key: str,
+        condition: str,
+        subvals: Sequence[SQLiteType],
+        entity_id: str | None = None,
+    ) -> tuple[str, Sequence[SQLiteType]]:
+        """Return an SQL clause selecting the items whose flexible attribute
+        `key` satisfies `condition`, falling back to the album's attribute
+        for items that lack it, like `get` does.
+        """
+        item_clause, item_subvals = super().flex_match_sql(
+            key, condition, subvals, entity_id
+        )
+        has_key_clause, _ = super().flex_match_sql(key, "1", (), entity_id)
+        album_clause, album_subvals = Album.flex_match_sql(
+            key, condition, subvals, f"{cls._table}.album_id"
+        )
+        return (
+            f"{item_clause} OR ({album_clause} AND NOT {has_key_clause})",
+            [*item_subvals, *album_subvals],
+        )
+
     @classmethod
     def _getters(cls) -> dict[str, Callable[[Self], object]]:
         return {
@@ -1005,7 +1074,11 @@ class Item(LibModel):
             return False
 
     def try_sync(
-        self, write: bool, move: bool, with_album: bool = True
+        self,
+        write: bool,
+        move: bool,
+        with_album: bool = True,
+        store: bool = True,
     ) -> None:
         """Synchronize the item with the database and, possibly, update its
         tags on disk and its path (by moving the file).
@@ -1013,7 +1086,9 @@ class Item(LibModel):
         `write` indicates whether to write new tags into the file. Similarly,
         `move` controls whether the path should be updated. In the
         latter case, files are *only* moved when they are inside their
-        library's directory (if any).
+        library's directory (if any). If `store` is false, storing the item
+        is left to the caller, for example to store many items at once with
+        :meth:`Library.store_many`.
 
         Similar to calling :meth:`write`, :meth:`move`, and :meth:`store`
         (conditionally).
@@ -1025,7 +1100,8 @@ class Item(LibModel):
             if self._db and self._db.directory in util.ancestry(self.path):
                 log.debug("moving {.filepath} to synchronize path", self)
                 self.move(with_album=with_album)
-        self.store()
+        if store:
+            self.store()
 
     # Files themselves.
 
@@ -1231,25 +1307,10 @@ class Item(LibModel):
         base directory.
         """
         basedir = basedir or self.db.directory
-        path_formats = path_formats or self.db.path_formats
+        compiled = self.db.compiled_path_formats(path_formats)
 
-        for query_str, path_format in path_formats:
-            if query_str == PF_KEY_DEFAULT:
-                continue
-            query, _ = parse_query_string(query_str, type(self))
-            if query.match(self):
-                # The query matches the item! Use the corresponding path
-                # format.
-                break
-        else:
-            # No query matched; fall back to default.
-            for query_str, path_format in path_formats:
-                if query_str == PF_KEY_DEFAULT:
-                    break
-            else:
-                assert False, "no default path format"
-        # Evaluate the selected template.
-        subpath = self.evaluate_template(path_format, for_path=True)
+        # Evaluate the template of the first path format that matches.
+        subpath = compiled.evaluate(self, compiled.template_for(self))
 
         if beets.config["asciify_paths"]:
             subpath = util.asciify_path(subpath)
@@ -1274,6 +1335,180 @@ class Item(LibModel):
         return normpath(os.path.join(basedir, lib_path_bytes))
 
 
+class CompiledPathFormats:
+    """A library's path formats, prepared for computing the destination
+    of many items.
+
+    The query of each path format is parsed and its template compiled
+    only once, and the template functions of plugins are collected only
+    once, rather than for every item.
+    """
+
+    def __init__(
+        self, lib: Library, path_formats: Sequence[PathFormat]
+    ) -> None:
+        self.lib = lib
+        self.formats: list[tuple[dbcore.Query, Template]] = []
+        self.default: Template | None = None
+        for query_str, path_format in path_formats:
+            if query_str == PF_KEY_DEFAULT:
+                self.default = self.default or get_template(path_format)
+            else:
+                query, _ = parse_query_string(query_str, Item)
+                self.formats.append((query, get_template(path_format)))
+        self.plugin_funcs = plugins.template_funcs()
+
+    def template_for(self, item: Item) -> Template:
+        """Return the template of the first path format whose query
+        matches the item, or the default one.
+        """
+        for query, template in self.formats:
+            if query.match(item):
+                return template
+
+        assert self.default is not None, "no default path format"
+        return self.default
+
+    def evaluate(self, item: Item, template: Template) -> str:
+        """Evaluate the template for the item, binding only the
+        template functions it calls.
+        """
+        defaults = DefaultTemplateFunctions(item, self.lib)
+        funcs: dict[str, Callable[..., str]] = {}
+        for name in template.funcnames:
+            if name in self.plugin_funcs:
+                funcs[name] = self.plugin_funcs[name]
+            elif func := getattr(defaults, f"{defaults._prefix}{name}", None):
+                funcs[name] = func
+
+        return template.substitute(item.formatted(for_path=True), funcs)
+
+
+class UniqueDisambiguators:
+    """The disambiguation strings of ``%aunique`` or ``%sunique`` for all
+    the albums or items of a library, for one set of keys and
+    disambiguators.
+
+    They are computed at once: a single query groups the objects by
+    their keys, and only the objects that share their keys with others
+    are loaded to find a disambiguator for their group. Like
+    ``%sunique``, they only cover the items that are singletons.
+
+    The keys of every object are kept, along with the disambiguator
+    values of the objects that share their keys, to tell whether
+    storing an object made the strings out of date.
+    """
+
+    def __init__(
+        self,
+        keys: Sequence[str],
+        keys_by_id: dict[int, tuple[Any, ...]],
+        values: dict[int, str],
+        disam: Sequence[str] = (),
+        disam_by_id: dict[int, tuple[Any, ...]] | None = None,
+    ) -> None:
+        self.keys = keys
+        self.keys_by_id = keys_by_id
+        self.values = values
+        self.disam = disam
+        self.disam_by_id = disam_by_id or {}
+
+    @classmethod
+    def compute(
+        cls,
+        lib: Library,
+        model_cls: type[LibModel],
+        keys: Sequence[str],
+        disam: Sequence[str],
+    ) -> UniqueDisambiguators | None:
+        """Compute the disambiguation strings of every object of the
+        model in the library.
+
+        Return None if the keys cannot be grouped by in the database,
+        like computed fields.
+        """
+        table = model_cls._table
+        exprs = []
+        for key in keys:
+            if key in model_cls._fields:
+                exprs.append(f"{table}.{key}")
+            elif (expr := model_cls.flex_value_sql(key)) is not None:
+                exprs.append(expr)
+            else:
+                return None
+        if not exprs:
+            return None
+
+        columns = ", ".join(exprs)
+        where = " WHERE album_id IS NULL" if model_cls is Item else ""
+        with lib.transaction() as tx:
+            rows = tx.query(
+                f"SELECT {columns}, group_concat({table}.id) "
+                f"FROM {table}{where} GROUP BY {columns}"
+            )
+
+        keys_by_id = {}
+        groups = []
+        for *values, ids in rows:
+            group = [int(i) for i in ids.split(",")]
+            keys_by_id.update(dict.fromkeys(group, tuple(values)))
+            if len(group) > 1:
+                groups.append(group)
+
+        # Load the objects that need a disambiguator, a chunk at a time
+        # to stay below SQLite's limit on query parameters.
+        ambiguous = [i for group in groups for i in group]
+        objs: dict[int, LibModel] = {}
+        for start in range(0, len(ambiguous), 500):
+            query = dbcore.query.InQuery("id", ambiguous[start : start + 500])
+            objs.update((o.id, o) for o in lib._fetch(model_cls, query))
+
+        values: dict[int, str] = {}
+        disam_by_id = {
+            obj_id: tuple(obj.get(d, "") for d in disam)
+            for obj_id, obj in objs.items()
+        }
+        for group in groups:
+            members = [objs[i] for i in group if i in objs]
+
+            # Find the first disambiguator that distinguishes the objects.
+            for disambiguator in disam:
+                disam_values = {o.get(disambiguator, "") for o in members}
+                if len(disam_values) == len(members):
+                    for obj in members:
+                        formatted = obj.formatted(for_path=True)
+                        values[obj.id] = formatted.get(disambiguator) or ""
+                    break
+            else:
+                # No disambiguator distinguished all objects.
+                values.update((obj.id, str(obj.id)) for obj in members)
+
+        return cls(keys, keys_by_id, values, disam, disam_by_id)
+
+    def get(self, obj_id: int) -> str | None:
+        """Return the disambiguation string of the object, which is
+        empty if it shares its keys with no other object, or None if
+        the object is unknown.
+        """
+        if obj_id not in self.keys_by_id:
+            return None
+        return self.values.get(obj_id, "")
+
+    def is_stale(self, obj: LibModel) -> bool:
+        """Whether storing the object may have changed the
+        disambiguation strings.
+        """
+        old_keys = self.keys_by_id.get(obj.id)  # type: ignore[arg-type]
+        if isinstance(obj, Item) and obj.album_id is not None:
+            return old_keys is not None
+        if old_keys != tuple(obj.get(key) for key in self.keys):
+            return True
+        old_disam = self.disam_by_id.get(obj.id)  # type: ignore[arg-type]
+        return old_disam is not None and old_disam != tuple(
+            obj.get(d, "") for d in self.disam
+        )
+
+
 def _int_arg(s: str) -> int:
     """Convert a string argument to an integer for use in a template
     function.
@@ -1408,6 +1643,12 @@ class DefaultTemplateFunctions:
         if memoval is not None:
             return memoval
 
+        precomputed = self._precomputed_unique(
+            "aunique", Album, keys, disam, bracket, album_id
+        )
+        if precomputed is not None:
+            return precomputed
+
         album: Album = self.lib.get_album(album_id)  # type: ignore[assignment]
 
         return self._tmpl_unique(
@@ -1449,6 +1690,13 @@ class DefaultTemplateFunctions:
         if item_id is None:
             return ""
 
+        if self.item.album_id is None:
+            precomputed = self._precomputed_unique(
+                "sunique", Item, keys, disam, bracket, item_id
+            )
+            if precomputed is not None:
+                return precomputed
+
         return self._tmpl_unique(
             "sunique",
             keys,
@@ -1472,6 +1720,47 @@ class DefaultTemplateFunctions:
         """
         return (name, keys, disam, item_id)
 
+    @staticmethod
+    def _tmpl_unique_args(
+        name: str, keys: str | None, disam: str | None, bracket: str | None
+    ) -> tuple[list[str], list[str], str, str]:
+        """Fill in the arguments of the unique template named "name"
+        from its configuration, and split them into lists of fields and
+        a pair of brackets.
+        """
+        keys = keys or beets.config[name]["keys"].as_str()
+        disam = disam or beets.config[name]["disambiguators"].as_str()
+        if bracket is None:
+            bracket = beets.config[name]["bracket"].as_str()
+
+        # Assign a left and right bracket or leave blank if argument is empty.
+        if len(bracket) == 2:
+            return keys.split(), disam.split(), bracket[0], bracket[1]
+        return keys.split(), disam.split(), "", ""
+
+    def _precomputed_unique(
+        self,
+        name: str,
+        model_cls: type[LibModel],
+        keys: str | None,
+        disam: str | None,
+        bracket: str | None,
+        obj_id: int,
+    ) -> str | None:
+        """Look the unique template's value up in the disambiguation
+        strings the library computed for all objects at once.
+
+        Return None if they do not cover this object.
+        """
+        assert self.lib is not None
+        keys_list, disam_list, bracket_l, bracket_r = self._tmpl_unique_args(
+            name, keys, disam, bracket
+        )
+        table = self.lib.unique_disambiguators(model_cls, keys_list, disam_list)
+        if table is None or (value := table.get(obj_id)) is None:
+            return None
+        return f" {bracket_l}{value}{bracket_r}" if value else ""
+
     def _tmpl_unique(
         self,
         name: str,
@@ -1515,20 +1804,9 @@ class DefaultTemplateFunctions:
             lib._memotable[memokey] = ""
             return ""
 
-        keys = keys or beets.config[name]["keys"].as_str()
-        disam = disam or beets.config[name]["disambiguators"].as_str()
-        if bracket is None:
-            bracket = beets.config[name]["bracket"].as_str()
-        keys_list = keys.split()
-        disam_list = disam.split()
-
-        # Assign a left and right bracket or leave blank if argument is empty.
-        if len(bracket) == 2:
-            bracket_l = bracket[0]
-            bracket_r = bracket[1]
-        else:
-            bracket_l = ""
-            bracket_r = ""
+        keys_list, disam_list, bracket_l, bracket_r = self._tmpl_unique_args(
+            name, keys, disam, bracket
+        )
 
         # Find matching items to disambiguate with.
         query = db_item.duplicates_query(keys_list)
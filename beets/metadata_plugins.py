@@ -8,12 +8,18 @@ implemented as plugins.
 from __future__ import annotations
 
 import abc
+import math
+import os
+import queue
 import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import time
 from contextlib import contextmanager
+from dataclasses import dataclass, replace
 from functools import cache, cached_property, wraps
 from typing import (
     TYPE_CHECKING,
+    Any,
     Generic,
     Literal,
     NamedTuple,
@@ -74,38 +80,189 @@ def maybe_handle_plugin_error(plugin: MetadataSourcePlugin, method_name: str):
             log.debug("Exception details:", exc_info=True)
 
 
+@dataclass
+class LookupStats:
+    """How long the lookups of a metadata source took."""
+
+    count: int = 0
+    total: float = 0.0
+    longest: float = 0.0
+    timeouts: int = 0
+
+    @property
+    def average(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def add(self, duration: float, timed_out: bool = False) -> None:
+        self.count += 1
+        self.total += duration
+        self.longest = max(self.longest, duration)
+        self.timeouts += timed_out
+
+
+_lookup_stats: dict[str, LookupStats] = {}
+_lookup_stats_lock = threading.Lock()
+
+
+def lookup_stats() -> dict[str, LookupStats]:
+    """Return the latency of the lookups of each metadata source since
+    the last :func:`reset_lookup_stats`, by data source name.
+    """
+    with _lookup_stats_lock:
+        return {name: replace(stats) for name, stats in _lookup_stats.items()}
+
+
+def reset_lookup_stats() -> None:
+    with _lookup_stats_lock:
+        _lookup_stats.clear()
+
+
+def _record_lookup(
+    plugin: MetadataSourcePlugin, duration: float, timed_out: bool = False
+) -> None:
+    with _lookup_stats_lock:
+        stats = _lookup_stats.setdefault(plugin.data_source, LookupStats())
+        stats.add(duration, timed_out)
+
+
+class _LookupPool:
+    """Run functions on a pool of daemon threads, started as needed up
+    to `max_workers`.
+
+    Unlike the workers of a ``ThreadPoolExecutor``, these are not joined
+    when the interpreter exits: a source that hangs past its lookup
+    timeout must not keep beets from exiting.
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max_workers
+        self._jobs: queue.SimpleQueue[
+            tuple[Callable[..., object], tuple[Any, ...], dict[str, Any]]
+        ] = queue.SimpleQueue()
+        self._idle = threading.Semaphore(0)
+        self._workers = 0
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[..., object], *args, **kwargs) -> None:
+        self._jobs.put((fn, args, kwargs))
+        if self._idle.acquire(blocking=False):
+            return
+        with self._lock:
+            if self._workers < self.max_workers:
+                self._workers += 1
+                threading.Thread(
+                    target=self._work,
+                    name=f"metadata_source_{self._workers}",
+                    daemon=True,
+                ).start()
+
+    def _work(self) -> None:
+        while True:
+            fn, args, kwargs = self._jobs.get()
+            try:
+                fn(*args, **kwargs)
+            except Exception:
+                log.debug("Exception in lookup worker:", exc_info=True)
+            self._idle.release()
+
+
+@cache
+def _executor() -> _LookupPool:
+    """Return the thread pool shared by the lookups of all sources."""
+    return _LookupPool(min(32, (os.cpu_count() or 1) + 4))
+
+
+def _lookup_timeout(plugin: MetadataSourcePlugin) -> float:
+    """Return how many seconds the source has to finish a lookup, or
+    infinity if it has no deadline.
+    """
+    try:
+        timeout = plugin.config["lookup_timeout"].as_number()
+    except (AttributeError, NotFoundError):
+        return math.inf
+    return timeout or math.inf
+
+
+class _Done(NamedTuple):
+    """Marks the end of the results of a source, and the error that
+    ended them, if any.
+    """
+
+    error: Exception | None = None
+
+
 def _yield_from_plugins(
     func: Callable[..., Iterable[Ret]],
 ) -> Callable[..., Iterator[Ret]]:
     method_name = func.__name__
 
-    def materialize(
-        plugin: MetadataSourcePlugin, method_name: str, *args, **kwargs
-    ) -> list[Ret]:
-        method = getattr(plugin, method_name)
-        return list(method(*args, **kwargs))
+    def stream(
+        plugin: MetadataSourcePlugin,
+        results: queue.Queue[tuple[MetadataSourcePlugin, Any]],
+        stopped: threading.Event,
+        *args,
+        **kwargs,
+    ) -> None:
+        """Pass on the results of the plugin method as it yields them."""
+        try:
+            for result in getattr(plugin, method_name)(*args, **kwargs):
+                if stopped.is_set():
+                    break
+                results.put((plugin, result))
+        except Exception as e:
+            results.put((plugin, _Done(e)))
+        else:
+            results.put((plugin, _Done()))
 
     @wraps(func)
     def wrapper(*args, **kwargs) -> Iterator[Ret]:
-        # Run plugin methods concurrently for faster I/O-bound lookups.
-        with ThreadPoolExecutor() as executor:
-            futures = {
-                executor.submit(
-                    # Evaluate iterator with list such that results are ready when
-                    # future.result() is called.
-                    materialize,
-                    plugin,
-                    method_name,
-                    *args,
-                    **kwargs,
-                ): plugin
-                for plugin in find_metadata_source_plugins()
-            }
+        # Run plugin methods concurrently for faster I/O-bound lookups, and
+        # hand on their results as they arrive.
+        results: queue.Queue[tuple[MetadataSourcePlugin, Any]] = queue.Queue()
+        stopped = threading.Event()
+        start = time.monotonic()
+        deadlines = {}
+        for plugin in find_metadata_source_plugins():
+            _executor().submit(
+                stream, plugin, results, stopped, *args, **kwargs
+            )
+            deadlines[plugin] = start + _lookup_timeout(plugin)
 
-            for future in as_completed(futures):
-                plugin = futures[future]
-                with maybe_handle_plugin_error(plugin, method_name):
-                    yield from filter(None, future.result())
+        try:
+            while deadlines:
+                timeout = min(deadlines.values()) - time.monotonic()
+                try:
+                    plugin, result = results.get(
+                        timeout=max(timeout, 0) if timeout < math.inf else None
+                    )
+                except queue.Empty:
+                    now = time.monotonic()
+                    for plugin, deadline in list(deadlines.items()):
+                        if deadline <= now:
+                            log.warning(
+                                "'{}.{}' timed out after {:.1f} seconds",
+                                plugin.data_source,
+                                method_name,
+                                now - start,
+                            )
+                            del deadlines[plugin]
+                            _record_lookup(plugin, now - start, timed_out=True)
+                    continue
+
+                if plugin not in deadlines:
+                    # The source ran out of time before.
+                    continue
+                if isinstance(result, _Done):
+                    del deadlines[plugin]
+                    _record_lookup(plugin, time.monotonic() - start)
+                    if result.error:
+                        with maybe_handle_plugin_error(plugin, method_name):
+                            raise result.error
+                elif result:
+                    yield result
+        finally:
+            # Let the sources that are still running stop early.
+            stopped.set()
 
     return wrapper
 
@@ -199,6 +356,7 @@ class MetadataSourcePlugin(BeetsPlugin, metaclass=abc.ABCMeta):
         self.config.add(
             {
                 "search_limit": 5,
+                "lookup_timeout": 0,
                 "data_source_mismatch_penalty": self.DEFAULT_DATA_SOURCE_MISMATCH_PENALTY,  # noqa: E501
             }
         )
@@ -112,8 +112,13 @@ def modify_items(lib, mods, dels, query, write, move, album, confirm, inherit):
 
     # Apply changes to database and files
     with lib.transaction():
-        for obj in changed:
-            obj.try_sync(write, move, inherit)
+        if album:
+            for obj in changed:
+                obj.try_sync(write, move, inherit)
+        else:
+            for obj in changed:
+                obj.try_sync(write, move, inherit, store=False)
+            lib.store_many(changed)
 
 
 def print_and_modify(obj, mods, dels):
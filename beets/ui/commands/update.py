@@ -3,10 +3,11 @@
 from __future__ import annotations
 
 import os
+from enum import Enum
 from typing import TYPE_CHECKING, Protocol
 
 from beets import library, logging, ui
-from beets.util import ancestry, syspath
+from beets.util import ancestry, par_imap, syspath
 from beets.util.color import colorize
 
 from .utils import do_query
@@ -23,17 +24,56 @@ class UpdateCLIOpts(Protocol):
     album: bool
     exclude_fields: list[str] | None
     fields: list[str] | None
+    jobs: int
     move: bool | None
     pretend: bool | None
 
 
-def update_items(lib, query, album, move, pretend, fields, exclude_fields=None):
+class FileState(Enum):
+    """The state of an item's file, as found by :func:`read_changes`."""
+
+    DELETED = "deleted"
+    UP_TO_DATE = "up to date"
+    READ = "read"
+    UNREADABLE = "unreadable"
+
+
+def read_changes(item: library.Item) -> FileState:
+    """Read the tags of the item's file into it if the file was modified
+    since the item was last stored.
+
+    A single ``stat`` call tells whether the file is still there and
+    whether it changed, so that unchanged files are never opened.
+    """
+    if not item.path:
+        return FileState.DELETED
+    try:
+        mtime = int(os.stat(syspath(item.path)).st_mtime)
+    except FileNotFoundError:
+        return FileState.DELETED
+
+    if mtime <= item.mtime:
+        return FileState.UP_TO_DATE
+
+    try:
+        item.read()
+    except library.ReadError as exc:
+        log.error("error reading {.filepath}: {}", item, exc)
+        return FileState.UNREADABLE
+    return FileState.READ
+
+
+def update_items(
+    lib, query, album, move, pretend, fields, exclude_fields=None, jobs=1
+):
     """For all the items matched by the query, update the library to
     reflect the item's embedded tags.
     :param fields: The fields to be stored. If not specified, all fields will
     be.
     :param exclude_fields: The fields to not be stored. If not specified, all
     fields will be.
+    :param jobs: The number of files to read at the same time. The changes
+    are still shown and stored in the order of the items.
     """
     with lib.transaction():
         items, _ = do_query(lib, query, album)
@@ -64,9 +104,10 @@ def update_items(lib, query, album, move, pretend, fields, exclude_fields=None):
 
         # Walk through the items and pick up their changes.
         affected_albums = set()
-        for item in items:
+        changed_items = []
+        for item, state in zip(items, par_imap(read_changes, items, jobs)):
             # Item deleted?
-            if not item.path or not os.path.exists(syspath(item.path)):
+            if state is FileState.DELETED:
                 ui.print_(format(item))
                 ui.print_(colorize("text_error", "  deleted"))
                 if not pretend:
@@ -75,18 +116,14 @@ def update_items(lib, query, album, move, pretend, fields, exclude_fields=None):
                 continue
 
             # Did the item change since last checked?
-            if item.current_mtime() <= item.mtime:
+            if state is FileState.UP_TO_DATE:
                 log.debug(
                     "skipping {0.filepath} because mtime is up to date ({0.mtime})",
                     item,
                 )
                 continue
 
-            # Read new data.
-            try:
-                item.read()
-            except library.ReadError as exc:
-                log.error("error reading {.filepath}: {}", item, exc)
+            if state is FileState.UNREADABLE:
                 continue
 
             # Special-case album artist when it matches track artist. (Hacky
@@ -107,14 +144,15 @@ def update_items(lib, query, album, move, pretend, fields, exclude_fields=None):
                     if move and lib.directory in ancestry(item.path):
                         item.move(store=False)
 
-                    item.store(fields=item_fields)
                     affected_albums.add(item.album_id)
-                else:
-                    # The file's mtime was different, but there were no
-                    # changes to the metadata. Store the new mtime,
-                    # which is set in the call to read(), so we don't
-                    # check this again in the future.
-                    item.store(fields=item_fields)
+                # Even if there were no changes to the metadata, the file's
+                # mtime was different: store the new mtime, which is set in
+                # the call to read(), so we don't check this again in the
+                # future.
+                changed_items.append(item)
+
+        # Save the changes in one go.
+        lib.store_many(changed_items, fields=item_fields)
 
         # Skip album changes while pretending.
         if pretend:
@@ -143,7 +181,7 @@ def update_items(lib, query, album, move, pretend, fields, exclude_fields=None):
                 items = list(album.items())
                 for item in items:
                     item.move(store=False, with_album=False)
-                    item.store(fields=item_fields)
+                lib.store_many(items, fields=item_fields)
                 album.move(store=False)
                 album.store(fields=album_fields)
 
@@ -163,6 +201,7 @@ def update_func(lib: Library, opts: UpdateCLIOpts, args: list[str]) -> None:
         opts.pretend,
         opts.fields,
         opts.exclude_fields,
+        opts.jobs,
     )
 
 
@@ -207,4 +246,11 @@ update_cmd.parser.add_option(
     dest="exclude_fields",
     help="list of fields to exclude from updates",
 )
+update_cmd.parser.add_option(
+    "-j",
+    "--jobs",
+    type="int",
+    default=1,
+    help="number of files to read at the same time (default: 1)",
+)
 update_cmd.func = update_func
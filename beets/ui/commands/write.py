@@ -6,7 +6,7 @@ import os
 from typing import TYPE_CHECKING, Protocol
 
 from beets import library, logging, ui
-from beets.util import syspath
+from beets.util import par_imap, par_map, syspath
 
 from .utils import do_query
 
@@ -20,26 +20,38 @@ log = logging.getLogger("beets")
 
 class WriteCLIOpts(Protocol):
     force: bool
+    jobs: int
     pretend: bool
 
 
-def write_items(lib, query, pretend, force):
+def read_clean_item(item: library.Item) -> library.Item | None:
+    """Get an Item object reflecting the "clean" (on-disk) state of the
+    item's file, or None if it cannot be read.
+    """
+    # Item deleted?
+    if not os.path.exists(syspath(item.path)):
+        log.info("missing file: {.filepath}", item)
+        return None
+
+    try:
+        return library.Item.from_path(item.path)
+    except library.ReadError as exc:
+        log.error("error reading {.filepath}: {}", item, exc)
+        return None
+
+
+def write_items(lib, query, pretend, force, jobs=1):
     """Write tag information from the database to the respective files
     in the filesystem.
+
+    `jobs` files are read and written at the same time. The changes are
+    still shown in the order of the items.
     """
     items, _ = do_query(lib, query, False, False)
 
-    for item in items:
-        # Item deleted?
-        if not os.path.exists(syspath(item.path)):
-            log.info("missing file: {.filepath}", item)
-            continue
-
-        # Get an Item object reflecting the "clean" (on-disk) state.
-        try:
-            clean_item = library.Item.from_path(item.path)
-        except library.ReadError as exc:
-            log.error("error reading {.filepath}: {}", item, exc)
+    written = []
+    for item, clean_item in zip(items, par_imap(read_clean_item, items, jobs)):
+        if clean_item is None:
             continue
 
         # Check for and display changes.
@@ -47,13 +59,15 @@ def write_items(lib, query, pretend, force):
             item, clean_item, library.Item._media_tag_fields, force
         )
         if (changed or force) and not pretend:
-            # We use `try_sync` here to keep the mtime up to date in the
-            # database.
-            item.try_sync(True, False)
+            written.append(item)
+
+    # We use `try_sync` here to keep the mtime up to date in the database.
+    par_map(lambda item: item.try_sync(True, False, store=False), written, jobs)
+    lib.store_many(written)
 
 
 def write_func(lib: Library, opts: WriteCLIOpts, args: list[str]) -> None:
-    write_items(lib, args, opts.pretend, opts.force)
+    write_items(lib, args, opts.pretend, opts.force, opts.jobs)
 
 
 write_cmd = ui.Subcommand("write", help="write tag information to files")
@@ -71,4 +85,11 @@ write_cmd.parser.add_option(
     default=False,
     help="write tags even if the existing tags match the database",
 )
+write_cmd.parser.add_option(
+    "-j",
+    "--jobs",
+    type="int",
+    default=1,
+    help="number of files to write at the same time (default: 1)",
+)
 write_cmd.func = write_func
@@ -42,6 +42,7 @@ from unidecode import unidecode
 
 import beets
 from beets.util import hidden
+from beets.util.manifest import DirEntry
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Iterable, Iterator
@@ -49,10 +50,12 @@ if TYPE_CHECKING:
 
     from beets.importer import Action, ImportSession, ImportTask
     from beets.library import Item
+    from beets.util.manifest import DirectoryManifest
 
 MAX_FILENAME_LENGTH = 200
 WINDOWS_MAGIC_PREFIX = "\\\\?\\"
 T = TypeVar("T")
+R = TypeVar("R")
 AnyPath = TypeVar("AnyPath", str, bytes, Path)
 StrPath = str | Path
 PathLike = StrPath | bytes
@@ -206,20 +209,87 @@ def ancestry(path: AnyStr) -> list[AnyStr]:
     return out
 
 
+def _compile_ignore(
+    patterns: Sequence[AnyStr],
+) -> list[tuple[AnyStr, re.Pattern[str]]]:
+    """Compile glob patterns for :func:`_ignored_by`, with the same
+    semantics as :func:`fnmatch.fnmatch`.
+    """
+    return [
+        (pat, re.compile(fnmatch.translate(os.path.normcase(_glob_str(pat)))))
+        for pat in patterns
+    ]
+
+
+def _glob_str(name: AnyStr) -> str:
+    # Like `fnmatch`, match bytes as Latin-1 to preserve every byte.
+    return name if isinstance(name, str) else name.decode("latin-1")
+
+
+def _ignored_by(
+    name: AnyStr, ignore: Sequence[tuple[AnyStr, re.Pattern[str]]]
+) -> AnyStr | None:
+    """Return the first ignore pattern the name matches, if any."""
+    if ignore:
+        name_str = os.path.normcase(_glob_str(name))
+        for pat, regex in ignore:
+            if regex.match(name_str):
+                return pat
+    return None
+
+
+def _list_dir(
+    path: AnyStr, manifest: DirectoryManifest | None = None
+) -> list[DirEntry]:
+    """List the entries of a directory with a single `os.scandir` call,
+    or from the manifest if the directory did not change since it was
+    recorded there.
+    """
+    if manifest is not None:
+        st = os.stat(path)
+        if (entries := manifest.get(path, st)) is not None:
+            return entries
+
+    with os.scandir(path) as it:
+        entries = [
+            DirEntry(entry.name, entry.is_dir(), hidden.is_hidden_entry(entry))
+            for entry in it
+        ]
+
+    if manifest is not None:
+        manifest.put(path, st, entries)
+    return entries
+
+
 def sorted_walk(
     path: AnyStr,
     ignore: Sequence[AnyStr] = (),
     ignore_hidden: bool = False,
     logger: Logger | None = None,
+    manifest: DirectoryManifest | None = None,
 ) -> Iterator[tuple[AnyStr, Sequence[AnyStr], Sequence[AnyStr]]]:
     """Like `os.walk`, but yields things in case-insensitive sorted,
     breadth-first order.  Directory and file names matching any glob
     pattern in `ignore` are skipped. If `logger` is provided, then
     warning messages are logged there when a directory cannot be listed.
+    If a `manifest` is provided, the directories that did not change
+    since it recorded them are not listed again.
     """
+    yield from _sorted_walk(
+        path, _compile_ignore(ignore), ignore_hidden, logger, manifest
+    )
+
+
+def _sorted_walk(
+    path: AnyStr,
+    ignore: Sequence[tuple[AnyStr, re.Pattern[str]]],
+    ignore_hidden: bool,
+    logger: Logger | None,
+    manifest: DirectoryManifest | None,
+) -> Iterator[tuple[AnyStr, Sequence[AnyStr], Sequence[AnyStr]]]:
     # Get all the directories and files at this level.
     try:
-        contents = os.listdir(path)
+        contents = _list_dir(path, manifest)
     except OSError:
         if logger:
             logger.warning(
@@ -230,24 +300,16 @@ def sorted_walk(
         return
     dirs = []
     files = []
-    for base in contents:
+    for base, is_dir, is_hidden in contents:
         # Skip ignored filenames.
-        skip = False
-        for pat in ignore:
-            if fnmatch.fnmatch(base, pat):
-                if logger:
-                    logger.debug(
-                        "ignoring '{}' due to ignore rule '{}'", base, pat
-                    )
-                skip = True
-                break
-        if skip:
+        if (pat := _ignored_by(base, ignore)) is not None:
+            if logger:
+                logger.debug("ignoring '{}' due to ignore rule '{}'", base, pat)
             continue
 
         # Add to output as either a file or a directory.
-        cur = os.path.join(path, base)
-        if (ignore_hidden and not hidden.is_hidden(cur)) or not ignore_hidden:
-            if os.path.isdir(syspath(cur)):
+        if not (ignore_hidden and is_hidden):
+            if is_dir:
                 dirs.append(base)
             else:
                 files.append(base)
@@ -261,7 +323,7 @@ def sorted_walk(
     # Recurse into directories.
     for base in dirs:
         cur = os.path.join(path, base)
-        yield from sorted_walk(cur, ignore, ignore_hidden, logger)
+        yield from _sorted_walk(cur, ignore, ignore_hidden, logger, manifest)
 
 
 def path_as_posix(path: bytes) -> bytes:
@@ -1038,22 +1100,42 @@ def asciify_path(path: str) -> str:
     return os.sep.join(replace(unidecode(p)) for p in path.split(os.sep))
 
 
-def par_map(transform: Callable[[T], Any], items: Sequence[T]) -> None:
+def par_map(
+    transform: Callable[[T], Any],
+    items: Sequence[T],
+    threads: int | None = None,
+) -> None:
     """Apply a transformation to each item concurrently using a thread pool.
 
     Propagates the calling thread's context variables into each worker,
     ensuring that context-dependent state is available during parallel
-    execution.
+    execution. `threads` defaults to the number of CPUs.
     """
+    for _ in par_imap(transform, items, threads):
+        pass
+
+
+def par_imap(
+    transform: Callable[[T], R], items: Iterable[T], threads: int | None = None
+) -> Iterator[R]:
+    """Like :func:`par_map`, but yield the results of the transformation
+    in the order of the items, as soon as they are available.
+
+    With a single thread, the items are transformed in the calling thread.
+    """
+    if threads == 1:
+        yield from map(transform, items)
+        return
+
     ctx = contextvars.copy_context()  # snapshot parent context at call time
 
-    def _worker(item: T) -> Any:
+    def _worker(item: T) -> R:
         # ThreadPool workers may run concurrently, so each task needs its own
         # child context rather than sharing one Context instance.
         return ctx.copy().run(transform, item)
 
-    with ThreadPool() as pool:
-        pool.map(_worker, items)
+    with ThreadPool(threads) as pool:
+        yield from pool.imap(_worker, items)
 
 
 class cached_classproperty(Generic[T]):
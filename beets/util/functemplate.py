@@ -540,6 +540,11 @@ class Template:
     def __eq__(self, other: object) -> bool:
         return type(self) is type(other) and self.original == other.original
 
+    @cached_property
+    def funcnames(self) -> set[str]:
+        """The names of the functions the template calls."""
+        return self.expr.translate()[2]
+
     def interpret(
         self,
         values: Mapping[str, str] = {},
@@ -7,7 +7,7 @@ import os
 import stat
 import sys
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, AnyStr
 
 if TYPE_CHECKING:
     from beets.util import PathLike
@@ -51,3 +51,19 @@ def is_hidden(path: PathLike) -> bool:
         return True
 
     return False
+
+
+def is_hidden_entry(entry: os.DirEntry[AnyStr]) -> bool:
+    """Like :func:`is_hidden`, for an entry yielded by :func:`os.scandir`.
+
+    Uses the attributes the directory listing already provides, so that
+    no extra ``stat`` call is needed except on OS X.
+    """
+    if sys.platform == "win32":
+        attrs = entry.stat(follow_symlinks=False).st_file_attributes
+        return bool(attrs & stat.FILE_ATTRIBUTE_HIDDEN)
+
+    if sys.platform == "darwin":
+        return is_hidden(entry.path)
+
+    return entry.name.startswith("." if isinstance(entry.name, str) else b".")
@@ -0,0 +1,160 @@
+"""A persistent record of directory listings, used to walk directory
+trees that did not change without listing their directories again.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING, AnyStr, ClassVar, NamedTuple
+
+import beets
+from beets import logging
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+log = logging.getLogger("beets")
+
+#: Directories modified this recently (in seconds) are not recorded: a
+#: change made within the same mtime tick would go unnoticed.
+RACY_WINDOW = 2
+
+#: Number of directories recorded between two commits.
+COMMIT_INTERVAL = 500
+
+# Flags of an entry, stored as a digit in front of its name.
+IS_DIR = 1
+IS_HIDDEN = 2
+
+
+class DirEntry(NamedTuple):
+    """A directory entry, as recorded in a :class:`DirectoryManifest`."""
+
+    name: str | bytes
+    is_dir: bool
+    hidden: bool
+
+
+class DirectoryManifest:
+    """Persistent record of the contents of directories.
+
+    The listing of each directory is stored in an SQLite database along
+    with the directory's mtime and size. A directory whose mtime and size
+    did not change since has the same entries, so its listing can be
+    served with a single ``stat`` call instead of reading the directory.
+
+    Counts the listings it serves (``hits``) and those that had to be
+    read again (``misses``). One instance may be shared between threads.
+    """
+
+    _shared: ClassVar[DirectoryManifest | None] = None
+    _shared_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS dirs (
+                path BLOB PRIMARY KEY,
+                mtime INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                entries BLOB NOT NULL
+            )"""
+        )
+        self._conn.commit()
+
+    @classmethod
+    def shared(cls) -> DirectoryManifest:
+        """Return the manifest configured by the ``dir_manifest`` options,
+        opened on first use and closed on program exit.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                path = beets.config["dir_manifest"]["path"].as_filename()
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                cls._shared = cls(path)
+                atexit.register(cls._shared.close)
+            return cls._shared
+
+    @staticmethod
+    def _encode(entries: Sequence[DirEntry]) -> bytes:
+        # File names never contain NUL bytes, so it makes for an
+        # unambiguous separator. Each name is prefixed with its flags.
+        return b"\0".join(
+            str((IS_DIR * e.is_dir) | (IS_HIDDEN * e.hidden)).encode()
+            + os.fsencode(e.name)
+            for e in entries
+        )
+
+    @staticmethod
+    def _decode(data: bytes, as_str: bool) -> list[DirEntry]:
+        entries = []
+        for raw in data.split(b"\0") if data else ():
+            flags, name = int(raw[:1]), raw[1:]
+            entries.append(
+                DirEntry(
+                    os.fsdecode(name) if as_str else name,
+                    bool(flags & IS_DIR),
+                    bool(flags & IS_HIDDEN),
+                )
+            )
+        return entries
+
+    def get(self, path: AnyStr, st: os.stat_result) -> list[DirEntry] | None:
+        """Return the recorded entries of the directory, or None if it
+        is not recorded or changed since, according to its `st` stat.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT mtime, size, entries FROM dirs WHERE path = ?",
+                (os.fsencode(path),),
+            ).fetchone()
+            if row is None or row[:2] != (st.st_mtime_ns, st.st_size):
+                self.misses += 1
+                return None
+            self.hits += 1
+        return self._decode(row[2], isinstance(path, str))
+
+    def put(
+        self, path: AnyStr, st: os.stat_result, entries: Sequence[DirEntry]
+    ) -> None:
+        """Record the entries of the directory, unless it was modified
+        too recently to tell later changes apart by its mtime.
+        """
+        if time.time() - st.st_mtime < RACY_WINDOW:
+            return
+        with self._lock:
+            self._conn.execute(
+                "REPLACE INTO dirs (path, mtime, size, entries) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    os.fsencode(path),
+                    st.st_mtime_ns,
+                    st.st_size,
+                    self._encode(entries),
+                ),
+            )
+            self._pending += 1
+            if self._pending >= COMMIT_INTERVAL:
+                self._conn.commit()
+                self._pending = 0
+
+    def close(self) -> None:
+        if self.hits or self.misses:
+            log.debug(
+                "Directory manifest: {} hits, {} misses.",
+                self.hits,
+                self.misses,
+            )
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
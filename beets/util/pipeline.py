@@ -14,7 +14,8 @@ When running a parallel pipeline, it is also possible to use
 multiple coroutines for the same pipeline stage; this lets you speed
 up a bottleneck stage by dividing its work among multiple threads.
 To do so, pass an iterable of coroutines to the Pipeline constructor
-in place of any single coroutine.
+in place of any single coroutine. Such a stage may emit its messages
+out of order unless the pipeline is constructed with ``ordered=True``.
 """
 
 from __future__ import annotations
@@ -148,6 +149,46 @@ class CountedQueue(queue.Queue[Tq]):
                     _invalidate_queue(self, POISON, False)
 
 
+class Sequencer:
+    """Keeps the messages of a stage run by several threads in the
+    order in which the stage received them.
+
+    Every message taken from the input queue is numbered, and the
+    output of each message is held back until the outputs of all the
+    messages before it have been sent to the next stage.
+    """
+
+    def __init__(self) -> None:
+        self.in_lock = Lock()
+        self.out_lock = Lock()
+        self.next_in = 0
+        self.next_out = 0
+        self.pending: dict[int, list[Any]] = {}
+
+    def get(self, in_queue: queue.Queue[Any]) -> tuple[int, Any]:
+        """Take the next message from the queue along with its sequence
+        number.
+        """
+        with self.in_lock:
+            msg = in_queue.get()
+            seq = self.next_in
+            self.next_in += 1
+        return seq, msg
+
+    def put(
+        self, seq: int, msgs: Iterable[Any], out_queue: queue.Queue[Any]
+    ) -> None:
+        """Send the messages produced for the message numbered `seq`,
+        along with any later ones that were waiting on it.
+        """
+        with self.out_lock:
+            self.pending[seq] = list(msgs)
+            while self.next_out in self.pending:
+                for msg in self.pending.pop(self.next_out):
+                    out_queue.put(msg)
+                self.next_out += 1
+
+
 class MultiMessage:
     """A message yielded by a pipeline stage encapsulating multiple
     values to be sent to the next stage.
@@ -337,12 +378,14 @@ class MiddlePipelineThread(PipelineThread):
         out_queue: CountedQueue[Any],
         all_threads: Sequence[PipelineThread],
         ctx: contextvars.Context | None = None,
+        sequencer: Sequencer | None = None,
     ) -> None:
         super().__init__(all_threads, ctx)
         self.coro = coro
         self.in_queue = in_queue
         self.out_queue = out_queue
         self.out_queue.acquire()
+        self.sequencer = sequencer
 
     def run(self) -> None:
         try:
@@ -355,7 +398,10 @@ class MiddlePipelineThread(PipelineThread):
                         return
 
                 # Get the message from the previous stage.
-                msg = self.in_queue.get()
+                if self.sequencer:
+                    seq, msg = self.sequencer.get(self.in_queue)
+                else:
+                    msg = self.in_queue.get()
                 if msg is POISON:
                     break
 
@@ -366,6 +412,11 @@ class MiddlePipelineThread(PipelineThread):
                 # Invoke the current stage.
                 out = self._run_in_context(self.coro.send, msg)
 
+                if self.sequencer:
+                    # Wait for the earlier messages of the stage.
+                    self.sequencer.put(seq, _allmsgs(out), self.out_queue)
+                    continue
+
                 # Send messages to next stage.
                 for msg in _allmsgs(out):
                     with self.abort_lock:
@@ -432,15 +483,23 @@ class Pipeline(Generic[Tpull, Tstage]):
 
     @overload
     def __init__(
-        self, stages: tuple[Unpack[StagePrefix], Generator[Tpull, Any, Any]]
+        self,
+        stages: tuple[Unpack[StagePrefix], Generator[Tpull, Any, Any]],
+        ordered: bool = False,
     ) -> None: ...
 
     @overload
-    def __init__(self, stages: Sequence[Any]) -> None: ...
+    def __init__(
+        self, stages: Sequence[Any], ordered: bool = False
+    ) -> None: ...
 
-    def __init__(self, stages: Sequence[Any]) -> None:
+    def __init__(self, stages: Sequence[Any], ordered: bool = False) -> None:
         """Makes a new pipeline from a list of coroutines. There must
         be at least two stages.
+
+        If `ordered` is set, the middle stages that run several
+        coroutines pass their messages on in the order they received
+        them. The last stage always consumes messages as they come.
         """
         if len(stages) < 2:
             raise ValueError("pipeline must have at least two stages")
@@ -458,6 +517,7 @@ class Pipeline(Generic[Tpull, Tstage]):
             else:
                 # Default to one thread per stage.
                 self.stages.append((stage,))
+        self.ordered = ordered
 
     def run_sequential(self) -> None:
         """Run the pipeline sequentially in the current thread. The
@@ -488,10 +548,18 @@ class Pipeline(Generic[Tpull, Tstage]):
 
         # Middle stages.
         for i in range(queue_count - 1):
+            sequencer = None
+            if self.ordered and len(self.stages[i]) > 1:
+                sequencer = Sequencer()
             for coro in self.stages[i]:
                 threads.append(
                     MiddlePipelineThread(
-                        coro, queues[i], queues[i + 1], threads, base_ctx.copy()
+                        coro,
+                        queues[i],
+                        queues[i + 1],
+                        threads,
+                        base_ctx.copy(),
+                        sequencer,
                     )
                 )
 
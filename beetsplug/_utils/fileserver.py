@@ -0,0 +1,218 @@
+"""Serve the files of a library to HTTP clients, with byte ranges.
+
+Players seek in a track by asking for the range of bytes that follows
+the position they jump to, so answering range requests spares them
+from downloading the whole file again. The bytes are copied by the
+kernel with ``sendfile`` where possible: through the server's
+``wsgi.file_wrapper`` (as gunicorn does) for whole files, or straight to
+the socket under Flask's development server.
+"""
+
+from __future__ import annotations
+
+import os
+import ssl
+from datetime import datetime, timezone
+from mimetypes import guess_type
+from typing import TYPE_CHECKING, BinaryIO
+
+from flask import current_app, request
+from werkzeug.exceptions import NotFound
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from flask import Response
+    from werkzeug.datastructures import Range
+
+#: Bytes read at once, and announced to the kernel ahead of reading,
+#: when a file cannot be sent with ``sendfile``.
+DEFAULT_READ_AHEAD = 256 * 1024
+
+
+class FileRange:
+    """The body of a response: `length` bytes of an open file, starting
+    at `start`.
+
+    Iterating over it reads the file in blocks of `read_ahead` bytes.
+    When the response is written by Werkzeug's development server, the
+    bytes are instead sent to its socket with ``sendfile``, once the
+    headers are out.
+    """
+
+    def __init__(
+        self,
+        file: BinaryIO,
+        start: int,
+        length: int,
+        read_ahead: int = DEFAULT_READ_AHEAD,
+        socket: object | None = None,
+    ) -> None:
+        self.file = file
+        self.start = start
+        self.length = length
+        self.read_ahead = max(read_ahead, 4096)
+        self.socket = socket
+        # Servers with their own `wsgi.file_wrapper` look for these.
+        self.file.seek(start)
+        self.fileno = file.fileno
+
+    def read(self, size: int = -1) -> bytes:
+        """Read from the range, for `wsgi.file_wrapper` implementations
+        that do not use ``sendfile``.
+        """
+        left = self.start + self.length - self.file.tell()
+        return self.file.read(left if size < 0 else min(size, left))
+
+    def _advise(self, offset: int, length: int) -> None:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(
+                self.file.fileno(), offset, length, os.POSIX_FADV_WILLNEED
+            )
+
+    def _sendfile(self) -> Iterator[bytes]:
+        # Let the server send the headers before the body goes out.
+        yield b""
+        fd = self.file.fileno()
+        out = self.socket.fileno()  # type: ignore[attr-defined]
+        offset, end = self.start, self.start + self.length
+        while offset < end:
+            sent = os.sendfile(out, fd, offset, end - offset)
+            if not sent:
+                break
+            offset += sent
+
+    def _read(self) -> Iterator[bytes]:
+        offset, end = self.start, self.start + self.length
+        self._advise(offset, self.read_ahead)
+        while offset < end:
+            size = min(self.read_ahead, end - offset)
+            # Have the next block read while this one is sent.
+            self._advise(offset + size, self.read_ahead)
+            if not (data := self.file.read(size)):
+                break
+            offset += len(data)
+            yield data
+
+    def __iter__(self) -> Iterator[bytes]:
+        if self.socket is not None:
+            return self._sendfile()
+        return self._read()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def _range(rng: Range | None, size: int) -> tuple[int, int] | None:
+    """Return the start and stop offsets of the single range requested,
+    or None to send the whole file.
+
+    Raise ValueError if the range cannot be satisfied.
+    """
+    if rng is None or rng.units != "bytes" or len(rng.ranges) != 1:
+        # Several ranges are allowed to be answered with everything.
+        return None
+    if (bounds := rng.range_for_length(size)) is None:
+        raise ValueError(rng)
+    return bounds
+
+
+def _development_socket() -> object | None:
+    """Return the socket of the request if it is served by Werkzeug's
+    development server and ``sendfile`` can write to it.
+    """
+    sock = request.environ.get("werkzeug.socket")
+    if (
+        not hasattr(os, "sendfile")
+        or sock is None
+        or isinstance(sock, ssl.SSLSocket)
+        or not request.environ.get("SERVER_SOFTWARE", "").startswith(
+            "Werkzeug/"
+        )
+    ):
+        return None
+    return sock
+
+
+def send_file(
+    path: str,
+    mimetype: str | None = None,
+    download_name: str | None = None,
+    read_ahead: int = DEFAULT_READ_AHEAD,
+    sendfile: bool = True,
+) -> Response:
+    """Respond with the file at `path`, or the byte range of it that was
+    requested.
+
+    The response has validators derived from the file's modification
+    time and size, so clients can check their copy is current or resume
+    a download with ``If-Range``. The MIME type is guessed from the file
+    name unless given. If `download_name` is given, the file is sent as
+    an attachment with this name.
+    """
+    try:
+        file = open(path, "rb")
+    except FileNotFoundError:
+        raise NotFound()
+    st = os.fstat(file.fileno())
+    size = st.st_size
+    etag = f"{st.st_mtime_ns:x}-{size:x}"
+    last_modified = datetime.fromtimestamp(int(st.st_mtime), timezone.utc)
+
+    response = current_app.response_class(
+        mimetype=mimetype or guess_type(path)[0] or "application/octet-stream",
+        direct_passthrough=True,
+    )
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.accept_ranges = "bytes"
+    if download_name is not None:
+        response.headers.set(
+            "Content-Disposition", "attachment", filename=download_name
+        )
+
+    if request.if_none_match:
+        not_modified = request.if_none_match.contains(etag)
+    else:
+        since = request.if_modified_since
+        not_modified = since is not None and last_modified <= since
+    if not_modified:
+        file.close()
+        response.status_code = 304
+        return response
+
+    # Ranges only apply to the copy of the file named by If-Range.
+    if_range = request.if_range
+    if if_range.etag is not None:
+        same_file = if_range.etag == etag
+    elif if_range.date is not None:
+        same_file = if_range.date == last_modified
+    else:
+        same_file = True
+    bounds = None
+    if same_file:
+        try:
+            bounds = _range(request.range, size)
+        except ValueError:
+            file.close()
+            response.status_code = 416
+            response.content_range = f"bytes */{size}"
+            return response
+
+    start, stop = bounds or (0, size)
+    if bounds:
+        response.status_code = 206
+        response.content_range = f"bytes {start}-{stop - 1}/{size}"
+    response.content_length = stop - start
+
+    socket = _development_socket() if sendfile else None
+    body = FileRange(file, start, stop - start, read_ahead, socket)
+    # Not every server's file wrapper starts from the current offset of
+    # the file, so ranges are read by the body itself.
+    if socket is None and sendfile and not bounds:
+        wrapper = request.environ.get("wsgi.file_wrapper")
+        if wrapper is not None:
+            response.response = wrapper(body, read_ahead)
+            return response
+    response.response = body
+    return response
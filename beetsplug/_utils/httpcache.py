@@ -0,0 +1,266 @@
+"""Conditional requests and an in-process cache of responses for the
+Flask servers of plugins.
+
+Responses are tagged with the *generation* of the library: a number
+bumped whenever the library changes. Clients that send back the tag, or
+the time of the last change, are told that nothing changed without the
+response being built again, and responses to other clients are served
+from memory until the library changes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import wraps
+from typing import TYPE_CHECKING, NamedTuple
+
+from flask import current_app, request
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+    from flask import Flask, Response
+
+    from beets.library import Library
+
+#: Distinguishes the tags of this process from those of earlier runs,
+#: whose generation numbers started from zero too.
+_BOOT_ID = os.urandom(8).hex()
+
+#: The key of the response cache in the extensions of a Flask app.
+EXTENSION = "beets_response_cache"
+
+
+class LibraryGeneration:
+    """Count the changes made to libraries.
+
+    Changes made in this process are announced with `bump`, which the
+    plugins call on the ``database_change`` event. Changes made by other
+    processes, such as a ``beet import`` running next to the server, are
+    noticed by the modification time and size of the database files.
+
+    ``Last-Modified`` headers only have whole seconds, so a change that
+    follows a served generation in the same second is dated from the
+    next second: clients that only send ``If-Modified-Since`` see it.
+    """
+
+    def __init__(self) -> None:
+        self.number = 0
+        self.changed_at = time.time()
+        self._served = False
+        self._files: dict[str, tuple[tuple[int, int] | None, ...]] = {}
+        self._lock = threading.Lock()
+
+    def _advance(self) -> None:
+        self.number += 1
+        now = time.time()
+        if self._served and int(now) <= int(self.changed_at):
+            now = int(self.changed_at) + 1
+        self.changed_at = now
+        self._served = False
+
+    @staticmethod
+    def _file_version(lib: Library) -> tuple[tuple[int, int] | None, ...]:
+        version = []
+        for path in (lib.path, lib.path.with_name(f"{lib.path.name}-wal")):
+            try:
+                st = os.stat(path)
+            except OSError:
+                version.append(None)
+            else:
+                version.append((st.st_mtime_ns, st.st_size))
+        return tuple(version)
+
+    def bump(self) -> None:
+        """Record a change to a library."""
+        with self._lock:
+            self._advance()
+
+    def current(self, lib: Library) -> tuple[int, float]:
+        """Return the generation number of the library and the time of
+        its last known change.
+        """
+        files = self._file_version(lib)
+        key = str(lib.path)
+        with self._lock:
+            if self._files.get(key, files) != files:
+                self._advance()
+            self._files[key] = files
+            self._served = True
+            return self.number, self.changed_at
+
+
+library_generation = LibraryGeneration()
+
+
+class CachedResponse(NamedTuple):
+    status: int
+    headers: list[tuple[str, str]]
+    body: bytes
+
+
+class ResponseCache:
+    """Keep the bodies of responses in memory, up to `max_size` bytes.
+
+    The least recently used responses are evicted first, and a response
+    larger than `max_entry_size` is never kept. Counts the responses it
+    serves (``hits``) and those that had to be built (``misses``).
+    """
+
+    def __init__(self, max_size: int, max_entry_size: int | None = None):
+        self.max_size = max_size
+        self.max_entry_size = (
+            max_size // 4 if max_entry_size is None else max_entry_size
+        )
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CachedResponse | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        if len(entry.body) > self.max_entry_size:
+            return
+        with self._lock:
+            if old := self._entries.pop(key, None):
+                self.size -= len(old.body)
+            self._entries[key] = entry
+            self.size += len(entry.body)
+            while self.size > self.max_size:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted.body)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _tee(
+        self,
+        key: str,
+        status: int,
+        headers: list[tuple[str, str]],
+        chunks: Iterable[bytes],
+        is_current: Callable[[], bool],
+    ) -> Iterator[bytes]:
+        """Pass the chunks of a streamed response through, keeping them
+        until the response is complete.
+        """
+        body: list[bytes] | None = []
+        size = 0
+        for chunk in chunks:
+            if body is not None:
+                size += len(chunk)
+                if size > self.max_entry_size:
+                    body = None
+                else:
+                    body.append(chunk)
+            yield chunk
+        if body is not None and is_current():
+            self.put(key, CachedResponse(status, headers, b"".join(body)))
+
+    def store(
+        self, key: str, response: Response, is_current: Callable[[], bool]
+    ) -> None:
+        """Keep the body of the response once it is sent, unless the
+        library changed in the meantime according to `is_current`.
+        """
+        headers = [
+            (k, v)
+            for k, v in response.headers.items()
+            if k.lower() not in {"content-length", "etag", "last-modified"}
+        ]
+        if response.is_streamed:
+            response.response = self._tee(
+                key,
+                response.status_code,
+                headers,
+                response.iter_encoded(),
+                is_current,
+            )
+        elif is_current():
+            self.put(
+                key,
+                CachedResponse(
+                    response.status_code, headers, response.get_data()
+                ),
+            )
+
+
+def init_app(app: Flask, max_size: int) -> None:
+    """Keep up to `max_size` bytes of the responses of the app in memory,
+    or none if it is zero.
+    """
+    app.extensions[EXTENSION] = ResponseCache(max_size) if max_size else None
+
+
+def conditional(view: Callable[..., object]) -> Callable[..., object]:
+    """Decorate a view to tag its responses with the generation of the
+    library, answer conditional requests, and serve its responses from
+    the cache of the app.
+
+    The view must not depend on anything but the library and the URL of
+    the request. Requests other than GET may change the library, so they
+    bump its generation.
+    """
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if request.method not in {"GET", "HEAD"}:
+            try:
+                return view(*args, **kwargs)
+            finally:
+                library_generation.bump()
+
+        lib = current_app.config["lib"]
+        number, changed_at = library_generation.current(lib)
+        digest = hashlib.sha1(
+            f"{_BOOT_ID}\0{lib.path}\0{number}\0{request.full_path}".encode()
+        ).hexdigest()
+        last_modified = datetime.fromtimestamp(int(changed_at), timezone.utc)
+
+        def is_current() -> bool:
+            return library_generation.current(lib)[0] == number
+
+        if request.if_none_match:
+            not_modified = request.if_none_match.contains_weak(digest)
+        else:
+            since = request.if_modified_since
+            not_modified = since is not None and last_modified <= since
+        cache: ResponseCache | None = current_app.extensions.get(EXTENSION)
+
+        if not_modified:
+            response = current_app.response_class(status=304)
+        elif cache and (entry := cache.get(digest)):
+            response = current_app.response_class(
+                entry.body, status=entry.status, headers=entry.headers
+            )
+        else:
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            if cache:
+                cache.store(digest, response, is_current)
+
+        response.set_etag(digest, weak=True)
+        response.last_modified = last_modified
+        # Clients may keep the response but must check it is current.
+        response.cache_control.no_cache = True
+        return response
+
+    return wrapper
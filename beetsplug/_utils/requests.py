@@ -1,6 +1,10 @@
 from __future__ import annotations
 
 import atexit
+import hashlib
+import json
+import os
+import sqlite3
 import threading
 import time
 from contextlib import contextmanager
@@ -10,13 +14,21 @@ from typing import TYPE_CHECKING, Any, ClassVar, Generic, Protocol, TypeVar
 
 import requests
 from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
 from urllib3.util.retry import Retry
 
-from beets import __version__
+from beets import __version__, config, logging
 
 if TYPE_CHECKING:
     from collections.abc import Iterator
 
+log = logging.getLogger("beets")
+
+#: Number of responses stored between two purges of the expired entries
+#: of a :class:`ResponseCache`.
+PURGE_INTERVAL = 100
+
 
 class BeetsHTTPError(requests.exceptions.HTTPError):
     STATUS: ClassVar[HTTPStatus]
@@ -32,6 +44,10 @@ class HTTPNotFoundError(BeetsHTTPError):
     STATUS = HTTPStatus.NOT_FOUND
 
 
+class CacheMissError(requests.exceptions.ConnectionError):
+    """Raised in offline mode for a request whose response is not cached."""
+
+
 class Closeable(Protocol):
     """Protocol for objects that have a close method."""
 
@@ -135,6 +151,194 @@ class RateLimitAdapter(HTTPAdapter):
         return super().send(request, *args, **kwargs)
 
 
+class ResponseCache:
+    """Persistent cache of HTTP responses, shared by all request handlers.
+
+    Responses to successful GET requests are stored in an SQLite database,
+    keyed by a hash of the request URL with its query parameters. Entries
+    expire after ``ttl`` seconds, and the oldest entries are evicted once
+    the cached bodies take more than ``max_size`` bytes. In offline mode,
+    requests are only served from the cache, expired entries included,
+    and a request that is not cached raises :class:`CacheMissError`.
+
+    Counts the requests it serves (``hits``) and those it passes on to
+    the session (``misses``). One instance may be shared between threads.
+    """
+
+    _shared: ClassVar[ResponseCache | None] = None
+    _shared_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 30 * 24 * 3600,
+        max_size: int = 256 * 1024 * 1024,
+        offline: bool = False,
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.max_size = max_size
+        self.offline = offline
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                stored REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_stored ON responses (stored)"
+        )
+        self._conn.commit()
+        self._puts = 0
+        self._size = self._total_size()
+
+    @classmethod
+    def shared(cls) -> ResponseCache:
+        """Return the cache configured by the ``http_cache`` options,
+        opened on first use and closed on program exit.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cache_config = config["http_cache"]
+                path = cache_config["path"].as_filename()
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                cls._shared = cls(
+                    path,
+                    ttl=cache_config["ttl"].as_number(),
+                    max_size=cache_config["max_size"].get(int) * 1024 * 1024,
+                    offline=cache_config["offline"].get(bool),
+                )
+                atexit.register(cls._shared.close)
+            return cls._shared
+
+    @staticmethod
+    def key(method: str, url: str, params: Any = None) -> tuple[str, str]:
+        """Return the cache key and the full URL of a request."""
+        full_url = requests.Request(method, url, params=params).prepare().url
+        assert full_url is not None
+        digest = hashlib.sha256(f"{method.upper()} {full_url}".encode())
+        return digest.hexdigest(), full_url
+
+    def get(self, key: str) -> requests.Response | None:
+        """Return the cached response for the key, or None if there is
+        none or it has expired.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, headers, body, stored FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+
+        url, headers, body, stored = row
+        if not self.offline and time.time() - stored > self.ttl:
+            return None
+
+        response = requests.Response()
+        response.status_code = HTTPStatus.OK
+        response.reason = HTTPStatus.OK.phrase
+        response.url = url
+        response.headers = CaseInsensitiveDict(json.loads(headers))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = body
+        return response
+
+    def _total_size(self) -> int:
+        return self._conn.execute(
+            "SELECT COALESCE(SUM(length(body)), 0) FROM responses"
+        ).fetchone()[0]
+
+    def put(self, key: str, response: requests.Response) -> None:
+        """Store the response under the key and evict the entries that
+        do not fit in the cache any more.
+
+        Expired entries are purged every `PURGE_INTERVAL` responses.
+        """
+        headers = json.dumps(dict(response.headers))
+        body = response.content
+        with self._lock, self._conn:
+            old = self._conn.execute(
+                "SELECT length(body) FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "REPLACE INTO responses (key, url, headers, body, stored) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, response.url, headers, body, time.time()),
+            )
+            self._size += len(body) - (old[0] if old else 0)
+            self._puts += 1
+            if self._puts % PURGE_INTERVAL == 0:
+                self._purge()
+            if self._size > self.max_size:
+                self._evict()
+
+    def _purge(self) -> None:
+        """Delete the expired entries, and count the size of the cache
+        again, as other processes may have changed it.
+        """
+        self._conn.execute(
+            "DELETE FROM responses WHERE stored < ?", (time.time() - self.ttl,)
+        )
+        self._size = self._total_size()
+
+    def _evict(self) -> None:
+        """Delete the oldest entries until the cache fits in `max_size`."""
+        while self._size > self.max_size:
+            rows = self._conn.execute(
+                "SELECT key, length(body) FROM responses "
+                "ORDER BY stored LIMIT ?",
+                (PURGE_INTERVAL,),
+            ).fetchall()
+            if not rows:
+                self._size = 0
+                break
+            for key, length in rows:
+                if self._size <= self.max_size:
+                    break
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key = ?", (key,)
+                )
+                self._size -= length
+
+    def request(
+        self, session: requests.Session, method: str, url: str, **kwargs
+    ) -> requests.Response:
+        """Serve a GET request from the cache, or perform it with the
+        session and cache its response.
+
+        Other requests are always passed on to the session.
+        """
+        if method.upper() != "GET":
+            return session.request(method, url, **kwargs)
+
+        key, full_url = self.key(method, url, kwargs.get("params"))
+        if (response := self.get(key)) is not None:
+            self.hits += 1
+            return response
+
+        self.misses += 1
+        if self.offline:
+            raise CacheMissError(f"{full_url} is not in the HTTP cache")
+
+        response = session.request(method, url, **kwargs)
+        if response.status_code == HTTPStatus.OK:
+            self.put(key, response)
+        return response
+
+    def close(self) -> None:
+        if self.hits or self.misses:
+            log.debug("HTTP cache: {} hits, {} misses.", self.hits, self.misses)
+        self._conn.close()
+
+
 class RequestHandler:
     """Manages HTTP requests with custom error handling and session management.
 
@@ -173,6 +377,20 @@ class RequestHandler:
     def session(self) -> TimeoutAndRetrySession:
         return self.create_session()
 
+    def create_cache(self) -> ResponseCache | None:
+        """Return the cache for the responses, or None to not cache them.
+
+        By default, this is the cache shared by all handlers if the
+        ``http_cache`` option is enabled.
+        """
+        if config["http_cache"]["enabled"].get(bool):
+            return ResponseCache.shared()
+        return None
+
+    @cached_property
+    def cache(self) -> ResponseCache | None:
+        return self.create_cache()
+
     def status_to_error(
         self, code: int
     ) -> type[requests.exceptions.HTTPError] | None:
@@ -206,9 +424,12 @@ class RequestHandler:
 
         Delegates to the underlying session method while converting recognized
         HTTP errors to beets-specific exceptions through the error handler.
+        GET requests are served from the cache, if there is one.
         """
         with self.handle_http_error():
-            return self.session.request(*args, **kwargs)
+            if self.cache is None:
+                return self.session.request(*args, **kwargs)
+            return self.cache.request(self.session, *args, **kwargs)
 
     def get(self, *args, **kwargs) -> requests.Response:
         """Perform HTTP GET request with automatic error handling."""
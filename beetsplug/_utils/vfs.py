@@ -4,12 +4,51 @@ libraries.
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, NamedTuple
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+from typing import TYPE_CHECKING, Any, NamedTuple
 
-from beets import util
+from beets import config, logging, util
+from beets.dbcore.query import InQuery
+from beets.library import Album, Item
+from beets.library.models import DefaultTemplateFunctions
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
+    from beets.dbcore.db import FlexAttrs
     from beets.library import Library
+    from beets.library.models import UniqueDisambiguators
+
+
+log = logging.getLogger("beets")
+
+#: Snapshots written in another format are ignored.
+SNAPSHOT_VERSION = 1
+
+#: Configuration the destinations of items depend on, besides the path
+#: formats and replacements of the library.
+PATH_CONFIG = (
+    "asciify_paths",
+    "path_sep_replace",
+    "max_filename_length",
+    "per_disc_numbering",
+    "aunique",
+    "sunique",
+    "plugins",
+    "item_fields",
+    "album_fields",
+)
+
+#: Number of ids looked up in a single query.
+CHUNK_SIZE = 500
+
+_UNIQUE_CALL = re.compile(r"%([as]unique)\{([^}]*)\}")
 
 
 class Node(NamedTuple):
@@ -20,18 +59,43 @@ class Node(NamedTuple):
     # Maps directory names to child nodes.
 
 
-def _insert(node: Node, path: list[str], itemid: int):
-    """Insert an item into a virtual filesystem node."""
-    if len(path) == 1:
-        # Last component. Insert file.
-        node.files[path[0]] = itemid
-    else:
-        # In a directory.
-        dirname = path[0]
-        rest = path[1:]
-        if dirname not in node.dirs:
-            node.dirs[dirname] = Node({}, {})
-        _insert(node.dirs[dirname], rest, itemid)
+def _insert(node: Node, path: Sequence[str], itemid: int) -> int | None:
+    """Insert an item into a virtual filesystem node. Return the id of
+    the item that had the same path, if any.
+    """
+    *dirnames, filename = path
+    for dirname in dirnames:
+        child = node.dirs.get(dirname)
+        if child is None:
+            child = node.dirs[dirname] = Node({}, {})
+        node = child
+    previous = node.files.get(filename)
+    node.files[filename] = itemid
+    return previous
+
+
+def _remove(node: Node, path: Sequence[str], itemid: int):
+    """Remove an item from a virtual filesystem node, along with the
+    directories it leaves empty.
+    """
+    *dirnames, filename = path
+    parents = []
+    for dirname in dirnames:
+        parents.append((node, dirname))
+        node = node.dirs[dirname]
+    if node.files.get(filename) == itemid:
+        del node.files[filename]
+    for parent, dirname in reversed(parents):
+        child = parent.dirs[dirname]
+        if child.files or child.dirs:
+            break
+        del parent.dirs[dirname]
+
+
+def _components(item: Item) -> tuple[str, ...]:
+    dest = item.destination(relative_to_libdir=True)
+    # Directory names are shared by many items.
+    return tuple(map(sys.intern, util.components(util.as_string(dest))))
 
 
 def libtree(lib: Library) -> Node:
@@ -45,7 +109,315 @@ def libtree(lib: Library) -> Node:
     for item in lib.items():
         if item.id is None:
             continue
-        dest = item.destination(relative_to_libdir=True)
-        parts = util.components(util.as_string(dest))
-        _insert(root, parts, item.id)
+        _insert(root, _components(item), item.id)
     return root
+
+
+def _digest(*parts: object) -> int:
+    """Return a hash of the values that is the same in every run."""
+    data = repr(parts).encode("utf-8", "surrogateescape")
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+def _row_digest(row: Sequence[Any], flex: FlexAttrs, *extra: object) -> int:
+    return _digest(tuple(row), sorted(flex.items()), extra)
+
+
+def _chunks(ids: Iterable[int]) -> Iterator[list[int]]:
+    ids = sorted(ids)
+    for start in range(0, len(ids), CHUNK_SIZE):
+        yield ids[start : start + CHUNK_SIZE]
+
+
+class LibraryTree:
+    """A filesystem-like directory tree of the files of a library, kept
+    up to date as the library changes.
+
+    Each item is recorded with a signature of what its path is made of:
+    its database row, its album's, and the ``%aunique`` and ``%sunique``
+    strings of the path formats. Bringing the tree up to date only
+    computes the destinations of the items whose signature changed, and
+    a snapshot of the tree, written with `save`, spares computing them
+    again in the next run.
+
+    Changes announced by events are passed to `invalidate` and applied
+    the next time the `root` of the tree is accessed. One instance may
+    be shared between threads.
+    """
+
+    def __init__(self, lib: Library) -> None:
+        self.lib = lib
+        self._root = Node({}, {})
+        self._paths: dict[int, tuple[str, ...]] = {}
+        self._signatures: dict[int, int] = {}
+        self._album_signatures: dict[int, int] = {}
+        # Items hidden by another item with the same path.
+        self._hidden: dict[tuple[str, ...], set[int]] = {}
+        self._pending: set[int] = set()
+        self._stale = False
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    @property
+    def root(self) -> Node:
+        """The root node of the tree, with the pending changes applied."""
+        with self._lock:
+            if self._stale:
+                pending, self._pending = self._pending, set()
+                self._stale = False
+                self._sync(pending)
+            return self._root
+
+    def invalidate(self, item_ids: Iterable[int] = ()) -> None:
+        """Have the items, and all albums, checked for changes the next
+        time the tree is accessed.
+        """
+        with self._lock:
+            self._pending.update(item_ids)
+            self._stale = True
+
+    def sync(self) -> int:
+        """Bring the whole tree up to date with the library.
+
+        Return the number of items that were added, moved or removed.
+        """
+        with self._lock:
+            self._pending.clear()
+            self._stale = False
+            return self._sync(None)
+
+    def _place(self, item_id: int, path: tuple[str, ...]) -> None:
+        """Move the item to the path in the tree, in front of any item
+        with the same path.
+        """
+        if item_id in self._paths:
+            self._unplace(item_id)
+        self._paths[item_id] = path
+        hidden = _insert(self._root, path, item_id)
+        if hidden is not None and hidden != item_id:
+            self._hidden.setdefault(path, set()).add(hidden)
+
+    def _unplace(self, item_id: int) -> None:
+        """Take the item out of the tree, showing an item it hid."""
+        path = self._paths.pop(item_id)
+        hidden = self._hidden.get(path)
+        if hidden and item_id in hidden:
+            hidden.discard(item_id)
+        elif hidden:
+            _insert(self._root, path, hidden.pop())
+        else:
+            _remove(self._root, path, item_id)
+        if hidden is not None and not hidden:
+            del self._hidden[path]
+
+    def _unique_tables(
+        self,
+    ) -> tuple[list[UniqueDisambiguators], list[UniqueDisambiguators]] | None:
+        """Return the disambiguation strings of the ``%aunique`` and the
+        ``%sunique`` calls of the path formats, or None if some of them
+        cannot be computed in advance.
+        """
+        album_tables = []
+        item_tables = []
+        for _, path_format in self.lib.path_formats:
+            for name, args in _UNIQUE_CALL.findall(path_format):
+                keys, disam, *_ = [*args.split(","), "", ""]
+                keys_list, disam_list, *_ = (
+                    DefaultTemplateFunctions._tmpl_unique_args(
+                        name, keys.strip() or None, disam.strip() or None, ""
+                    )
+                )
+                model_cls = Album if name == "aunique" else Item
+                table = self.lib.unique_disambiguators(
+                    model_cls, keys_list, disam_list
+                )
+                if table is None:
+                    return None
+                tables = album_tables if model_cls is Album else item_tables
+                tables.append(table)
+        return album_tables, item_tables
+
+    def _item_rows(
+        self, item_ids: set[int] | None, album_ids: set[int]
+    ) -> Iterator[tuple[Any, FlexAttrs]]:
+        """Generate the rows of the given items and of the items of the
+        given albums, or of all items if `item_ids` is None.
+        """
+        if item_ids is None:
+            yield from self.lib.items().raw()
+            return
+        seen = set()
+        for field, ids in (("id", item_ids), ("album_id", album_ids)):
+            for chunk in _chunks(ids):
+                for row, flex in self.lib.items(InQuery(field, chunk)).raw():
+                    if row["id"] not in seen:
+                        seen.add(row["id"])
+                        yield row, flex
+
+    def _sync(self, item_ids: set[int] | None) -> int:
+        tables = self._unique_tables()
+        if tables is None:
+            # The paths may change with any other object: check them all.
+            album_tables: list[UniqueDisambiguators] = []
+            item_tables: list[UniqueDisambiguators] = []
+            self._signatures.clear()
+            self._album_signatures.clear()
+            item_ids = None
+        else:
+            album_tables, item_tables = tables
+
+        albums = {
+            row["id"]: _row_digest(
+                row, flex, [t.get(row["id"]) for t in album_tables]
+            )
+            for row, flex in self.lib.albums().raw()
+        }
+        changed_albums = {
+            album_id
+            for album_id in albums.keys() | self._album_signatures.keys()
+            if albums.get(album_id) != self._album_signatures.get(album_id)
+        }
+        self._album_signatures = albums
+
+        changed: dict[int, int] = {}
+        seen = set()
+        for row, flex in self._item_rows(item_ids, changed_albums):
+            item_id, album_id = row["id"], row["album_id"]
+            seen.add(item_id)
+            if album_id is None:
+                signature = _row_digest(
+                    row, flex, [t.get(item_id) for t in item_tables]
+                )
+            else:
+                signature = _row_digest(row, flex, albums.get(album_id))
+            if self._signatures.get(item_id) != signature:
+                changed[item_id] = signature
+        if item_ids is None:
+            checked = self._signatures.keys() | self._paths.keys()
+        else:
+            checked = item_ids
+        removed = [i for i in checked if i not in seen]
+
+        count = 0
+        for item_id in removed:
+            self._signatures.pop(item_id, None)
+            if item_id in self._paths:
+                self._unplace(item_id)
+                count += 1
+
+        if item_ids is None and len(changed) > len(seen) // 2:
+            items: Iterable[Item] = self.lib.items()
+        else:
+            items = (
+                item
+                for chunk in _chunks(changed)
+                for item in self.lib.items(InQuery("id", chunk))
+            )
+        for item in items:
+            if (signature := changed.get(item.id)) is None:
+                continue
+            path = _components(item)
+            if path != self._paths.get(item.id):
+                self._place(item.id, path)
+                count += 1
+            self._signatures[item.id] = signature
+        return count
+
+    def _fingerprint(self) -> int:
+        """Return a hash of the configuration the paths depend on."""
+        return _digest(
+            self.lib.path_formats,
+            [
+                (pattern.pattern, repl)
+                for pattern, repl in self.lib.replacements
+            ],
+            [
+                config[key].get() if config[key].exists() else None
+                for key in PATH_CONFIG
+            ],
+        )
+
+    def _encode(self, node: Node) -> list[Any]:
+        return [
+            {
+                name: [item_id, self._signatures.get(item_id)]
+                for name, item_id in node.files.items()
+            },
+            {name: self._encode(child) for name, child in node.dirs.items()},
+        ]
+
+    def save(self, path: str) -> None:
+        """Write a snapshot of the tree to the file at `path`."""
+        with self._lock:
+            data = {
+                "version": SNAPSHOT_VERSION,
+                "fingerprint": self._fingerprint(),
+                "albums": list(self._album_signatures.items()),
+                "tree": self._encode(self._root),
+                "hidden": [
+                    [item_id, self._signatures.get(item_id), path]
+                    for path, ids in self._hidden.items()
+                    for item_id in ids
+                ],
+            }
+        tmp = f"{path}.tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    def load(self, path: str) -> bool:
+        """Replace the tree with the snapshot in the file at `path`.
+
+        Return False, leaving the tree as it is, if the snapshot cannot
+        be read or was taken with other path formats. The tree must then
+        be synced with the library, which only computes the paths of
+        the items that changed since the snapshot.
+        """
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as exc:
+            log.debug("Ignoring unreadable tree snapshot {}: {}", path, exc)
+            return False
+        if (
+            data.get("version") != SNAPSHOT_VERSION
+            or data.get("fingerprint") != self._fingerprint()
+        ):
+            log.debug("Ignoring out of date tree snapshot {}", path)
+            return False
+
+        root = Node({}, {})
+        paths = {}
+        signatures = {}
+        hidden: dict[tuple[str, ...], set[int]] = {}
+        for item_id, signature, path in data["hidden"]:
+            paths[item_id] = path = tuple(map(sys.intern, path))
+            hidden.setdefault(path, set()).add(item_id)
+            if signature is not None:
+                signatures[item_id] = signature
+        stack: list[tuple[list[Any], Node, tuple[str, ...]]] = [
+            (data["tree"], root, ())
+        ]
+        while stack:
+            (files, dirs), node, prefix = stack.pop()
+            for name, (item_id, signature) in files.items():
+                node.files[name] = item_id
+                paths[item_id] = (*prefix, name)
+                if signature is not None:
+                    signatures[item_id] = signature
+            for name, child in dirs.items():
+                name = sys.intern(name)
+                node.dirs[name] = Node({}, {})
+                stack.append((child, node.dirs[name], (*prefix, name)))
+
+        with self._lock:
+            self._root = root
+            self._paths = paths
+            self._signatures = signatures
+            self._hidden = hidden
+            self._album_signatures = dict(data["albums"])
+        return True
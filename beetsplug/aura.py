@@ -2,11 +2,16 @@
 
 from __future__ import annotations
 
+import base64
+import binascii
+import json
 import os
 import re
+import threading
 from dataclasses import dataclass
 from mimetypes import guess_type
-from typing import TYPE_CHECKING, ClassVar, Protocol
+from typing import TYPE_CHECKING, Any, ClassVar, Protocol
+from urllib.parse import urlencode
 
 from flask import (
     Blueprint,
@@ -18,16 +23,24 @@ from flask import (
 )
 from typing_extensions import Self
 
-from beets import config
-from beets.dbcore import AndQuery, MatchQuery
-from beets.dbcore.query import NotQuery, RegexpQuery
-from beets.dbcore.sort import FixedFieldSort, MultipleSort, SlowFieldSort
+from beets import config, context
+from beets.dbcore import AndQuery, Cursor, MatchQuery, Results
+from beets.dbcore.query import NotQuery, RegexpQuery, TrueQuery
+from beets.dbcore.sort import (
+    FixedFieldSort,
+    FlexFieldSort,
+    MultipleSort,
+    SlowFieldSort,
+    order_by_sql,
+)
 from beets.library import Album, Item
 from beets.plugins import BeetsPlugin
 from beets.ui import Subcommand, _open_library
+from beetsplug._utils import fileserver
+from beetsplug._utils.httpcache import conditional, init_app, library_generation
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import Callable, Mapping, Sequence
 
     from beets.dbcore.query import SQLiteType
     from beets.library import LibModel, Library
@@ -112,6 +125,95 @@ ARTIST_ATTR_MAP = {
 }
 
 
+class LibraryCache:
+    """Values computed from the library, such as the tracks of albums or
+    the names of artists, kept between requests.
+
+    They are dropped whenever the generation of the library changes.
+    """
+
+    def __init__(self) -> None:
+        self._values: dict[tuple[str, Any], Any] = {}
+        self._version: tuple[str, int] | None = None
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def validate(self, lib: Library) -> None:
+        """Drop the values if the library was changed since they were
+        computed.
+        """
+        version = (str(lib.path), library_generation.current(lib)[0])
+        with self._lock:
+            if version != self._version:
+                self._values.clear()
+                self._version = version
+
+    def get(self, kind: str, key: Any, compute: Callable[[], Any]) -> Any:
+        """Return the value of this kind for the key, computing it if it
+        is not known yet.
+        """
+        with self._lock:
+            if (kind, key) in self._values:
+                return self._values[kind, key]
+        value = compute()
+        with self._lock:
+            self._values[kind, key] = value
+        return value
+
+    def get_many(
+        self,
+        kind: str,
+        keys: Sequence[Any],
+        compute: Callable[[list[Any]], Mapping[Any, Any]],
+    ) -> dict[Any, Any]:
+        """Return the values of this kind for the keys, computing the
+        missing ones with a single call.
+        """
+        with self._lock:
+            values = {
+                k: self._values[kind, k]
+                for k in keys
+                if (kind, k) in self._values
+            }
+        if missing := [k for k in keys if k not in values]:
+            computed = compute(missing)
+            with self._lock:
+                for k in missing:
+                    values[k] = self._values[kind, k] = computed[k]
+        return values
+
+
+library_cache = LibraryCache()
+
+
+def encode_cursor(cursor: Cursor) -> str | None:
+    """Encode a position in the results as an opaque page token, or
+    return None if it holds values that cannot be encoded.
+    """
+    if not all(
+        isinstance(key, (str, int, float, type(None))) for key in cursor.keys
+    ):
+        return None
+    data = json.dumps(cursor.keys, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode("ascii")
+
+
+def decode_cursor(token: str) -> Cursor | None:
+    """Decode a page token made by `encode_cursor`, or return None if it
+    is invalid.
+    """
+    try:
+        keys = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError):
+        return None
+    if not isinstance(keys, list) or not keys:
+        return None
+    return Cursor(tuple(keys))
+
+
 @dataclass
 class AURADocument:
     """Base class for building AURA documents."""
@@ -124,7 +226,9 @@ class AURADocument:
     @classmethod
     def from_app(cls) -> Self:
         """Initialise the document using the global app and request."""
-        return cls(current_app.config["lib"], request.args)
+        lib = current_app.config["lib"]
+        library_cache.validate(lib)
+        return cls(lib, request.args)
 
     @staticmethod
     def error(status, title, detail):
@@ -201,50 +305,72 @@ class AURADocument:
                 ascending = True
             # Get the beets version of the attribute name
             beets_attr = self.attribute_map.get(aura_attr, aura_attr)
-            # Use slow sort so it works with all fields (inc. computed)
-            sorts.append(SlowFieldSort(beets_attr, ascending=ascending))
+            # Let the database sort by stored fields; only computed
+            # fields need a slow sort.
+            if beets_attr in self.model_cls._fields:
+                sort = FixedFieldSort(beets_attr, ascending=ascending)
+            elif self.model_cls.flex_value_sql(beets_attr) is not None:
+                sort = FlexFieldSort(
+                    self.model_cls, beets_attr, ascending=ascending
+                )
+            else:
+                sort = SlowFieldSort(beets_attr, ascending=ascending)
+            sorts.append(sort)
         return MultipleSort(sorts)
 
-    def paginate(self, collection):
+    def next_url(self, **args):
+        """Build the URL of the current request with some arguments
+        replaced. Arguments set to None are removed.
+        """
+        next_args = {**self.args, **args}
+        query = urlencode({k: v for k, v in next_args.items() if v is not None})
+        return f"{request.base_url}?{query}"
+
+    def paginate(self, query, sort):
         """Get a page of the collection and the URL to the next page.
 
+        Pages are requested either by number, with the `page` argument,
+        or by the `cursor` token given in the link to the next page,
+        which lets the database resume the results without counting the
+        rows before the page.
+
         Args:
-            collection: The raw data from which resource objects can be
-                built. Could be an sqlite3.Cursor object (tracks and
-                albums) or a list of strings (artists).
+            query: A beets Query object.
+            sort: A beets Sort object.
         """
-        # Pages start from zero
-        page = self.args.get("page", 0, int)
         # Use page limit defined in config by default.
         default_limit = config["aura"]["page_limit"].get(int)
         limit = self.args.get("limit", default_limit, int)
-        # start = offset of first item to return
-        start = page * limit
-        # end = offset of last item + 1
-        end = start + limit
-        if end > len(collection):
-            end = len(collection)
+        if token := self.args.get("cursor"):
+            if (after := decode_cursor(token)) is None:
+                raise ValueError(token)
+            collection = self.get_collection(
+                query=query, sort=sort, limit=limit, after=after
+            )
+        else:
+            # Pages start from zero
+            page = self.args.get("page", 0, int)
+            collection = self.get_collection(
+                query=query, sort=sort, limit=limit, offset=page * limit
+            )
+        data = self.get_resource_objects(collection)
+        if len(data) < limit:
+            # This is the last page
             next_url = None
+        elif (
+            isinstance(collection, Results)
+            and (cursor := collection.cursor)
+            and (token := encode_cursor(cursor))
+        ):
+            next_url = self.next_url(cursor=token, page=None)
         else:
-            # Not the last page so work out links.next url
-            if not self.args:
-                # No existing arguments, so current page is 0
-                next_url = f"{request.url}?page=1"
-            elif not self.args.get("page", None):
-                # No existing page argument, so add one to the end
-                next_url = f"{request.url}&page=1"
-            else:
-                # Increment page token by 1
-                next_url = request.url.replace(
-                    f"page={page}", f"page={page + 1}"
-                )
-        # Get only the items in the page range
-        data = [
-            self.get_resource_object(self.lib, collection[i])
-            for i in range(start, end)
-        ]
+            next_url = self.next_url(page=self.args.get("page", 0, int) + 1)
         return data, next_url
 
+    def get_resource_objects(self, collection):
+        """Build the resource objects for a page of the collection."""
+        return [self.get_resource_object(self.lib, o) for o in collection]
+
     def get_included(self, data, include_str):
         """Build a list of resource objects for inclusion.
 
@@ -316,10 +442,15 @@ class AURADocument:
             )
         else:
             sort = None
-        # Get information from the library
-        collection = self.get_collection(query=query, sort=sort)
-        # Convert info to AURA form and paginate it
-        data, next_url = self.paginate(collection)
+        # Get a page of information from the library in AURA form
+        try:
+            data, next_url = self.paginate(query, sort)
+        except ValueError:
+            return self.error(
+                "400 Bad Request",
+                "Invalid page cursor.",
+                "The cursor does not point into these results.",
+            )
         document = {"data": data}
         # If there are more pages then provide a way to access them
         if next_url:
@@ -354,14 +485,19 @@ class TrackDocument(AURADocument):
 
     attribute_map = TRACK_ATTR_MAP
 
-    def get_collection(self, query=None, sort=None):
+    def get_collection(
+        self, query=None, sort=None, limit=None, offset=None, after=None
+    ):
         """Get Item objects from the library.
 
         Args:
             query: A beets Query object or a beets query string.
             sort: A beets Sort object.
+            limit: The maximum number of objects to get.
+            offset: The number of objects to skip.
+            after: A beets Cursor to resume the results from.
         """
-        return self.lib.items(query, sort)
+        return self.lib.items(query, sort, limit, offset, after)
 
     @classmethod
     def get_attribute_converter(cls, beets_attr: str) -> type[SQLiteType]:
@@ -434,14 +570,54 @@ class AlbumDocument(AURADocument):
 
     attribute_map = ALBUM_ATTR_MAP
 
-    def get_collection(self, query=None, sort=None):
+    def get_collection(
+        self, query=None, sort=None, limit=None, offset=None, after=None
+    ):
         """Get Album objects from the library.
 
         Args:
             query: A beets Query object or a beets query string.
             sort: A beets Sort object.
+            limit: The maximum number of objects to get.
+            offset: The number of objects to skip.
+            after: A beets Cursor to resume the results from.
         """
-        return self.lib.albums(query, sort)
+        return self.lib.albums(query, sort, limit, offset, after)
+
+    @staticmethod
+    def get_tracks(lib: Library, album_ids):
+        """Get the ids and artists of the tracks on each album, sorted by
+        track number, with one query for the albums not cached yet.
+
+        Args:
+            album_ids: A list of beets album ids.
+        """
+
+        def fetch(ids):
+            tracks = {album_id: [] for album_id in ids}
+            with lib.transaction() as tx:
+                # Stay well below SQLite's limit on query parameters
+                for i in range(0, len(ids), 500):
+                    chunk = ids[i : i + 500]
+                    rows = tx.query(
+                        "SELECT album_id, id, artist FROM items "
+                        f"WHERE album_id IN ({', '.join('?' * len(chunk))}) "
+                        "ORDER BY album_id, track, id",
+                        chunk,
+                    )
+                    for album_id, track_id, artist in rows:
+                        tracks[album_id].append((track_id, artist))
+            return tracks
+
+        return library_cache.get_many("album_tracks", album_ids, fetch)
+
+    def get_resource_objects(self, collection):
+        """Build the resource objects for a page of albums, fetching the
+        tracks of all of them at once.
+        """
+        albums = list(collection)
+        self.get_tracks(self.lib, [album.id for album in albums])
+        return [self.get_resource_object(self.lib, a) for a in albums]
 
     @staticmethod
     def get_resource_object(lib: Library, album):
@@ -459,15 +635,16 @@ class AlbumDocument(AURADocument):
             if a:
                 attributes[aura_attr] = a
 
-        # Get beets Item objects for all tracks in the album sorted by
+        # Get the ids and artists of all tracks in the album sorted by
         # track number. Sorting is not required but it's nice.
-        query = MatchQuery("album_id", album.id)
-        sort = FixedFieldSort("track", ascending=True)
-        tracks = lib.items(query, sort)
+        tracks = AlbumDocument.get_tracks(lib, [album.id])[album.id]
         # JSON:API one-to-many relationship to tracks on the album
         relationships = {
             "tracks": {
-                "data": [{"type": "track", "id": str(t.id)} for t in tracks]
+                "data": [
+                    {"type": "track", "id": str(track_id)}
+                    for track_id, _ in tracks
+                ]
             }
         }
         # Add images relationship if album has associated images
@@ -481,7 +658,7 @@ class AlbumDocument(AURADocument):
         # Add artist relationship if artist name is same on tracks
         # Tracks are used to define artists so don't albumartist
         # Check for all tracks in case some have featured artists
-        if album.albumartist in [t.artist for t in tracks]:
+        if album.albumartist in {artist for _, artist in tracks}:
             relationships["artists"] = {
                 "data": [{"type": "artist", "id": album.albumartist}]
             }
@@ -518,26 +695,80 @@ class ArtistDocument(AURADocument):
 
     attribute_map = ARTIST_ATTR_MAP
 
-    def get_collection(self, query=None, sort=None):
+    def get_artists(self, query, sort):
+        """Get the names of the artists of the tracks matching the query,
+        in the order in which they first appear in the sorted tracks.
+
+        Args:
+            query: A beets Query object.
+            sort: A beets Sort object.
+        """
+        sort = sort or self.lib.get_default_item_sort()
+        where, subvals, slow_query = query.split(Item)
+        if (
+            slow_query
+            or sort.is_slow()
+            or query.field_names & Item.other_db_fields
+        ):
+            # Gets only tracks with matching artist information
+            tracks = self.lib.items(query, sort)
+            return list(dict.fromkeys(track.artist for track in tracks))
+
+        order_by = order_by_sql([*sort.order_terms(), ("id", True)])
+        with self.lib.transaction() as tx:
+            rows = tx.query(
+                "SELECT artist FROM ("
+                f"SELECT artist, ROW_NUMBER() OVER (ORDER BY {order_by}) AS pos "
+                f"FROM items WHERE {where or 1}"
+                ") GROUP BY artist ORDER BY MIN(pos)",
+                subvals,
+            )
+        return [row[0] for row in rows]
+
+    def get_collection(
+        self, query=None, sort=None, limit=None, offset=None, after=None
+    ):
         """Get a list of artist names from the library.
 
+        The list of all matching artists is kept until the library
+        changes, so that the following pages are served from it.
+
         Args:
-            query: A beets Query object or a beets query string.
+            query: A beets Query object.
             sort: A beets Sort object.
+            limit: The maximum number of artists to get.
+            offset: The number of artists to skip.
+            after: Not supported, artists are paginated by number.
         """
-        # Gets only tracks with matching artist information
-        tracks = self.lib.items(query, sort)
-        collection = []
-        for track in tracks:
-            # Do not add duplicates
-            if track.artist not in collection:
-                collection.append(track.artist)
-        return collection
+        if after is not None:
+            raise ValueError("cannot resume artists from a cursor")
+        # An empty query matches every track
+        query = query or TrueQuery()
+        artists = library_cache.get(
+            "artists", (query, sort), lambda: self.get_artists(query, sort)
+        )
+        start = offset or 0
+        stop = None if limit is None else start + limit
+        return artists[start:stop]
 
     @staticmethod
     def get_resource_object(lib: Library, artist_id):
         """Construct a JSON:API resource object for the given artist.
 
+        Args:
+            artist_id: A string which is the artist's name.
+        """
+        return library_cache.get(
+            "artist",
+            artist_id,
+            lambda: ArtistDocument.build_resource_object(lib, artist_id),
+        )
+
+    @staticmethod
+    def build_resource_object(lib: Library, artist_id):
+        """Construct a JSON:API resource object for the given artist
+        from the library.
+
         Args:
             artist_id: A string which is the artist's name.
         """
@@ -722,6 +953,16 @@ class ImageDocument(AURADocument):
 aura_bp = Blueprint("aura_bp", __name__)
 
 
+@aura_bp.before_request
+def before_request():
+    """Resolve the paths of tracks against the library's directory.
+
+    Requests are served on threads of their own, which do not inherit
+    it from the thread that opened the library.
+    """
+    context.set_music_dir(current_app.config["lib"].directory)
+
+
 @aura_bp.route("/server")
 def server_info():
     """Respond with info about the server."""
@@ -732,12 +973,14 @@ def server_info():
 
 
 @aura_bp.route("/tracks")
+@conditional
 def all_tracks():
     """Respond with a list of all tracks and related information."""
     return TrackDocument.from_app().all_resources()
 
 
 @aura_bp.route("/tracks/<int:track_id>")
+@conditional
 def single_track(track_id):
     """Respond with info about the specified track.
 
@@ -793,13 +1036,13 @@ def audio_file(track_id):
             f" {file_mimetype} and bitrate parameters are not supported.",
         )
 
-    return send_file(
+    return fileserver.send_file(
         path,
         mimetype=file_mimetype,
         # Handles filename in Content-Disposition header
-        as_attachment=True,
-        # Tries to upgrade the stream to support range requests
-        conditional=True,
+        download_name=os.path.basename(path),
+        read_ahead=config["aura"]["read_ahead"].get(int) * 1024,
+        sendfile=config["aura"]["sendfile"].get(bool),
     )
 
 
@@ -807,12 +1050,14 @@ def audio_file(track_id):
 
 
 @aura_bp.route("/albums")
+@conditional
 def all_albums():
     """Respond with a list of all albums and related information."""
     return AlbumDocument.from_app().all_resources()
 
 
 @aura_bp.route("/albums/<int:album_id>")
+@conditional
 def single_album(album_id):
     """Respond with info about the specified album.
 
@@ -827,6 +1072,7 @@ def single_album(album_id):
 
 
 @aura_bp.route("/artists")
+@conditional
 def all_artists():
     """Respond with a list of all artists and related information."""
     return ArtistDocument.from_app().all_resources()
@@ -834,6 +1080,7 @@ def all_artists():
 
 # Using the path converter allows slashes in artist_id
 @aura_bp.route("/artists/<path:artist_id>")
+@conditional
 def single_artist(artist_id):
     """Respond with info about the specified artist.
 
@@ -850,6 +1097,7 @@ def single_artist(artist_id):
 
 
 @aura_bp.route("/images/<string:image_id>")
+@conditional
 def single_image(image_id):
     """Respond with info about the specified image.
 
@@ -890,6 +1138,9 @@ def create_app():
             "cors": [],
             "cors_supports_credentials": False,
             "page_limit": 500,
+            "cache_size": 64,
+            "read_ahead": 256,
+            "sendfile": True,
         }
     )
 
@@ -906,6 +1157,8 @@ def create_app():
     # by an external WSGI server.
     # NOTE: this uses a 'private' function from beets.ui.__init__
     app.config["lib"] = _open_library(config)
+    # Keep the responses of hot endpoints in memory, sizes in megabytes
+    init_app(app, config["aura"]["cache_size"].get(int) * 2**20)
 
     # Enable CORS if required
     cors = config["aura"]["cors"].as_str_seq(list)
@@ -932,6 +1185,13 @@ class AURAPlugin(BeetsPlugin):
     def __init__(self):
         """Add configuration options for the AURA plugin."""
         super().__init__()
+        self.register_listener("database_change", self.database_changed)
+
+    def database_changed(self, lib, model, models):
+        """Start a new generation of the library, which invalidates the
+        values and responses computed from it.
+        """
+        library_generation.bump()
 
     def commands(self):
         """Add subcommand used to run the AURA server."""
@@ -3,11 +3,20 @@
 from __future__ import annotations
 
 import cProfile
+import http.client
+import logging
+import os
+import statistics
+import threading
+import time
 import timeit
+import tracemalloc
+from tempfile import TemporaryDirectory
 from typing import TYPE_CHECKING, Protocol
 
-from beets import importer, plugins, ui
+from beets import config, importer, library, plugins, ui
 from beets.autotag import Source, tag_album
+from beets.autotag.distance import normalize_cache_stats, string_dist_cache
 from beets.plugins import BeetsPlugin
 from beets.util.pathformats import PF_KEY_DEFAULT
 from beetsplug._utils import vfs
@@ -27,6 +36,36 @@ class BenchMatch(Protocol):
     id: str | None
 
 
+class BenchResults(Protocol):
+    profile: bool
+    album: bool
+
+
+class BenchDestination(Protocol):
+    profile: bool
+
+
+class BenchWeb(Protocol):
+    profile: bool
+    album: bool
+    fields: str | None
+
+
+class BenchStream(Protocol):
+    requests: int
+
+
+class BenchVfs(Protocol):
+    changes: int
+    memory: bool
+
+
+class BenchConcurrency(Protocol):
+    duration: float
+    readers: int
+    hold: float
+
+
 def aunique_benchmark(
     lib: Library, opts: BenchAunique, args: list[str]
 ) -> None:
@@ -84,13 +123,273 @@ def match_benchmark(lib: Library, opts: BenchMatch, args: list[str]) -> None:
         source = Source.from_items(items)
         tag_album(source, search_ids=[id_])
 
+    with string_dist_cache() as cache:
+        if opts.profile:
+            cProfile.runctx(
+                "_run_match()", {}, {"_run_match": _run_match}, "match.prof"
+            )
+        else:
+            interval = timeit.timeit(_run_match, number=1)
+            print("match duration:", interval)
+
+    def _hit_rate(hits: int, misses: int) -> str:
+        rate = hits / (hits + misses) if hits + misses else 0
+        return f"{hits} hits, {misses} misses ({rate:.0%})"
+
+    print("string normalization cache:", _hit_rate(*normalize_cache_stats()))
+    print("string distance cache:", _hit_rate(cache.hits, cache.misses))
+
+
+def results_benchmark(
+    lib: Library, opts: BenchResults, args: list[str]
+) -> None:
+    def _materialize():
+        start = time.perf_counter()
+        results = lib.albums(args) if opts.album else lib.items(args)
+        queried = time.perf_counter()
+
+        count = 0
+        first = None
+        for _ in results:
+            if first is None:
+                first = time.perf_counter()
+            count += 1
+        end = time.perf_counter()
+
+        print("  objects:", count)
+        print("  query duration:", queried - start)
+        print("  time to first object:", (first or end) - start)
+        print("  materialization duration:", end - start)
+
+    # Compare fetching flexible attributes in the main query against
+    # fetching them in a second query that repeats the filter.
+    for name, join in (("joined", True), ("separate", False)):
+        lib.join_flex_attributes = join
+        print(f"With {name} flexible attributes:")
+        if opts.profile:
+            cProfile.runctx(
+                "_materialize()",
+                {},
+                {"_materialize": _materialize},
+                f"results.{name}.prof",
+            )
+        else:
+            _materialize()
+
+
+def destination_benchmark(
+    lib: Library, opts: BenchDestination, args: list[str]
+) -> None:
+    items = list(lib.items(args))
+
+    def _destinations():
+        for item in items:
+            item.destination()
+
+    if opts.profile:
+        cProfile.runctx(
+            "_destinations()",
+            {},
+            {"_destinations": _destinations},
+            "destination.prof",
+        )
+    else:
+        interval = timeit.timeit(_destinations, number=1)
+        print("paths:", len(items))
+        print("destination duration:", interval)
+        print("paths per second:", len(items) / interval if interval else 0)
+
+
+def web_benchmark(lib: Library, opts: BenchWeb, args: list[str]) -> None:
+    # The web plugin needs Flask, which is an optional dependency.
+    from beetsplug import web
+
+    web.app.config["lib"] = lib
+    query = f"?fields={opts.fields}" if opts.fields else ""
+    results = lib.albums(args) if opts.album else lib.items(args)
+
+    def _serialize():
+        with web.app.test_request_context(query):
+            web.g.lib = lib
+            return sum(map(len, web.json_generator(results, root="results")))
+
     if opts.profile:
         cProfile.runctx(
-            "_run_match()", {}, {"_run_match": _run_match}, "match.prof"
+            "_serialize()", {}, {"_serialize": _serialize}, "web.prof"
         )
     else:
-        interval = timeit.timeit(_run_match, number=1)
-        print("match duration:", interval)
+        start = time.perf_counter()
+        size = _serialize()
+        interval = time.perf_counter() - start
+        print("objects:", len(results))
+        print("response size:", size)
+        print("serialization duration:", interval)
+        print("objects per second:", len(results) / interval if interval else 0)
+
+
+def stream_benchmark(lib: Library, opts: BenchStream, args: list[str]) -> None:
+    # The web plugin needs Flask, which is an optional dependency.
+    from werkzeug.serving import make_server
+
+    from beetsplug import web
+
+    item = lib.items(args).get()
+    if not item:
+        raise ui.UserError("no matching item")
+    size = os.path.getsize(item.filepath)
+    url = f"/item/{item.id}/file"
+
+    web.app.config["lib"] = lib
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = make_server("127.0.0.1", 0, web.app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+
+    def _fetch(headers: dict[str, str]) -> tuple[float, int]:
+        conn = http.client.HTTPConnection("127.0.0.1", server.port)
+        start = time.perf_counter()
+        conn.request("GET", url, headers=headers)
+        response = conn.getresponse()
+        if response.status not in {200, 206}:
+            raise ui.UserError(f"{url} answered {response.status}")
+        first = response.read(1)
+        ttfb = time.perf_counter() - start
+        length = len(first) + len(response.read())
+        conn.close()
+        return ttfb, length
+
+    # Fetch the whole file, then seek to its middle as a player would,
+    # with the kernel copying the file and with reads in Python.
+    try:
+        for sendfile in (True, False):
+            web.app.config["SENDFILE"] = sendfile
+            for label, headers in (
+                ("whole file", {}),
+                ("second half", {"Range": f"bytes={size // 2}-"}),
+            ):
+                start = time.perf_counter()
+                results = [_fetch(headers) for _ in range(opts.requests)]
+                interval = time.perf_counter() - start
+                total = sum(length for _, length in results)
+                print(f"{label}, {'sendfile' if sendfile else 'read'}:")
+                print(
+                    "  median time to first byte:",
+                    statistics.median(ttfb for ttfb, _ in results),
+                )
+                print(
+                    "  throughput (MB/s):",
+                    total / interval / 2**20 if interval else 0,
+                )
+    finally:
+        server.shutdown()
+        thread.join()
+
+
+def concurrency_benchmark(
+    lib: Library, opts: BenchConcurrency, args: list[str]
+) -> None:
+    def _stress(copy: Library) -> list[float]:
+        items = list(copy.items())
+        stop = threading.Event()
+        latencies: list[float] = []
+
+        def _write():
+            # Rewrite a batch of items at a time, as the importer or
+            # `beet modify` would, keeping the transaction open for a
+            # while as slower writers do.
+            count = 0
+            while not stop.is_set():
+                with copy.transaction():
+                    for item in items[:100]:
+                        item["bench_revision"] = count
+                    copy.store_many(items[:100])
+                    time.sleep(opts.hold / 1000)
+                count += 1
+                time.sleep(opts.hold / 1000)
+
+        def _read():
+            while not stop.is_set():
+                start = time.perf_counter()
+                list(copy.items(args))
+                latencies.append(time.perf_counter() - start)
+
+        threads = [threading.Thread(target=_write)] + [
+            threading.Thread(target=_read) for _ in range(opts.readers)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(opts.duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        copy._close()
+        return sorted(latencies)
+
+    # Measure the read latency on a copy of the library, with and
+    # without the write-ahead log, while items are being written.
+    for wal in (False, True):
+        with TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "library.db")
+            lib.create_backup(path)
+            config["wal"] = wal
+            latencies = _stress(library.Library(path, lib.directory))
+
+        print("With write-ahead log:" if wal else "With rollback journal:")
+        print("  queries:", len(latencies))
+        if latencies:
+            print("  median latency:", statistics.median(latencies))
+            print(
+                "  95th percentile latency:",
+                latencies[int(len(latencies) * 0.95)],
+            )
+            print("  max latency:", latencies[-1])
+
+
+def vfs_benchmark(lib: Library, opts: BenchVfs, args: list[str]) -> None:
+    def _measure(label, func):
+        if opts.memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        result = func()
+        interval = time.perf_counter() - start
+        print(f"{label}:")
+        print("  duration:", interval)
+        if opts.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print("  retained memory (MB):", current / 2**20)
+            print("  peak memory (MB):", peak / 2**20)
+        return result
+
+    # Work on a copy of the library, whose items are changed to measure
+    # incremental updates.
+    with TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "library.db")
+        lib.create_backup(path)
+        copy = library.Library(path, lib.directory)
+        snapshot = os.path.join(tmp, "tree.json.gz")
+
+        _measure("Full rebuild", lambda: vfs.libtree(copy))
+        tree = vfs.LibraryTree(copy)
+        _measure("Tree built from scratch", tree.sync)
+        _measure("Snapshot saved", lambda: tree.save(snapshot))
+        print("  snapshot size (MB):", os.path.getsize(snapshot) / 2**20)
+
+        def _load() -> vfs.LibraryTree:
+            loaded = vfs.LibraryTree(copy)
+            loaded.load(snapshot)
+            loaded.sync()
+            return loaded
+
+        tree = _measure("Tree loaded from snapshot", _load)
+
+        items = list(copy.items(args))[: opts.changes]
+        for item in items:
+            item.title = f"{item.title} (bench)"
+        copy.store_many(items)
+        tree.invalidate(item.id for item in items)
+        _measure(f"Tree updated for {len(items)} items", lambda: tree.root)
+        copy._close()
 
 
 class BenchmarkPlugin(BeetsPlugin):
@@ -124,4 +423,114 @@ class BenchmarkPlugin(BeetsPlugin):
         )
         match_bench_cmd.func = match_benchmark
 
-        return [aunique_bench_cmd, match_bench_cmd]
+        results_bench_cmd = ui.Subcommand(
+            "bench_results", help="benchmark for query result materialization"
+        )
+        results_bench_cmd.parser.add_option(
+            "-p",
+            "--profile",
+            action="store_true",
+            default=False,
+            help="performance profiling",
+        )
+        results_bench_cmd.parser.add_album_option()
+        results_bench_cmd.func = results_benchmark
+
+        destination_bench_cmd = ui.Subcommand(
+            "bench_destination", help="benchmark for item destination paths"
+        )
+        destination_bench_cmd.parser.add_option(
+            "-p",
+            "--profile",
+            action="store_true",
+            default=False,
+            help="performance profiling",
+        )
+        destination_bench_cmd.func = destination_benchmark
+
+        web_bench_cmd = ui.Subcommand(
+            "bench_web", help="benchmark for web plugin JSON responses"
+        )
+        web_bench_cmd.parser.add_option(
+            "-p",
+            "--profile",
+            action="store_true",
+            default=False,
+            help="performance profiling",
+        )
+        web_bench_cmd.parser.add_option(
+            "-f",
+            "--fields",
+            default=None,
+            help="comma-separated fields to include in the response",
+        )
+        web_bench_cmd.parser.add_album_option()
+        web_bench_cmd.func = web_benchmark
+
+        stream_bench_cmd = ui.Subcommand(
+            "bench_stream", help="benchmark for web plugin audio streaming"
+        )
+        stream_bench_cmd.parser.add_option(
+            "-n",
+            "--requests",
+            type="int",
+            default=10,
+            help="number of requests of each kind",
+        )
+        stream_bench_cmd.func = stream_benchmark
+
+        concurrency_bench_cmd = ui.Subcommand(
+            "bench_concurrency",
+            help="benchmark for read latency under concurrent writes",
+        )
+        concurrency_bench_cmd.parser.add_option(
+            "-d",
+            "--duration",
+            type="float",
+            default=5.0,
+            help="seconds to run each mode for",
+        )
+        concurrency_bench_cmd.parser.add_option(
+            "-r",
+            "--readers",
+            type="int",
+            default=4,
+            help="number of reading threads",
+        )
+        concurrency_bench_cmd.parser.add_option(
+            "--hold",
+            type="float",
+            default=20.0,
+            help="milliseconds each write transaction stays open",
+        )
+        concurrency_bench_cmd.func = concurrency_benchmark
+
+        vfs_bench_cmd = ui.Subcommand(
+            "bench_vfs", help="benchmark for the BPD directory tree"
+        )
+        vfs_bench_cmd.parser.add_option(
+            "-n",
+            "--changes",
+            type="int",
+            default=100,
+            help="number of items changed for the incremental update",
+        )
+        vfs_bench_cmd.parser.add_option(
+            "-m",
+            "--memory",
+            action="store_true",
+            default=False,
+            help="trace memory allocations (slows down the measurements)",
+        )
+        vfs_bench_cmd.func = vfs_benchmark
+
+        return [
+            aunique_bench_cmd,
+            match_bench_cmd,
+            results_bench_cmd,
+            destination_bench_cmd,
+            web_bench_cmd,
+            stream_bench_cmd,
+            concurrency_bench_cmd,
+            vfs_bench_cmd,
+        ]
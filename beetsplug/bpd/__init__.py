@@ -8,6 +8,7 @@ from __future__ import annotations
 import asyncio
 import inspect
 import math
+import os
 import random
 import re
 import socket
@@ -1121,10 +1122,16 @@ class Server(BaseServer):
     to store its library.
     """
 
-    def __init__(self, library, host, port, password, ctrl_port, log):
+    def __init__(
+        self, library, host, port, password, ctrl_port, log, snapshot=None
+    ):
         log.info("Starting server...")
         super().__init__(host, port, password, ctrl_port, log)
         self.lib = library
+        self.snapshot = snapshot
+        self.tree = vfs.LibraryTree(library)
+        if snapshot and self.tree.load(snapshot):
+            log.debug("Loaded directory tree from {}.", snapshot)
         self.player = gstplayer.GstPlayer(self.play_finished)
         self.cmd_update(None)
         log.info("Server ready and listening on {}:{}", host, port)
@@ -1188,13 +1195,29 @@ class Server(BaseServer):
         """Updates the catalog to reflect the current database state."""
         # Path is ignored. Also, the real MPD does this asynchronously;
         # this is done inline.
-        self._log.debug("Building directory tree...")
-        self.tree = vfs.libtree(self.lib)
-        self._log.debug("Finished building directory tree.")
+        self._log.debug("Updating directory tree...")
+        changed = self.tree.sync()
+        self._log.debug("Updated {} paths in directory tree.", changed)
+        if changed and self.snapshot:
+            try:
+                self.tree.save(self.snapshot)
+            except OSError as exc:
+                self._log.warning(
+                    "Could not save directory tree to {}: {}",
+                    self.snapshot,
+                    exc,
+                )
         self.updated_time = time.time()
         self._send_event("update")
         self._send_event("database")
 
+    def cmd_rescan(self, conn, path="/"):
+        """Rebuilds the catalog from scratch, computing the path of every
+        item again.
+        """
+        self.tree = vfs.LibraryTree(self.lib)
+        self.cmd_update(conn, path)
+
     # Path (directory tree) browsing.
 
     def _resolve_path(self, path):
@@ -1202,7 +1225,7 @@ class Server(BaseServer):
         If the path does not exist, raises a
         """
         components = path.split("/")
-        node = self.tree
+        node = self.tree.root
 
         for component in components:
             if not component:
@@ -1609,15 +1632,40 @@ class BPDPlugin(BeetsPlugin):
                 "control_port": 6601,
                 "password": "",
                 "volume": VOLUME_MAX,
+                "snapshot": os.path.join(
+                    beets.config.config_dir(), "bpd_tree.json.gz"
+                ),
             }
         )
         self.config["password"].redact = True
+        self.server = None
+
+        self.register_listener("database_change", self.database_change)
+        self.register_listener("item_moved", self.item_changed)
+        self.register_listener("item_removed", self.item_changed)
+
+    def database_change(self, lib, model, models):
+        """Have the directory tree check the changed items."""
+        if self.server is not None and lib is self.server.lib:
+            self.server.tree.invalidate(
+                m.id for m in models if isinstance(m, Item)
+            )
+
+    def item_changed(self, item):
+        """Have the directory tree check a moved or removed item."""
+        if self.server is not None and item.id is not None:
+            self.server.tree.invalidate([item.id])
 
     def start_bpd(self, lib, host, port, password, volume, ctrl_port):
         """Starts a BPD server."""
-        server = Server(lib, host, port, password, ctrl_port, self._log)
-        server.cmd_setvol(None, volume)
-        server.run()
+        snapshot = None
+        if self.config["snapshot"].get():
+            snapshot = self.config["snapshot"].as_filename()
+        self.server = Server(
+            lib, host, port, password, ctrl_port, self._log, snapshot
+        )
+        self.server.cmd_setvol(None, volume)
+        self.server.run()
 
     def commands(self):
         cmd = beets.ui.Subcommand(
@@ -10,7 +10,6 @@
 from __future__ import annotations
 
 from collections import deque
-from itertools import islice
 from typing import TYPE_CHECKING, Protocol
 
 from beets.dbcore import FieldQuery
@@ -37,15 +36,15 @@ def lslimit(lib: Library, opts: LsLimitCLIOpts, args: list[str]) -> None:
     if (opts.head or opts.tail or 0) < 0:
         raise ValueError("Limit value must be non-negative")
 
+    # The head of a query is fetched with a database limit, so only the
+    # objects that are printed get built.
     objs: Iterable[LibModel]
     if opts.album:
-        objs = lib.albums(args)
+        objs = lib.albums(args, limit=opts.head)
     else:
-        objs = lib.items(args)
+        objs = lib.items(args, limit=opts.head)
 
-    if opts.head is not None:
-        objs = islice(objs, opts.head)
-    elif opts.tail is not None:
+    if opts.tail is not None:
         objs = deque(objs, opts.tail)
 
     for obj in objs:
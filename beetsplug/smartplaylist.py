@@ -28,7 +28,7 @@ from beets.util import (
 )
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Iterator, Sequence
 
     from beets.library import LibModel, Library
 
@@ -287,16 +287,25 @@ class SmartPlaylistPlugin(plugins.BeetsPlugin):
             return self._matches_query(model, query)
         return False
 
-    def db_change(self, lib: Library, model: LibModel) -> None:
+    def db_change(
+        self,
+        lib: Library,
+        model: LibModel,
+        models: Sequence[LibModel] | None = None,
+    ) -> None:
         if self._unmatched_playlists is None:
             self.build_queries()
 
         for playlist in self._unmatched_playlists:
             n, (q, _), (a_q, _) = playlist
-            if self.matches(model, q, a_q):
-                self._log.debug("{} will be updated because of {}", n, model)
-                self._matched_playlists.add(playlist)
-                self.register_listener("cli_exit", self.update_playlists)
+            for changed in models or [model]:
+                if self.matches(changed, q, a_q):
+                    self._log.debug(
+                        "{} will be updated because of {}", n, changed
+                    )
+                    self._matched_playlists.add(playlist)
+                    self.register_listener("cli_exit", self.update_playlists)
+                    break
 
         self._unmatched_playlists -= self._matched_playlists
 
@@ -6,6 +6,7 @@ import base64
 import json
 import os
 import typing as t
+from itertools import islice
 from typing import TYPE_CHECKING, Protocol
 
 import flask
@@ -14,11 +15,16 @@ from unidecode import unidecode
 from werkzeug.routing import BaseConverter, PathConverter
 
 import beets.library
-from beets import ui, util
-from beets.dbcore.query import PathQuery
+from beets import context, ui, util
+from beets.dbcore import Results
+from beets.dbcore.query import MatchQuery, PathQuery
 from beets.plugins import BeetsPlugin
+from beetsplug._utils import fileserver
+from beetsplug._utils.httpcache import conditional, init_app, library_generation
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from beets.library import Library
 
 
@@ -39,45 +45,193 @@ else:
 
 # Utilities.
 
+#: The number of objects serialized into each chunk of a streamed response.
+CHUNK_SIZE = 256
 
-def _rep(obj, expand=False):
-    """Get a flat -- i.e., JSON-ish -- representation of a beets Item or
-    Album object. For Albums, `expand` dictates whether tracks are
-    included.
+#: Sizes of the files of items, by item id, along with the mtime of the
+#: item they were read for, for the ``cached`` `file_size` mode.
+_file_sizes: dict[int, tuple[float, int]] = {}
+
+
+class Serializer:
+    """Build the flat -- i.e., JSON-ish -- representations of beets Items
+    and Albums for a request.
+
+    The representations are built straight from the database rows of
+    query results when the database evaluated the whole query, without
+    constructing the objects, and the album fields of items are only
+    looked up once per album.
     """
-    out = dict(obj)
 
-    if isinstance(obj, beets.library.Item):
-        if app.config.get("INCLUDE_PATHS", False):
-            out["path"] = util.displayable_path(out["path"])
+    def __init__(
+        self, fields: Sequence[str] | None = None, expand: bool = False
+    ) -> None:
+        """`fields` limits the representations to these fields. For
+        Albums, `expand` dictates whether tracks are included.
+        """
+        self.lib = g.lib
+        self.fields = fields
+        self.expand = expand
+        self.include_paths = app.config.get("INCLUDE_PATHS", False)
+        self.file_size = app.config.get("FILE_SIZE", "stat")
+        self._albums: dict[int, dict[str, t.Any]] = {}
+        self._field_converters: dict[type, dict[str, t.Callable]] = {}
+
+    def _album_values(self, album_id: int | None) -> dict[str, t.Any]:
+        """Return the fields of an album, which its items fall back to."""
+        if not album_id:
+            return {}
+        if album_id not in self._albums:
+            album = self.lib.get_album(album_id)
+            self._albums[album_id] = dict(album) if album else {}
+        return self._albums[album_id]
+
+    def _converters(self, model_cls) -> dict[str, t.Callable[[t.Any], t.Any]]:
+        """Return the functions converting the fixed fields of a model
+        from their database values, limited to the requested fields.
+        """
+        if model_cls not in self._field_converters:
+            keys = model_cls._fields.keys()
+            if self.fields is not None:
+                # Items also need the fields their size is looked up by.
+                keys &= {*self.fields, "id", "path", "mtime", "album_id"}
+            self._field_converters[model_cls] = {
+                key: model_cls._type(key).from_sql for key in keys
+            }
+        return self._field_converters[model_cls]
+
+    def _row_values(
+        self, model_cls: type[beets.library.LibModel], row, flex
+    ) -> dict[str, t.Any]:
+        """Return the fields of the object stored in a database row, like
+        `dict(obj)` would, but only convert the requested ones.
+        """
+        convert = model_cls._convert
+        values = {
+            key: convert(key, value)
+            for key, value in flex.items()
+            if self._wants(key)
+        }
+        for key, from_sql in self._converters(model_cls).items():
+            values[key] = from_sql(row[key])
+        if model_cls is beets.library.Item and (
+            self.fields is None or any(f not in values for f in self.fields)
+        ):
+            values = {**self._album_values(values["album_id"]), **values}
+        return values
+
+    def values(self, objs) -> t.Iterator[dict[str, t.Any]]:
+        """Generate the fields of each Item or Album, like `dict(obj)`."""
+        if isinstance(objs, Results) and not objs.needs_objects:
+            model_cls = objs.model_class
+            for row, flex in objs.raw():
+                yield self._row_values(model_cls, row, flex)
         else:
-            del out["path"]
+            for obj in objs:
+                if isinstance(obj, beets.library.Item):
+                    # Look the album fields up only once per album.
+                    keys = obj.keys(with_album=False)
+                    values = {key: obj[key] for key in keys}
+                    yield {**self._album_values(obj.album_id), **values}
+                else:
+                    yield dict(obj)
+
+    def _project(self, values: dict[str, t.Any]) -> dict[str, t.Any]:
+        if self.fields is None:
+            return values
+        return {key: values[key] for key in self.fields if key in values}
+
+    def _wants(self, key: str) -> bool:
+        return self.fields is None or key in self.fields
+
+    def _size(self, values: dict[str, t.Any]) -> int:
+        """Get the size (in bytes) of the backing file of an item."""
+        path = values["path"]
+        cached = _file_sizes.get(values["id"])
+        if self.file_size == "cached" and cached:
+            mtime, size = cached
+            if mtime == values["mtime"]:
+                return size
+
+        try:
+            size = os.path.getsize(util.syspath(path))
+        except OSError:
+            size = 0
+        if self.file_size == "cached":
+            _file_sizes[values["id"]] = (values["mtime"], size)
+        return size
+
+    def item(self, values: dict[str, t.Any]) -> dict[str, t.Any]:
+        """Build the representation of an Item from its fields."""
+        # Get the size (in bytes) of the backing file. This is useful
+        # for the Tomahawk resolver API.
+        size = None
+        if self.file_size != "none" and self._wants("size"):
+            size = self._size(values)
+
+        out = self._project(values)
+        if "path" in out:
+            if self.include_paths:
+                out["path"] = util.displayable_path(out["path"])
+            else:
+                del out["path"]
 
         # Filter all bytes attributes and convert them to strings.
         for key, value in out.items():
-            if isinstance(out[key], bytes):
+            if isinstance(value, bytes):
                 out[key] = base64.b64encode(value).decode("ascii")
 
-        # Get the size (in bytes) of the backing file. This is useful
-        # for the Tomahawk resolver API.
-        try:
-            out["size"] = os.path.getsize(util.syspath(obj.path))
-        except OSError:
-            out["size"] = 0
+        if size is not None:
+            out["size"] = size
 
         return out
 
-    if isinstance(obj, beets.library.Album):
-        if app.config.get("INCLUDE_PATHS", False):
-            out["artpath"] = util.displayable_path(out["artpath"])
-        else:
-            del out["artpath"]
-        if expand:
-            out["items"] = [_rep(item) for item in obj.items()]
+    def album(self, values: dict[str, t.Any]) -> dict[str, t.Any]:
+        """Build the representation of an Album from its fields."""
+        out = self._project(values)
+        if "artpath" in out:
+            if self.include_paths:
+                out["artpath"] = util.displayable_path(out["artpath"])
+            else:
+                del out["artpath"]
+        if self.expand:
+            items = self.lib.items(MatchQuery("album_id", values["id"]))
+            out["items"] = [self.item(v) for v in self.values(items)]
         return out
+
+    def reps(self, objs) -> t.Iterator[dict[str, t.Any]]:
+        """Generate the representations of Items or Albums."""
+        if isinstance(objs, Results):
+            is_item = objs.model_class is beets.library.Item
+        else:
+            objs = list(objs)
+            is_item = bool(objs) and isinstance(objs[0], beets.library.Item)
+        rep = self.item if is_item else self.album
+        for values in self.values(objs):
+            yield rep(values)
+
+    def rep(self, obj):
+        """Get the representation of a single Item or Album."""
+        return next(self.reps([obj]), None)
+
+
+def _requested_fields() -> list[str] | None:
+    """Return the fields the current request is limited to, if any."""
+    if fields := flask.request.args.get("fields"):
+        return [field for field in fields.split(",") if field]
     return None
 
 
+def _rep(obj, expand=False):
+    """Get a flat -- i.e., JSON-ish -- representation of a beets Item or
+    Album object. For Albums, `expand` dictates whether tracks are
+    included.
+    """
+    if not isinstance(obj, (beets.library.Item, beets.library.Album)):
+        return None
+    return Serializer(_requested_fields(), expand).rep(obj)
+
+
 def json_generator(items, root, expand=False):
     """Generator that dumps list of beets Items or Albums as JSON
 
@@ -85,16 +239,24 @@ def json_generator(items, root, expand=False):
     :param items: list of :class:`Item` or :class:`Album` to dump
     :param expand: If true every :class:`Album` contains its items in the json
                    representation
-    :returns:     generator that yields strings
+    :returns:     generator that yields strings, one chunk of objects at
+                  a time
     """
+    # Read the request now: the response is streamed after it is handled.
+    reps = Serializer(_requested_fields(), expand).reps(items)
+    return _json_chunks(reps, root)
+
+
+def _json_chunks(reps, root):
+    encode = json.JSONEncoder().encode
     yield f'{{"{root}":['
     first = True
-    for item in items:
+    while chunk := list(islice(reps, CHUNK_SIZE)):
         if first:
             first = False
         else:
             yield ","
-        yield json.dumps(_rep(item, expand=expand))
+        yield ",".join(map(encode, chunk))
     yield "]}"
 
 
@@ -291,12 +453,16 @@ app.url_map.converters["everything"] = EverythingConverter
 @app.before_request
 def before_request():
     g.lib = app.config["lib"]
+    # Requests are served on threads of their own, which do not inherit
+    # the directory that the paths of items are stored relative to.
+    context.set_music_dir(g.lib.directory)
 
 
 # Items.
 
 
 @app.route("/item/<idlist:ids>", methods=["GET", "DELETE", "PATCH"])
+@conditional
 @resource("items", patchable=True)
 def get_item(id_):
     return g.lib.get_item(id_)
@@ -304,6 +470,7 @@ def get_item(id_):
 
 @app.route("/item/")
 @app.route("/item/query/")
+@conditional
 @resource_list("items")
 def all_items():
     return g.lib.items()
@@ -324,18 +491,23 @@ def item_file(item_id):
     else:
         safe_filename = base_filename
 
-    return flask.send_file(
-        item_path, as_attachment=True, download_name=safe_filename
+    return fileserver.send_file(
+        item_path,
+        download_name=safe_filename,
+        read_ahead=app.config.get("READ_AHEAD", fileserver.DEFAULT_READ_AHEAD),
+        sendfile=app.config.get("SENDFILE", True),
     )
 
 
 @app.route("/item/query/<query:queries>", methods=["GET", "DELETE", "PATCH"])
+@conditional
 @resource_query("items", patchable=True)
 def item_query(queries):
     return g.lib.items(queries)
 
 
 @app.route("/item/path/<everything:path>")
+@conditional
 def item_at_path(path):
     query = PathQuery("path", path.encode("utf-8"))
     item = g.lib.items(query).get()
@@ -345,6 +517,7 @@ def item_at_path(path):
 
 
 @app.route("/item/values/<string:key>")
+@conditional
 def item_unique_field_values(key):
     sort_key = flask.request.args.get("sort_key", key)
     try:
@@ -360,6 +533,7 @@ def item_unique_field_values(key):
 
 
 @app.route("/album/<idlist:ids>", methods=["GET", "DELETE"])
+@conditional
 @resource("albums")
 def get_album(id_):
     return g.lib.get_album(id_)
@@ -367,12 +541,14 @@ def get_album(id_):
 
 @app.route("/album/")
 @app.route("/album/query/")
+@conditional
 @resource_list("albums")
 def all_albums():
     return g.lib.albums()
 
 
 @app.route("/album/query/<query:queries>", methods=["GET", "DELETE"])
+@conditional
 @resource_query("albums")
 def album_query(queries):
     return g.lib.albums(queries)
@@ -387,6 +563,7 @@ def album_art(album_id):
 
 
 @app.route("/album/values/<string:key>")
+@conditional
 def album_unique_field_values(key):
     sort_key = flask.request.args.get("sort_key", key)
     try:
@@ -402,6 +579,7 @@ def album_unique_field_values(key):
 
 
 @app.route("/artist/")
+@conditional
 def all_artists():
     with g.lib.transaction() as tx:
         rows = tx.query("SELECT DISTINCT albumartist FROM albums")
@@ -413,6 +591,7 @@ def all_artists():
 
 
 @app.route("/stats")
+@conditional
 def stats():
     with g.lib.transaction() as tx:
         item_rows = tx.query("SELECT COUNT(*) FROM items")
@@ -442,9 +621,17 @@ class WebPlugin(BeetsPlugin):
                 "cors_supports_credentials": False,
                 "reverse_proxy": False,
                 "include_paths": False,
+                "file_size": "stat",
+                "cache_size": 64,
+                "read_ahead": 256,
+                "sendfile": True,
                 "readonly": True,
             }
         )
+        self.register_listener("database_change", self.database_changed)
+
+    def database_changed(self, lib, model, models):
+        library_generation.bump()
 
     def commands(self):
         cmd = ui.Subcommand("web", help="start a Web interface")
@@ -468,7 +655,15 @@ class WebPlugin(BeetsPlugin):
             app.config["JSONIFY_PRETTYPRINT_REGULAR"] = False
 
             app.config["INCLUDE_PATHS"] = self.config["include_paths"]
+            app.config["FILE_SIZE"] = self.config["file_size"].as_choice(
+                ["stat", "cached", "none"]
+            )
             app.config["READONLY"] = self.config["readonly"]
+            # Keep the responses of hot endpoints in memory, in megabytes
+            init_app(app, self.config["cache_size"].get(int) * 2**20)
+            # Read ahead of audio files being streamed, in kilobytes
+            app.config["READ_AHEAD"] = self.config["read_ahead"].get(int) * 1024
+            app.config["SENDFILE"] = self.config["sendfile"].get(bool)
 
             # Enable CORS if required.
             if self.config["cors"]:
@@ -11,6 +11,11 @@ from beets.autotag import (
     string_dist,
     track_distance,
 )
+from beets.autotag.distance import (
+    distance_lower_bound,
+    string_dist_cache,
+    track_distance_matrix,
+)
 from beets.library import Item
 from beets.metadata_plugins import MetadataSourcePlugin, get_penalty
 from beets.plugins import BeetsPlugin
@@ -170,6 +175,26 @@ class TestTrackDistance:
         dist = track_distance(item, info, incl_artist=True)
         assert bool(dist) == expected_penalty, dist._penalties
 
+    def test_distance_matrix(self):
+        items = [
+            Item(title="one", track=1, disc=1, length=180.0),
+            Item(title="The Two (Live)", track=2, disc=1, length=200.0),
+            Item(title="three", track=5, disc=2, mb_trackid="t3"),
+            Item(title="", track=0, disc=0, length=0.0),
+        ]
+        tracks = [
+            TrackInfo(title="one", index=1, medium=1, length=181.0),
+            TrackInfo(title="two, the", index=2, medium_index=2, length=300.0),
+            TrackInfo(title="three", index=3, medium_index=1, track_id="t3"),
+            TrackInfo(title=None, index=4, medium=2, track_id="t4"),
+        ]
+
+        matrix = track_distance_matrix(items, tracks)
+
+        assert matrix.tolist() == [
+            [float(track_distance(i, t)) for t in tracks] for i in items
+        ]
+
 
 class TestAlbumDistance:
     @pytest.fixture(scope="class")
@@ -264,6 +289,19 @@ class TestAlbumDistance:
 
         assert get_dist(info) == 0
 
+    @pytest.mark.parametrize("track_count", [1, 3, 5])
+    def test_lower_bound(self, items, get_dist, info, track_count):
+        info.album = "another album"
+        info.tracks = [
+            TrackInfo(title=f"other {i}", index=i) for i in range(track_count)
+        ]
+
+        bound = distance_lower_bound(
+            Source.from_items(items).data, info, len(items)
+        )
+
+        assert 0 < bound <= float(get_dist(info))
+
 
 class TestStringDistance:
     @pytest.mark.parametrize(
@@ -317,6 +355,16 @@ class TestStringDistance:
     def test_relative_weights(self, string1, string2, reference):
         assert string_dist(string2, reference) < string_dist(string1, reference)
 
+    def test_cache_remembers_distances(self):
+        with string_dist_cache() as cache:
+            dist = string_dist("Some String", "Totally Different")
+            with string_dist_cache() as inner:
+                assert inner is cache
+                assert string_dist("Some String", "Totally Different") == dist
+
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert cache.dists == {("Some String", "Totally Different"): dist}
+
     def test_solo_pattern(self):
         # Just make sure these don't crash.
         string_dist("The ", "")
@@ -385,3 +433,4 @@ class TestDataSourceDistance:
         dist = track_distance(item, info)
 
         assert dist.distance == expected_distance
+        assert track_distance_matrix([item], [info])[0, 0] == expected_distance
@@ -194,3 +194,40 @@ class TestTagMultipleDataSources:
         proposal = tag_item(source)
 
         self.check_proposal(proposal)
+
+
+class TestCandidatePruning:
+    @pytest.fixture
+    def items(self):
+        return [
+            Item(artist="Artist", album="Album", title=t, track=i)
+            for i, t in enumerate(["one", "two", "three"], 1)
+        ]
+
+    @pytest.fixture
+    def candidates(self, items, monkeypatch):
+        def album(name, artist):
+            tracks = [TrackInfo(title=i.title, index=i.track) for i in items]
+            return AlbumInfo(
+                tracks, artist=artist, album=name, album_id=name, va=False
+            )
+
+        candidates = [
+            album("Album", "Artist"),
+            album("Completely Unrelated", "Someone Else"),
+        ]
+        monkeypatch.setattr(
+            metadata_plugins, "candidates", lambda *_: iter(candidates)
+        )
+        return candidates
+
+    @pytest.mark.parametrize("prune, expected_count", [(True, 1), (False, 2)])
+    def test_prunes_distant_candidates(
+        self, config, items, candidates, prune, expected_count
+    ):
+        config["match"]["prune_candidates"] = prune
+
+        proposal = tag_album(Source.from_items(items))
+
+        assert len(proposal.candidates) == expected_count
+        assert proposal.candidates[0].info is candidates[0]
@@ -2,6 +2,7 @@
 
 import os
 import shutil
+import threading
 import unittest
 from pathlib import Path
 from tempfile import mkstemp
@@ -223,6 +224,63 @@ class TransactionTest(unittest.TestCase):
         assert self.db.revision == old_rev
 
 
+class TestConcurrentTransactions:
+    @pytest.fixture
+    def db(self, tmp_path):
+        db = DatabaseFixture1(tmp_path / "library.db", concurrent=True)
+        yield db
+        db._close()
+
+    def _in_thread(self, func):
+        result = []
+        thread = threading.Thread(target=lambda: result.append(func()))
+        thread.start()
+        thread.join(5)
+        assert not thread.is_alive()
+        return result[0]
+
+    def _count(self, db):
+        with db.transaction() as tx:
+            return tx.query("SELECT COUNT(*) FROM test")[0][0]
+
+    def test_uses_write_ahead_log(self, db):
+        with db.transaction() as tx:
+            assert tx.query("PRAGMA journal_mode")[0][0] == "wal"
+
+    def test_read_does_not_wait_for_writer(self, db):
+        with db.transaction() as tx:
+            tx.mutate("INSERT INTO test (field_one) VALUES (1)")
+
+            # The other thread sees the last committed state.
+            assert self._in_thread(lambda: self._count(db)) == 0
+
+        assert self._in_thread(lambda: self._count(db)) == 1
+
+    def test_readers_do_not_hold_lock(self, db):
+        with db.transaction() as tx:
+            tx.query("SELECT * FROM test")
+
+            assert not db._db_lock.locked()
+
+            tx.mutate("INSERT INTO test (field_one) VALUES (1)")
+
+            assert db._db_lock.locked()
+
+        assert not db._db_lock.locked()
+
+    def test_nested_write_locks_root_transaction(self, db):
+        old_rev = db.revision
+        with db.transaction():
+            with db.transaction() as tx:
+                tx.mutate("INSERT INTO test (field_one) VALUES (1)")
+
+            # Released only once the outer transaction commits.
+            assert db._db_lock.locked()
+
+        assert not db._db_lock.locked()
+        assert db.revision == old_rev + 1
+
+
 class ModelTest(unittest.TestCase):
     def setUp(self):
         self.db = DatabaseFixture1(":memory:")
@@ -597,17 +655,168 @@ class ResultsIteratorTest(unittest.TestCase):
         objs = self.db._get_results(ModelFixture1)
         assert len(objs) == 2
 
+    def test_limit(self):
+        objs = self.db._get_results(ModelFixture1, limit=1)
+        assert [obj.foo for obj in objs] == ["baz"]
+        assert len(objs) == 1
+
+    def test_limit_slow_query(self):
+        q = query.SubstringQuery("foo", "ba", False)
+        objs = self.db._get_results(ModelFixture1, q, limit=1)
+        assert [obj.foo for obj in objs] == ["baz"]
+        assert len(objs) == 1
+
+    def test_limit_slow_sort(self):
+        s = sort.SlowFieldSort("foo")
+        objs = self.db._get_results(ModelFixture1, sort=s, limit=1)
+        assert [obj.foo for obj in objs] == ["bar"]
+        assert len(objs) == 1
+
+    def test_offset(self):
+        objs = self.db._get_results(ModelFixture1, offset=1)
+        assert [obj.foo for obj in objs] == ["bar"]
+        assert len(objs) == 1
+        assert objs[0].foo == "bar"
+
+    def test_offset_slow_query(self):
+        q = query.SubstringQuery("foo", "ba", False)
+        objs = self.db._get_results(ModelFixture1, q, limit=1, offset=1)
+        assert [obj.foo for obj in objs] == ["bar"]
+        assert len(objs) == 1
+
+    def test_offset_slow_sort(self):
+        s = sort.SlowFieldSort("foo")
+        objs = self.db._get_results(ModelFixture1, sort=s, offset=1)
+        assert [obj.foo for obj in objs] == ["baz"]
+
+    def test_resume_from_cursor(self):
+        s = sort.FlexFieldSort(ModelFixture1, "foo")
+        first = self.db._get_results(ModelFixture1, sort=s, limit=1)
+        assert [obj.foo for obj in first] == ["bar"]
+
+        objs = self.db._get_results(ModelFixture1, sort=s, after=first.cursor)
+        assert [obj.foo for obj in objs] == ["baz"]
+
+    def test_no_cursor_with_slow_sort(self):
+        s = sort.SlowFieldSort("foo")
+        objs = self.db._get_results(ModelFixture1, sort=s, limit=1)
+        list(objs)
+        assert objs.cursor is None
+
     def test_out_of_range(self):
         objs = self.db._get_results(ModelFixture1)
         with pytest.raises(IndexError):
             objs[100]
 
+    def test_flex_attributes_in_reverse_id_order(self):
+        s = sort.FixedFieldSort("id", ascending=False)
+        objs = self.db._get_results(ModelFixture1, sort=s)
+        assert [obj.foo for obj in objs] == ["bar", "baz"]
+
     def test_no_results(self):
         assert (
             self.db._get_results(ModelFixture1, query.FalseQuery()).get()
             is None
         )
 
+    def test_raw_rows(self):
+        objs = self.db._get_results(ModelFixture1, offset=1)
+        assert not objs.needs_objects
+        assert [(row["id"], flex["foo"]) for row, flex in objs.raw()] == [
+            (2, "bar")
+        ]
+        assert [obj.foo for obj in objs] == ["bar"]
+
+    def test_no_raw_rows_with_slow_query(self):
+        q = query.SubstringQuery("foo", "ba", False)
+        objs = self.db._get_results(ModelFixture1, q)
+        assert objs.needs_objects
+        with pytest.raises(ValueError, match="filtered or sorted in Python"):
+            list(objs.raw())
+
+
+class TestFlexAttributeLoading:
+    @pytest.fixture(params=[True, False], ids=["joined", "separate"])
+    def db(self, request):
+        db = DatabaseFixture1(":memory:")
+        db.join_flex_attributes = request.param
+        for field_one, flex in [(2, "text"), (1, b"\xff\x00"), (3, "")]:
+            ModelFixture1(field_one=field_one, flex=flex).add(db)
+        ModelFixture1(field_one=4).add(db)
+        yield db
+        db._connection().close()
+
+    def test_values_round_trip(self, db):
+        objs = db._get_results(ModelFixture1, sort=sort.FixedFieldSort("id"))
+
+        assert [o.get("flex", "missing") for o in objs] == [
+            "text",
+            b"\xff\x00",
+            "",
+            "missing",
+        ]
+
+    def test_sorted_by_fixed_field(self, db):
+        s = sort.FixedFieldSort("field_one")
+        q = query.NumericQuery("field_one", "..3")
+
+        objs = db._get_results(ModelFixture1, q, s)
+
+        assert [o.get("flex") for o in objs] == [b"\xff\x00", "text", ""]
+
+
+class IndexedModelFixture(ModelFixture1):
+    _indexed_flex_fields: ClassVar[set[str]] = {"some_float_field", "foo"}
+
+
+class IndexedDatabaseFixture(dbcore.Database):
+    _models = (IndexedModelFixture,)
+
+
+class TestFlexIndices:
+    @staticmethod
+    def flex_indices(db):
+        with db.transaction() as tx:
+            rows = tx.query(
+                "SELECT name, sql FROM sqlite_master "
+                "WHERE type = 'index' AND name LIKE 'testflex_value_%'"
+            )
+        return {name: sql for name, sql in rows}
+
+    def test_indices_created_for_indexed_fields(self, tmp_path):
+        db = IndexedDatabaseFixture(tmp_path / "library.db")
+
+        indices = self.flex_indices(db)
+
+        assert set(indices) == {
+            "testflex_value_some_float_field",
+            "testflex_value_foo",
+        }
+        assert (
+            "CAST(value AS NUMERIC)"
+            in (indices["testflex_value_some_float_field"])
+        )
+        db._connection().close()
+
+    def test_stale_indices_dropped(self, tmp_path):
+        IndexedDatabaseFixture(tmp_path / "library.db")._connection().close()
+
+        db = DatabaseFixture1(tmp_path / "library.db")
+
+        assert self.flex_indices(db) == {}
+        db._connection().close()
+
+    def test_sort_on_indexed_field(self):
+        db = IndexedDatabaseFixture(":memory:")
+        for foo in ["b", None, "A", "c"]:
+            IndexedModelFixture(field_one=1, foo=foo).add(db)
+        s = sort.FlexFieldSort(IndexedModelFixture, "foo", ascending=False)
+
+        objs = db._get_results(IndexedModelFixture, sort=s)
+
+        assert [o.get("foo") for o in objs] == ["c", "b", "A", None]
+        db._connection().close()
+
 
 class TestException:
     @pytest.mark.parametrize("model", [DatabaseFixture1])
@@ -624,3 +624,98 @@ class TestHasCoverArtQuery:
     )
     def test_has_cover_art_query(self, lib, query, expected_titles):
         assert {i.title for i in lib.items(query)} == expected_titles
+
+
+class TestQuerySplit:
+    """Test splitting queries into SQL clauses and Python residuals."""
+
+    @pytest.fixture(scope="class")
+    def lib(self, helper):
+        album = helper.lib.add_album(
+            [
+                helper.create_item(title="rated", rating="4", played="100"),
+                helper.create_item(title="unrated"),
+            ]
+        )
+        album.albumrating = "2.5"
+        album.store()
+        helper.add_item(title="singleton", rating="1", played="text")
+
+        return helper.lib
+
+    @pytest.mark.parametrize(
+        "q, expected_titles",
+        [
+            (NumericQuery("rating", "4", False), ["rated"]),
+            (NumericQuery("rating", "..2", False), ["singleton"]),
+            (NumericQuery("albumrating", "2..3", False), ["rated", "unrated"]),
+            (
+                NotQuery(NumericQuery("rating", "2..", False)),
+                ["singleton", "unrated"],
+            ),
+            (DateQuery("played", "1970", False), ["rated"]),
+            (
+                OrQuery(
+                    [
+                        NumericQuery("rating", "4", False),
+                        NumericQuery("rating", "1", False),
+                    ]
+                ),
+                ["rated", "singleton"],
+            ),
+        ],
+    )
+    def test_flex_query_in_sql(self, lib, q, expected_titles):
+        clause, _, residual = q.split(Item)
+
+        assert clause
+        assert residual is None
+        assert sorted(i.title for i in lib.items(q)) == expected_titles
+
+    def test_and_query_keeps_slow_residual(self, lib):
+        slow = SubstringQuery("rating", "4", False)
+        q = AndQuery([SubstringQuery("title", "rat"), slow])
+
+        clause, _, residual = q.split(Item)
+
+        assert clause == "(title like ? escape '\\')"
+        assert residual == slow
+        assert {i.title for i in lib.items(q)} == {"rated"}
+
+
+class TestIndexedFlexFields:
+    """Test queries and sorts on flexible attributes with value indices."""
+
+    @pytest.fixture(scope="class")
+    def lib(self, helper):
+        helper.config["indexed_fields"]["item"] = ["rating", "mood"]
+        helper.lib._create_flex_indices(Item)
+
+        helper.add_item(title="high", rating="5", mood="Sad")
+        helper.add_item(title="low", rating="2", mood="happy")
+        helper.add_item(title="unrated", mood="angry")
+        album = helper.lib.add_album([helper.create_item(title="album")])
+        album.rating = "4"
+        album.store()
+
+        return helper.lib
+
+    def test_numeric_query_uses_index(self, lib):
+        q = NumericQuery("rating", "3..", False)
+
+        clause, _, residual = q.split(Item)
+
+        assert "IN (SELECT entity_id FROM item_attributes" in clause
+        assert residual is None
+        assert {i.title for i in lib.items(q)} == {"high", "album"}
+
+    @pytest.mark.parametrize(
+        "q, expected_titles",
+        [
+            ("rating+", ["unrated", "low", "album", "high"]),
+            ("mood-", ["high", "low", "unrated", "album"]),
+            ("mood:a rating-", ["high", "low", "unrated"]),
+        ],
+    )
+    def test_sort(self, lib, q, expected_titles):
+        assert [i.title for i in lib.items(q)] == expected_titles
@@ -121,8 +121,8 @@ class SortFromStringsTest(unittest.TestCase):
 
     def test_flex_field_sort(self):
         s = self.sfs(["flex_field+"])
-        assert isinstance(s, sort.SlowFieldSort)
-        assert s == sort.SlowFieldSort("flex_field")
+        assert isinstance(s, sort.FlexFieldSort)
+        assert s == sort.FlexFieldSort(ModelFixture1, "flex_field")
 
     def test_special_sort(self):
         s = self.sfs(["some_sort+"])
@@ -8,7 +8,7 @@ import beets.library
 from beets import util
 from beets.dbcore import types
 from beets.dbcore.query import TrueQuery
-from beets.dbcore.sort import FixedFieldSort, SlowFieldSort
+from beets.dbcore.sort import FixedFieldSort, FlexFieldSort
 from beets.library import Album, Item
 from beets.test import _common
 
@@ -120,6 +120,48 @@ class TestSort:
         results = self.lib._fetch(model, query, None)
         assert [r.id for r in results] == expected_ids
 
+    @pytest.mark.parametrize(
+        "query,is_slow",
+        [
+            _p("flex1-", False, id="flex"),
+            _p("flex2+ flex1+", False, id="multi-flex-field"),
+            _p("year+ path+", True, id="computed"),
+        ],
+    )
+    def test_only_computed_fields_sort_slowly(self, query, is_slow):
+        _, sort = beets.library.parse_query_string(query, Album)
+        assert sort.is_slow() == is_slow
+
+    @pytest.mark.parametrize("join_flex_attributes", [True, False])
+    def test_limit(self, monkeypatch, join_flex_attributes):
+        monkeypatch.setattr(
+            self.lib, "join_flex_attributes", join_flex_attributes
+        )
+
+        results = self.lib.items("flex2- flex1+", limit=2)
+
+        assert [(r.id, r.flex1) for r in results] == [
+            (1, "Flex1-0"),
+            (2, "Flex1-1"),
+        ]
+
+    @pytest.mark.parametrize("query", ["flex2- flex1+", "year- flex2+", ""])
+    def test_paginate(self, query):
+        expected_ids = [i.id for i in self.lib.items(query)]
+
+        ids, after = [], None
+        while page := self.lib.items(query, limit=3, after=after):
+            ids += [i.id for i in page]
+            after = page.cursor
+        offset_ids = [
+            i.id
+            for offset in range(0, len(expected_ids), 3)
+            for i in self.lib.items(query, limit=3, offset=offset)
+        ]
+
+        assert ids == expected_ids
+        assert offset_ids == expected_ids
+
     def test_sort_path_field(self):
         results = self.lib.items("", FixedFieldSort("path", True))
         expected_paths = [
@@ -292,5 +334,5 @@ class TestNonExistingField:
         )
         assert len(query.subqueries) == 1
         assert isinstance(query.subqueries[0], TrueQuery)
-        assert isinstance(sort, SlowFieldSort)
+        assert isinstance(sort, FlexFieldSort)
         assert sort.field == "-bar"
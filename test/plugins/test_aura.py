@@ -153,3 +153,80 @@ class TestAuraResponse:
         data = get_response_data("/aura/albums", {"filter[album]": album.album})
 
         assert data == {"data": [album_document], "included": [track_document]}
+
+
+class TestAuraPagination:
+    def get_pages(self, client: Client, endpoint: str) -> list[dict[str, Any]]:
+        """Follow the links to the next pages of one resource per page."""
+        pages = []
+        url, params = endpoint, {"limit": "1"}
+        while url:
+            response = client.get(url, query_string=params)
+            assert response.status_code == HTTPStatus.OK
+            pages.append(response.json)
+            url, params = response.json.get("links", {}).get("next"), None
+        return pages
+
+    def test_tracks_pages_follow_cursor(self, client: Client, helper):
+        pages = self.get_pages(client, "/aura/tracks")
+
+        assert "cursor=" in pages[0]["links"]["next"]
+        ids = [int(d["id"]) for page in pages for d in page["data"]]
+        assert ids == [i.id for i in helper.lib.items()]
+
+    def test_artists_pages(self, client: Client, helper):
+        pages = self.get_pages(client, "/aura/artists")
+
+        assert "page=1" in pages[0]["links"]["next"]
+        names = [d["id"] for page in pages for d in page["data"]]
+        assert names == list(
+            dict.fromkeys(i.artist for i in helper.lib.items())
+        )
+
+    def test_invalid_cursor(self, client: Client):
+        response = client.get("/aura/tracks", query_string={"cursor": "x"})
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+class TestAuraCache:
+    @pytest.fixture
+    def plugin(self):
+        from beets.plugins import BeetsPlugin
+        from beetsplug.aura import AURAPlugin
+
+        yield AURAPlugin()
+        BeetsPlugin.listeners.clear()
+        BeetsPlugin._raw_listeners.clear()
+
+    @pytest.mark.usefixtures("plugin")
+    def test_artist_cache_invalidated_by_database_change(
+        self, client: Client, item
+    ):
+        assert client.get("/aura/artists/Renamed").status_code == 404
+        original = item.artist
+        item.artist = "Renamed"
+        item.store()
+        try:
+            response = client.get("/aura/artists/Renamed")
+        finally:
+            item.artist = original
+            item.store()
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.json["data"]["relationships"]["tracks"]["data"] == [
+            {"type": "track", "id": str(item.id)}
+        ]
+        assert client.get("/aura/artists/Renamed").status_code == 404
+
+    def test_not_modified(self, client: Client, item):
+        response = client.get("/aura/tracks", query_string={"limit": "1"})
+        etag = response.headers["ETag"]
+
+        response = client.get(
+            "/aura/tracks",
+            query_string={"limit": "1"},
+            headers={"If-None-Match": etag},
+        )
+
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
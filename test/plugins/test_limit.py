@@ -74,8 +74,8 @@ class LimitPluginTest(IOMixin, PluginTestCase):
         assert len(result) == self.num_limit
 
     def test_prefix_when_incorrectly_ordred(self):
-        """Returns no results with the query prefix and filter when the prefix
-        portion (incorrectly) appears first."""
+        """Returns the expected number with the query prefix and a filter
+        evaluated by the database when the prefix portion appears first."""
         incorrect_order = f"{self.num_limit_prefix} {self.track_tail_range}"
         result = self.lib.items(incorrect_order)
-        assert len(result) == 0
+        assert len(result) == self.num_limit
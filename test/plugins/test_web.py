@@ -12,6 +12,7 @@ from beets.library import Album, Item
 from beets.test import _common
 from beets.test.helper import PluginMixin, PytestTestHelper
 from beetsplug import web
+from beetsplug._utils.httpcache import init_app
 
 
 class WebPluginMixin(PluginMixin):
@@ -20,7 +21,7 @@ class WebPluginMixin(PluginMixin):
     plugin = "web"
 
     @pytest.fixture(autouse=True)
-    def setup_web_app(self, setup):
+    def setup_web_app(self, setup, monkeypatch):
         """Configure the web plugin's Flask app for testing.
 
         This fixture sets up the Flask test client and configures the app
@@ -33,6 +34,7 @@ class WebPluginMixin(PluginMixin):
         web.app.config["lib"] = self.lib
         web.app.config["INCLUDE_PATHS"] = False
         web.app.config["READONLY"] = True
+        monkeypatch.setattr(web, "_file_sizes", {})
         self.client = web.app.test_client()
 
         # Set platform-specific path prefix
@@ -112,6 +114,39 @@ class TestWebPlugin(WebPluginMixin, PytestTestHelper):
         assert response.status_code == 200
         assert len(res_json["items"]) == 3
 
+    def test_get_all_items_fields(self):
+        response = self.client.get("/item/?fields=title,testattr,album")
+        res_json = json.loads(response.data.decode("utf-8"))
+
+        assert response.status_code == 200
+        assert sorted(res_json["items"], key=lambda item: item["title"]) == [
+            {"title": "and a third", "testattr": "ABC", "album": "other album"},
+            {"title": "another title", "album": ""},
+            {"title": "title", "album": "other album"},
+        ]
+
+    def test_get_album_fields_expanded(self):
+        response = self.client.get("/album/2?fields=album,title&expand")
+        res_json = json.loads(response.data.decode("utf-8"))
+
+        assert res_json["album"] == "other album"
+        assert sorted(item["title"] for item in res_json["items"]) == [
+            "and a third",
+            "title",
+        ]
+
+    def test_config_file_size_cached(self, monkeypatch):
+        monkeypatch.setitem(web.app.config, "FILE_SIZE", "cached")
+        monkeypatch.setattr("os.path.getsize", lambda path: 42)
+        assert self.client.get("/item/1").json["size"] == 42
+
+        monkeypatch.setattr("os.path.getsize", lambda path: 43)
+        assert self.client.get("/item/1").json["size"] == 42
+
+    def test_config_file_size_none(self, monkeypatch):
+        monkeypatch.setitem(web.app.config, "FILE_SIZE", "none")
+        assert "size" not in self.client.get("/item/1").json
+
     def test_get_unique_item_artist(self):
         response = self.client.get("/item/values/artist")
         res_json = json.loads(response.data.decode("utf-8"))
@@ -675,6 +710,52 @@ class TestWebPlugin(WebPluginMixin, PytestTestHelper):
 
         assert response.status_code == 200
 
+    def test_not_modified_with_etag(self):
+        response = self.client.get("/item/")
+        etag = response.headers["ETag"]
+
+        response = self.client.get("/item/", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.data == b""
+
+    def test_not_modified_since_last_change(self):
+        response = self.client.get("/stats")
+        last_modified = response.headers["Last-Modified"]
+
+        response = self.client.get(
+            "/stats", headers={"If-Modified-Since": last_modified}
+        )
+
+        assert response.status_code == 304
+
+    def test_modified_after_library_change(self):
+        response = self.client.get("/item/1")
+        etag = response.headers["ETag"]
+
+        item = self.lib.get_item(1)
+        item.title = "new title"
+        item.store()
+        response = self.client.get("/item/1", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert response.json["title"] == "new title"
+
+    def test_response_cache(self):
+        init_app(web.app, 2**20)
+        try:
+            first = self.client.get("/item/query/title", buffered=True)
+            second = self.client.get("/item/query/title")
+            cache = web.app.extensions["beets_response_cache"]
+        finally:
+            init_app(web.app, 0)
+
+        assert cache.hits == 1
+        assert second.data == first.data
+        assert second.headers["ETag"] == first.headers["ETag"]
+        assert second.mimetype == "application/json"
+
 
 class TestWebXSS(WebPluginMixin, PytestTestHelper):
     """Tests for XSS vulnerability in the web plugin templates.
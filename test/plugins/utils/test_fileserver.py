@@ -0,0 +1,107 @@
+import http.client
+import threading
+
+import pytest
+from flask import Flask
+from werkzeug.serving import make_server
+
+from beetsplug._utils import fileserver
+
+CONTENT = bytes(range(256)) * 64
+
+
+@pytest.fixture
+def app(tmp_path):
+    path = tmp_path / "track.flac"
+    path.write_bytes(CONTENT)
+
+    app = Flask(__name__)
+
+    @app.route("/file")
+    def file():
+        return fileserver.send_file(
+            str(path), download_name="track.flac", read_ahead=4096
+        )
+
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+class TestSendFile:
+    def test_whole_file(self, client):
+        response = client.get("/file")
+
+        assert response.status_code == 200
+        assert response.data == CONTENT
+        assert response.headers["Accept-Ranges"] == "bytes"
+        assert response.mimetype == "audio/flac"
+        assert "track.flac" in response.headers["Content-Disposition"]
+
+    @pytest.mark.parametrize(
+        "header, start, stop",
+        [("bytes=10-19", 10, 20), ("bytes=-5", len(CONTENT) - 5, None)],
+    )
+    def test_range(self, client, header, start, stop):
+        response = client.get("/file", headers={"Range": header})
+
+        assert response.status_code == 206
+        assert response.data == CONTENT[start:stop]
+        assert response.headers["Content-Range"] == (
+            f"bytes {start}-{(stop or len(CONTENT)) - 1}/{len(CONTENT)}"
+        )
+
+    def test_unsatisfiable_range(self, client):
+        response = client.get(
+            "/file", headers={"Range": f"bytes={len(CONTENT)}-"}
+        )
+
+        assert response.status_code == 416
+        assert response.headers["Content-Range"] == f"bytes */{len(CONTENT)}"
+
+    def test_range_of_other_copy_sends_whole_file(self, client):
+        response = client.get(
+            "/file", headers={"Range": "bytes=0-9", "If-Range": '"other"'}
+        )
+
+        assert response.status_code == 200
+        assert response.data == CONTENT
+
+    def test_not_modified(self, client):
+        etag = client.get("/file").headers["ETag"]
+
+        response = client.get("/file", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+
+    @pytest.mark.skipif(
+        not hasattr(fileserver.os, "sendfile"), reason="no sendfile"
+    )
+    def test_sendfile_under_development_server(self, app, monkeypatch):
+        calls = []
+        sendfile = fileserver.os.sendfile
+
+        def spy(*args):
+            calls.append(args)
+            return sendfile(*args)
+
+        monkeypatch.setattr(fileserver.os, "sendfile", spy)
+        server = make_server("127.0.0.1", 0, app, threaded=True)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", server.port)
+            conn.request("GET", "/file", headers={"Range": "bytes=100-"})
+            response = conn.getresponse()
+            data = response.read()
+            conn.close()
+        finally:
+            server.shutdown()
+            thread.join()
+
+        assert response.status == 206
+        assert data == CONTENT[100:]
+        assert calls
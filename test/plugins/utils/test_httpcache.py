@@ -0,0 +1,65 @@
+import pytest
+
+from beetsplug._utils.httpcache import (
+    CachedResponse,
+    LibraryGeneration,
+    ResponseCache,
+)
+
+
+def _response(size: int) -> CachedResponse:
+    return CachedResponse(200, [], b"x" * size)
+
+
+class TestResponseCache:
+    def test_evicts_least_recently_used(self):
+        cache = ResponseCache(max_size=30, max_entry_size=10)
+        cache.put("a", _response(10))
+        cache.put("b", _response(10))
+        cache.put("c", _response(10))
+        cache.get("a")
+
+        cache.put("d", _response(10))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.size == 30
+
+    def test_skips_large_responses(self):
+        cache = ResponseCache(max_size=30, max_entry_size=10)
+
+        cache.put("a", _response(11))
+
+        assert cache.get("a") is None
+        assert cache.size == 0
+
+
+class TestLibraryGeneration:
+    @pytest.fixture
+    def lib(self, tmp_path):
+        class Lib:
+            path = tmp_path / "library.db"
+
+        return Lib()
+
+    def test_notices_changes_of_database_file(self, lib):
+        lib.path.write_bytes(b"a")
+        generation = LibraryGeneration()
+        number, _ = generation.current(lib)
+
+        lib.path.write_bytes(b"ab")
+
+        assert generation.current(lib)[0] == number + 1
+        assert generation.current(lib)[0] == number + 1
+
+    def test_change_in_same_second_is_dated_later(self, lib, monkeypatch):
+        monkeypatch.setattr(
+            "beetsplug._utils.httpcache.time.time", lambda: 1000.2
+        )
+        generation = LibraryGeneration()
+        _, served_at = generation.current(lib)
+
+        generation.bump()
+
+        _, changed_at = generation.current(lib)
+        assert int(changed_at) > int(served_at)
@@ -3,7 +3,13 @@ from unittest.mock import MagicMock
 import pytest
 import requests
 
-from beetsplug._utils.requests import RateLimitAdapter
+from beetsplug._utils.requests import (
+    CacheMissError,
+    HTTPNotFoundError,
+    RateLimitAdapter,
+    RequestHandler,
+    ResponseCache,
+)
 
 
 def _prepared_request(
@@ -41,3 +47,95 @@ class TestRateLimitAdapter:
 
         assert sleep_mock.call_count == 1
         assert sleep_mock.call_args.args[0] == pytest.approx(expected_sleep)
+
+
+class TestResponseCache:
+    URL = "https://example.com/api"
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        cache = ResponseCache(str(tmp_path / "cache.db"))
+        yield cache
+        cache.close()
+
+    @pytest.fixture
+    def handler(self, cache):
+        handler = RequestHandler()
+        handler.cache = cache
+        return handler
+
+    def test_serves_repeated_request_from_cache(
+        self, requests_mock, handler, cache
+    ):
+        requests_mock.get(self.URL, json={"id": 1})
+
+        assert handler.get_json(self.URL, params={"q": "a"}) == {"id": 1}
+        assert handler.get_json(self.URL, params={"q": "a"}) == {"id": 1}
+
+        assert requests_mock.call_count == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_keys_on_params(self, requests_mock, handler):
+        requests_mock.get(self.URL, json={"id": 1})
+
+        handler.get(self.URL, params={"q": "a"})
+        handler.get(self.URL, params={"q": "b"})
+
+        assert requests_mock.call_count == 2
+
+    def test_does_not_cache_errors(self, requests_mock, handler):
+        requests_mock.get(self.URL, status_code=404)
+
+        for _ in range(2):
+            with pytest.raises(HTTPNotFoundError):
+                handler.get(self.URL)
+
+        assert requests_mock.call_count == 2
+
+    def test_expired_entry_is_fetched_again(self, requests_mock, handler):
+        requests_mock.get(self.URL, json={"id": 1})
+        handler.cache.ttl = -1
+
+        handler.get(self.URL)
+        handler.get(self.URL)
+
+        assert requests_mock.call_count == 2
+
+    def test_evicts_oldest_entries_beyond_max_size(
+        self, requests_mock, handler
+    ):
+        requests_mock.get(self.URL, text="x" * 10)
+        handler.cache.max_size = 15
+
+        handler.get(self.URL, params={"q": "a"})
+        handler.get(self.URL, params={"q": "b"})
+        handler.get(self.URL, params={"q": "b"})
+        handler.get(self.URL, params={"q": "a"})
+
+        assert requests_mock.call_count == 3
+
+    def test_purges_expired_entries_periodically(
+        self, requests_mock, handler, cache, monkeypatch
+    ):
+        monkeypatch.setattr("beetsplug._utils.requests.PURGE_INTERVAL", 2)
+        now = 1000.0
+        monkeypatch.setattr("beetsplug._utils.requests.time.time", lambda: now)
+        requests_mock.get(self.URL, text="x" * 10)
+        cache.ttl = 60
+        handler.get(self.URL, params={"q": "a"})
+        now += 120
+
+        handler.get(self.URL, params={"q": "b"})
+
+        assert cache._total_size() == 10
+        assert cache._size == 10
+
+    def test_offline_only_serves_from_cache(self, requests_mock, handler):
+        requests_mock.get(self.URL, json={"id": 1})
+        handler.get(self.URL)
+        handler.cache.offline = True
+
+        assert handler.get_json(self.URL) == {"id": 1}
+        with pytest.raises(CacheMissError):
+            handler.get(self.URL, params={"q": "a"})
+        assert requests_mock.call_count == 1
@@ -25,3 +25,66 @@ class VFSTest(BeetsTestCase):
         assert (
             self.tree.dirs["albums"].dirs["the album"].files["the title"] == 2
         )
+
+
+class LibraryTreeTest(BeetsTestCase):
+    def setUp(self):
+        super().setUp()
+        self.lib.path_formats = [
+            ("default", "albums/$album%aunique{}/$title"),
+            ("singleton:true", "tracks/$artist/$title"),
+        ]
+        self.singleton = self.lib.add(_common.item())
+        self.album = self.lib.add_album([_common.item()])
+        self.tree = vfs.LibraryTree(self.lib)
+        self.tree.sync()
+
+    def test_sync_builds_library_tree(self):
+        assert self.tree.root == vfs.libtree(self.lib)
+
+    def test_invalidated_item_is_moved(self):
+        item = self.lib.get_item(self.singleton)
+        item.artist = "other artist"
+        item.store()
+
+        self.tree.invalidate([item.id])
+
+        assert self.tree.root.dirs["tracks"].dirs == {
+            "other artist": vfs.Node({"the title": item.id}, {})
+        }
+
+    def test_removed_item_prunes_directories(self):
+        item = self.lib.get_item(self.singleton)
+        item.remove()
+
+        self.tree.invalidate([item.id])
+
+        assert "tracks" not in self.tree.root.dirs
+
+    def test_album_change_moves_other_albums(self):
+        self.lib.add_album([_common.item(title="other title", year=2000)])
+
+        self.tree.invalidate()
+
+        assert self.tree.root == vfs.libtree(self.lib)
+        assert set(self.tree.root.dirs["albums"].dirs) == {
+            "the album [0001]",
+            "the album [2000]",
+        }
+
+    def test_snapshot_spares_computing_paths(self):
+        path = self.temp_path / "tree.json.gz"
+        self.tree.save(str(path))
+
+        tree = vfs.LibraryTree(self.lib)
+
+        assert tree.load(str(path))
+        assert tree.sync() == 0
+        assert tree.root == self.tree.root
+
+    def test_snapshot_of_other_path_formats_is_ignored(self):
+        path = self.temp_path / "tree.json.gz"
+        self.tree.save(str(path))
+        self.lib.path_formats = [("default", "$title")]
+
+        assert not vfs.LibraryTree(self.lib).load(str(path))
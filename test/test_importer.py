@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import os
+import pickle
 import re
 import shutil
 import stat
@@ -24,6 +25,7 @@ from mediafile import MediaFile
 
 from beets import config, importer, logging, util
 from beets.autotag import AlbumInfo, AlbumMatch, Distance, TrackInfo
+from beets.importer.state import ImportState
 from beets.importer.tasks import (
     ImportTaskFactory,
     albums_in_dir,
@@ -103,6 +105,14 @@ class TestNonAutotaggedImport(PathsMixin, AsIsImporterMixin, ImportHelper):
         assert self.track_lib_path.exists()
         assert not self.track_import_path.exists()
 
+    def test_threaded_import_move_with_file_workers(self):
+        config["import"]["threads"]["files"] = 3
+
+        self.run_asis_importer(move=True, threaded=True)
+
+        assert self.track_lib_path.exists()
+        assert not self.album_path.exists()
+
     def test_import_without_delete_retains_files(self):
         self.run_asis_importer(delete=False)
 
@@ -884,6 +894,15 @@ class GroupAlbumsImportTest(AutotagImportTestCase):
         assert albums == {"Album B", "Tag Album"}
 
 
+class ThreadedGroupAlbumsImportTest(GroupAlbumsImportTest):
+    db_on_disk = True
+
+    def setUp(self):
+        super().setUp()
+        config["threaded"] = True
+        config["import"]["threads"]["lookup"] = 3
+
+
 class GlobalGroupAlbumsImportTest(GroupAlbumsImportTest):
     def setUp(self):
         super().setUp()
@@ -1714,6 +1733,76 @@ class TestIncrementalImport(AsIsImporterMixin, ImportHelper):
         assert len(self.lib.albums()) == 1
 
 
+class TestImportTaskFactory(ImportHelper):
+    def setup_beets(self):
+        super().setup_beets()
+        self.prepare_albums_for_import(5)
+
+    def _tasks(self, read_threads, **kwargs):
+        self.config["threaded"] = read_threads > 1
+        self.config["import"]["threads"]["read"] = read_threads
+        session = self.setup_importer(**kwargs)
+        session.set_config(self.config["import"])
+        factory = ImportTaskFactory(bytes(self.import_path), session)
+        return [
+            (task.paths, [item.path for item in task.items])
+            for task in factory.tasks()
+        ], factory.read
+
+    @pytest.mark.parametrize("singletons", [False, True])
+    def test_parallel_read_keeps_order(self, singletons):
+        serial = self._tasks(1, singletons=singletons)
+        parallel = self._tasks(3, singletons=singletons)
+
+        assert parallel == serial
+        assert serial[1] == 5
+
+
+class TestImportState(BeetsTestCase):
+    def test_records_progress_and_history(self):
+        with ImportState() as state:
+            state.progress_add(b"/top", b"/top/b", b"/top/a")
+            state.history_add([b"/top/a", b"/top/b"])
+
+        state = ImportState()
+        assert state.progress_has(b"/top")
+        assert state.progress_has_element(b"/top", b"/top/a")
+        assert not state.progress_has_element(b"/top", b"/top/c")
+        assert state.history_has([b"/top/a", b"/top/b"])
+        assert not state.history_has([b"/top/a"])
+
+        state.progress_reset(b"/top")
+        assert not state.progress_has(b"/top")
+
+    def test_history_mark_hides_later_additions(self):
+        state = ImportState()
+        state.history_add([b"/old"])
+        mark = state.history_mark()
+        state.history_add([b"/new"])
+
+        assert state.history_has([b"/old"], mark)
+        assert not state.history_has([b"/new"], mark)
+        assert state.history_has([b"/new"])
+
+    def test_migrates_pickled_state(self):
+        path = self.config["statefile"].as_path()
+        with open(path, "wb") as f:
+            pickle.dump(
+                {
+                    "tagprogress": {b"/top": [b"/top/a"]},
+                    "taghistory": {(b"/top/a", b"/top/b")},
+                },
+                f,
+            )
+
+        state = ImportState()
+
+        assert state.tagprogress == {b"/top": [b"/top/a"]}
+        assert state.taghistory == {(b"/top/a", b"/top/b")}
+        assert path.with_suffix(".pickle.bak").exists()
+        assert path.read_bytes().startswith(b"SQLite format 3")
+
+
 def _mkmp3(path):
     shutil.copyfile(_common.RSRC / "min.mp3", path)
 
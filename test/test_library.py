@@ -98,6 +98,63 @@ class TestStore(PytestItemHelper):
         assert not stored.get("artpath", with_album=False)
 
 
+class TestStoreMany(PytestItemHelper):
+    def test_store_many_writes_changes(self):
+        items = [_common.item(self.lib) for _ in range(3)]
+        items[0].flex1 = "old"
+        items[0].store()
+        for year, obj in enumerate(items, 2001):
+            obj.year = year
+            obj.flex2 = str(year)
+        del items[0].flex1
+
+        self.lib.store_many(items)
+
+        stored = [self.lib.get_item(i.id) for i in items]
+        assert [(i.year, i.flex2) for i in stored] == [
+            (2001, "2001"),
+            (2002, "2002"),
+            (2003, "2003"),
+        ]
+        assert "flex1" not in stored[0]
+        assert not any(i._dirty for i in items)
+
+    def test_store_many_only_writes_given_fields(self):
+        item = _common.item(self.lib)
+        item.year = 1987
+        item.title = "changed"
+
+        self.lib.store_many([item], fields=["year"])
+
+        stored = self.lib.get_item(item.id)
+        assert stored.year == 1987
+        assert stored.title != "changed"
+
+    def test_store_many_album_cascades_to_items(self):
+        album = self.lib.add_album([_common.item(self.lib)])
+        album.genres = ["Jazz"]
+        album.flex1 = "Flex-1"
+
+        self.lib.store_many([album])
+
+        stored = album.items().get()
+        assert stored.genres == ["Jazz"]
+        assert stored.flex1 == "Flex-1"
+
+    def test_store_many_one_database_change_event(
+        self, caplog: pytest.LogCaptureFixture
+    ):
+        items = [_common.item(self.lib) for _ in range(3)]
+        for obj in items:
+            obj.title = "changed"
+        caplog.clear()
+
+        with caplog.at_level("DEBUG", logger="beets"):
+            self.lib.store_many(items)
+
+        assert caplog.text.count("Sending event: database_change") == 1
+
+
 class TestAdd(PytestItemHelper):
     def test_item_add_inserts_row(self, item):
         self.lib.add(item)
@@ -323,6 +380,18 @@ class TestDestination(PytestItemHelper):
         self.lib.path_formats = [("default", "two"), ("comp:true", "three")]
         assert item_in_db.destination() == np("one/three")
 
+    def test_path_format_queries_parsed_once(self, item_in_db):
+        self.lib.path_formats = [("default", "two"), ("comp:true", "three")]
+        with patch(
+            "beets.library.models.parse_query_string",
+            wraps=beets.library.parse_query_string,
+        ) as parse:
+            item_in_db.destination()
+            item_in_db.comp = True
+            item_in_db.destination()
+
+        assert parse.call_count == 1
+
     def test_multi_value_string_query_path(self, item_in_db):
         item_in_db.genres = ["Classical"]
         self.lib.directory = b"one"
@@ -734,6 +803,45 @@ class TestDisambiguation(TestHelper, PathFormattingMixin):
         self._assert_dest(b"/base/foo [1]/the title", i1)
         self._assert_dest(b"/base/foo [2]/the title", i2)
 
+    def test_unique_follows_changed_keys(self, items):
+        i1, i2 = items
+        self._assert_dest(b"/base/foo [2001]/the title", i1)
+
+        album2 = self.lib.get_album(i2)
+        album2.album = "different album"
+        album2.store()
+        self._assert_dest(b"/base/foo/the title", i1)
+
+        album2.album = i1.album
+        album2.store()
+        self._assert_dest(b"/base/foo [2001]/the title", i1)
+
+    def test_unique_follows_removed_album(self, items):
+        i1, i2 = items
+        self._assert_dest(b"/base/foo [2001]/the title", i1)
+
+        self.lib.get_album(i2).remove()
+        self._assert_dest(b"/base/foo/the title", i1)
+
+    def test_unique_follows_changed_disambiguator(self, items):
+        _i1, i2 = items
+        self._assert_dest(b"/base/foo [2002]/the title", i2)
+
+        album2 = self.lib.get_album(i2)
+        album2.year = 2005
+        album2.store()
+        self._assert_dest(
+            b"/base/foo [2005]/the title", self.lib.get_item(i2.id)
+        )
+
+    def test_unique_computed_for_all_albums_at_once(self, items):
+        i1, i2 = items
+        self._assert_dest(b"/base/foo [2001]/the title", i1)
+
+        with patch.object(self.lib, "get_album") as get_album:
+            self._assert_dest(b"/base/foo [2002]/the title", i2)
+        get_album.assert_not_called()
+
     def test_unique_falls_back_to_second_distinguishing_field(self, items):
         i1, _i2 = items
         self._setf("foo%aunique{albumartist album,month year}/$title")
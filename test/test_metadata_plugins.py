@@ -1,3 +1,6 @@
+import subprocess
+import sys
+import textwrap
 from collections.abc import Iterable
 from concurrent.futures import ThreadPoolExecutor as BaseThreadPoolExecutor
 from threading import Event
@@ -166,21 +169,13 @@ def test_albums_for_ids_calls_each_plugin_once(monkeypatch):
             start_workers.wait()
             return fn(*args, **kwargs)
 
-        def __enter__(self):
-            return self
-
-        def __exit__(self, exc_type, exc, tb):
-            self._executor.shutdown(wait=True)
-            return False
-
+    executor = DelayedStartExecutor()
     monkeypatch.setattr(
         metadata_plugins,
         "find_metadata_source_plugins",
         lambda: PluginSequence(),
     )
-    monkeypatch.setattr(
-        metadata_plugins, "ThreadPoolExecutor", DelayedStartExecutor
-    )
+    monkeypatch.setattr(metadata_plugins, "_executor", lambda: executor)
 
     assert set(metadata_plugins.albums_for_ids(["42"])) == {
         "discogs",
@@ -192,3 +187,91 @@ def test_albums_for_ids_calls_each_plugin_once(monkeypatch):
         [["42"]],
         [["42"]],
     ]
+
+
+class TestLookupStreaming:
+    @pytest.fixture
+    def release(self):
+        release = Event()
+        yield release
+        release.set()
+
+    @pytest.fixture(autouse=True)
+    def plugins(self, monkeypatch, config, release):
+        class FastPlugin:
+            data_source = "fast"
+
+            def candidates(self, *_):
+                yield "fast"
+
+        class SlowPlugin:
+            data_source = "slow"
+
+            def __init__(self):
+                self.config = config["slow"]
+
+            def candidates(self, *_):
+                release.wait()
+                yield "slow"
+
+        monkeypatch.setattr(
+            metadata_plugins,
+            "find_metadata_source_plugins",
+            lambda: [SlowPlugin(), FastPlugin()],
+        )
+        metadata_plugins.reset_lookup_stats()
+
+    def test_yields_results_as_they_arrive(self, release):
+        results = metadata_plugins.candidates()
+
+        assert next(results) == "fast"
+        release.set()
+        assert list(results) == ["slow"]
+
+    def test_drops_source_after_its_deadline(self, config):
+        config["slow"]["lookup_timeout"] = 0.1
+
+        assert list(metadata_plugins.candidates()) == ["fast"]
+
+        stats = metadata_plugins.lookup_stats()
+        assert stats["fast"].timeouts == 0
+        assert stats["slow"].timeouts == 1
+        assert stats["slow"].longest >= 0.1
+
+    def test_timed_out_source_does_not_block_exit(self):
+        script = textwrap.dedent("""
+            from threading import Event
+
+            from beets import config, metadata_plugins
+
+            class FastPlugin:
+                data_source = "fast"
+
+                def candidates(self, *_):
+                    yield "fast"
+
+            class HungPlugin:
+                data_source = "hung"
+                config = config["hung"]
+
+                def candidates(self, *_):
+                    Event().wait()
+                    yield "hung"
+
+            config["hung"]["lookup_timeout"] = 0.2
+            metadata_plugins.find_metadata_source_plugins = lambda: [
+                HungPlugin(),
+                FastPlugin(),
+            ]
+            print(list(metadata_plugins.candidates()))
+        """)
+
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "['fast']"
@@ -15,6 +15,7 @@ from beets import util
 from beets.library import Item
 from beets.test import _common
 from beets.test.helper import NEEDS_REFLINK, BeetsTestCase
+from beets.util.manifest import DirectoryManifest
 
 _p = pytest.param
 
@@ -395,6 +396,36 @@ class WalkTest(BeetsTestCase):
         assert len(res) == 1
         assert res[0] == (self.str_base, [], [])
 
+    def test_ignore_hidden(self):
+        (self.base / ".hidden").touch()
+        res = list(util.sorted_walk(os.fsencode(self.base), ignore_hidden=True))
+        assert res[0] == (os.fsencode(self.base), [b"d"], [b"x", b"y"])
+
+    def test_manifest_skips_unchanged_directories(self):
+        for path in (self.base, self.base / "d"):
+            os.utime(path, (0, 0))
+        manifest = DirectoryManifest(str(self.temp_path / "manifest.db"))
+        expected = list(util.sorted_walk(self.str_base))
+
+        assert list(util.sorted_walk(self.str_base, manifest=manifest)) == (
+            expected
+        )
+        with patch("os.scandir", side_effect=AssertionError):
+            assert (
+                list(util.sorted_walk(self.str_base, manifest=manifest))
+                == expected
+            )
+        assert (manifest.hits, manifest.misses) == (2, 2)
+
+    def test_manifest_lists_changed_directories(self):
+        os.utime(self.base, (0, 0))
+        manifest = DirectoryManifest(str(self.temp_path / "manifest.db"))
+        list(util.sorted_walk(self.str_base, manifest=manifest))
+
+        (self.base / "w").touch()
+        res = list(util.sorted_walk(self.str_base, manifest=manifest))
+        assert res[0] == (self.str_base, ["d"], ["w", "x", "y"])
+
 
 class UniquePathTest(BeetsTestCase):
     def setUp(self):
@@ -39,6 +39,7 @@ class UpdateTest(IOMixin, BeetsTestCase):
         reset_mtime=True,
         fields=None,
         exclude_fields=None,
+        jobs=1,
     ):
         self.io.addinput("y")
         if reset_mtime:
@@ -52,6 +53,7 @@ class UpdateTest(IOMixin, BeetsTestCase):
             False,
             fields=fields,
             exclude_fields=exclude_fields,
+            jobs=jobs,
         )
 
     def test_delete_removes_item(self):
@@ -226,3 +228,18 @@ class UpdateTest(IOMixin, BeetsTestCase):
         self._update(exclude_fields=["lyrics"])
         item = self.lib.items().get()
         assert item.lyrics != "new lyrics"
+
+    def test_parallel_update_reads_all_items(self):
+        for path, title in (
+            (self.i.filepath, "one"),
+            (self.i2.filepath, "two"),
+        ):
+            mf = MediaFile(path)
+            mf.title = title
+            mf.save()
+        self.i2.mtime = 0
+        self.i2.store()
+        remove(self.i.path)
+        self._update(reset_mtime=False, jobs=4)
+
+        assert [item.title for item in self.lib.items()] == ["two"]
@@ -44,3 +44,13 @@ class WriteTest(IOMixin, BeetsTestCase):
         output = self.write_cmd()
 
         assert f"{old_title} -> new title" in output
+
+    def test_parallel_write(self):
+        items = [self.add_item_fixture(title=f"title {i}") for i in range(4)]
+
+        output = self.write_cmd("-j", "4")
+
+        assert output.index("title 0") < output.index("title 3")
+        for item in items:
+            item.load()
+            assert item.mtime == item.current_mtime()
@@ -1,5 +1,6 @@
 """Test the "pipeline.py" restricted parallel programming library."""
 
+import time
 import unittest
 
 import pytest
@@ -71,6 +72,15 @@ def _multi_work():
         i = pipeline.multiple([i, -i])
 
 
+# A worker that takes longer for some messages than for others.
+def _slow_work():
+    i = None
+    while True:
+        i = yield i
+        time.sleep(0.001 * (i % 3))
+        i *= 2
+
+
 class SimplePipelineTest(unittest.TestCase):
     def setUp(self):
         self.result = []
@@ -117,6 +127,32 @@ class ParallelStageTest(unittest.TestCase):
         assert list(pl.pull()) == [0, 2, 4, 6, 8]
 
 
+class OrderedParallelStageTest(unittest.TestCase):
+    def setUp(self):
+        self.result = []
+
+    def test_run_parallel(self):
+        pl = pipeline.Pipeline(
+            (
+                _produce(50),
+                [_slow_work() for _ in range(4)],
+                _multi_work(),
+                _consume(self.result),
+            ),
+            ordered=True,
+        )
+        pl.run_parallel()
+        assert self.result == [j for i in range(50) for j in (i * 2, -i * 2)]
+
+    def test_bubbles(self):
+        pl = pipeline.Pipeline(
+            (_produce(), (_bub_work(), _bub_work()), _consume(self.result)),
+            ordered=True,
+        )
+        pl.run_parallel()
+        assert self.result == [0, 2, 4, 8]
+
+
 class ExceptionTest(unittest.TestCase):
     def setUp(self):
         self.result = []